@@ -0,0 +1,75 @@
+"""recipes: French full-text search vector + GIN index
+
+Revision ID: 0c6e2f9a4b51
+Revises: f3a8c1d5e2b7
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0c6e2f9a4b51"
+down_revision: Union[str, None] = "f3a8c1d5e2b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Frozen copies of `SEARCH_CONFIG_DDL` (models.py) and of the weighted
+# document built by `services/recipe_search.py` as of this revision.
+SEARCH_CONFIG = "french_unaccent"
+SEARCH_CONFIG_DDL = f"""
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{SEARCH_CONFIG}') THEN
+        CREATE TEXT SEARCH CONFIGURATION {SEARCH_CONFIG} (COPY = french);
+        IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'unaccent') THEN
+            CREATE EXTENSION IF NOT EXISTS unaccent;
+            ALTER TEXT SEARCH CONFIGURATION {SEARCH_CONFIG}
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, french_stem;
+        END IF;
+    END IF;
+END
+$$;
+"""
+BACKFILL = f"""
+UPDATE recipes r SET search_vector =
+    setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(r.name, '')), 'A')
+    || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(concat_ws(' ',
+        r.cuisine_type,
+        array_to_string(r.tags, ' '),
+        (SELECT string_agg(i.name, ' ') FROM ingredients i WHERE i.recipe_id = r.recipe_id)
+    ), '')), 'B')
+    || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(r.description, '')), 'C')
+    || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(
+        (SELECT string_agg(s.instruction_text, ' ') FROM instructions s
+         WHERE s.recipe_id = r.recipe_id), ''
+    )), 'D')
+"""
+
+
+def upgrade() -> None:
+    # french_unaccent text search config (+ the unaccent extension when the
+    # server has it) — same DDL create_all runs for fresh databases.
+    op.execute(SEARCH_CONFIG_DDL)
+    op.add_column("recipes", sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+
+    # Backfill with the document the flush hook maintains at runtime.
+    op.execute(BACKFILL)
+
+    op.create_index(
+        "ix_recipes_search_vector",
+        "recipes",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_recipes_search_vector", table_name="recipes")
+    op.drop_column("recipes", "search_vector")
+    op.execute(f"DROP TEXT SEARCH CONFIGURATION IF EXISTS {SEARCH_CONFIG}")
+    # unaccent extension is left in place — harmless.
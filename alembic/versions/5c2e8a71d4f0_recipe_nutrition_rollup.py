@@ -0,0 +1,56 @@
+"""recipe_nutrition: materialized per-recipe nutrition rollup
+
+Revision ID: 5c2e8a71d4f0
+Revises: 2a4c1f9b8d3e
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "5c2e8a71d4f0"
+down_revision: Union[str, None] = "2a4c1f9b8d3e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows are computed lazily on first read — nothing to backfill.
+    op.create_table(
+        "recipe_nutrition",
+        sa.Column(
+            "recipe_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("recipes.recipe_id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("servings", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column(
+            "totals",
+            postgresql.JSONB(),
+            nullable=False,
+            server_default=sa.text("'{}'::jsonb"),
+        ),
+        sa.Column(
+            "per_serving",
+            postgresql.JSONB(),
+            nullable=False,
+            server_default=sa.text("'{}'::jsonb"),
+        ),
+        sa.Column("untracked_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "untracked",
+            postgresql.JSONB(),
+            nullable=False,
+            server_default=sa.text("'[]'::jsonb"),
+        ),
+        sa.Column("computed_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("recipe_nutrition")
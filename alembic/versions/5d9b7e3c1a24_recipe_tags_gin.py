@@ -0,0 +1,53 @@
+"""recipes: case-folded tags + GIN index for tag filters
+
+Revision ID: 5d9b7e3c1a24
+Revises: 0c6e2f9a4b51
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Iterable, Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "5d9b7e3c1a24"
+down_revision: Union[str, None] = "0c6e2f9a4b51"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def normalize_tags(tags: Optional[Iterable[str]]) -> list[str]:
+    """Frozen copy of `services/recipe_tags.normalize_tags` as of this
+    revision: trimmed, whitespace collapsed, case-folded, de-duplicated."""
+    seen: dict[str, None] = {}
+    for t in tags or ():
+        t = " ".join(str(t).split()).casefold()
+        if t:
+            seen.setdefault(t)
+    return list(seen)
+
+
+def upgrade() -> None:
+    # Normalize stored tags with the rules the ORM listener applies at
+    # runtime, so exact-match filters see one spelling per tag.
+    bind = op.get_bind()
+    values = [
+        {"id": recipe_id, "tags": normalize_tags(tags)}
+        for recipe_id, tags in bind.execute(sa.text("SELECT recipe_id, tags FROM recipes"))
+        if tags is None or normalize_tags(tags) != tags
+    ]
+    if values:
+        bind.execute(
+            sa.text("UPDATE recipes SET tags = :tags WHERE recipe_id = :id").bindparams(
+                sa.bindparam("tags", type_=postgresql.ARRAY(sa.String()))
+            ),
+            values,
+        )
+    op.create_index("ix_recipes_tags", "recipes", ["tags"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_recipes_tags", table_name="recipes")
+    # Tags stay case-folded.
@@ -0,0 +1,90 @@
+"""ingredient_nutrients: pre-parsed numeric copy of nutrition_data
+
+Revision ID: 7b1d3f5a9c20
+Revises: 5c2e8a71d4f0
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+import math
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "7b1d3f5a9c20"
+down_revision: Union[str, None] = "5c2e8a71d4f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _safe_float(value) -> Optional[float]:
+    """Frozen copy of `backend.utils.nutrition.safe_float` as of this
+    revision, so the backfill does not change with the app code."""
+    if value is None:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    s = str(value).strip().lower()
+    if s in ("", "-", "nan", "n/a", "na"):
+        return None
+    if s in ("traces", "trace", "tr", "<0.1", "<0,1", "0", "0.0", "0,0"):
+        return 0.0
+    if s.startswith("<"):
+        try:
+            return float(s[1:].replace(",", ".")) / 2
+        except ValueError:
+            return 0.0
+    if s.startswith(">"):
+        try:
+            return float(s[1:].replace(",", "."))
+        except ValueError:
+            return None
+    if "-" in s:
+        try:
+            a, b = s.split("-", 1)
+            return (float(a.replace(",", ".")) + float(b.replace(",", "."))) / 2
+        except ValueError:
+            pass
+    try:
+        return float(s.replace(",", "."))
+    except ValueError:
+        return None
+
+
+def upgrade() -> None:
+    nutrients = op.create_table(
+        "ingredient_nutrients",
+        sa.Column(
+            "ingredient_db_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("ingredient_database.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("nutrient_key", sa.String(length=255), primary_key=True),
+        sa.Column("value", sa.Float(), nullable=False),
+    )
+    op.create_index(
+        "ix_ingredient_nutrients_nutrient_key", "ingredient_nutrients", ["nutrient_key"]
+    )
+
+    # Backfill: parse every existing cell once, with the runtime rules.
+    rows = op.get_bind().execute(sa.text(
+        "SELECT id, nutrition_data FROM ingredient_database WHERE nutrition_data IS NOT NULL"
+    ))
+    values = []
+    for uid, nd in rows:
+        for key, raw in (nd or {}).items():
+            v = _safe_float(raw)
+            if v is not None:
+                values.append({"ingredient_db_id": uid, "nutrient_key": key, "value": v})
+    if values:
+        op.bulk_insert(nutrients, values)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ingredient_nutrients_nutrient_key", table_name="ingredient_nutrients")
+    op.drop_table("ingredient_nutrients")
@@ -0,0 +1,105 @@
+"""ingredients: persisted quantity_g + gram_status
+
+Revision ID: 9e4a6c2b7f13
+Revises: 7b1d3f5a9c20
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+import re
+import unicodedata
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "9e4a6c2b7f13"
+down_revision: Union[str, None] = "7b1d3f5a9c20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Frozen copy of `backend.utils.nutrition.resolve_grams` as of this revision
+# (spoon/cup table), so the backfill does not change with the app code.
+_SPOON_TABLE: dict[str, tuple[str, float]] = {
+    "cuillere a soupe": ("ml", 15.0),
+    "cuilleres a soupe": ("ml", 15.0),
+    "cas": ("ml", 15.0),
+    "c a s": ("ml", 15.0),
+    "c s": ("ml", 15.0),
+    "cuillere a cafe": ("ml", 5.0),
+    "cuilleres a cafe": ("ml", 5.0),
+    "cac": ("ml", 5.0),
+    "c a c": ("ml", 5.0),
+    "c c": ("ml", 5.0),
+    "verre": ("ml", 200.0),
+    "verres": ("ml", 200.0),
+    "tasse": ("ml", 240.0),
+    "tasses": ("ml", 240.0),
+    "pincee": ("g", 0.5),
+    "pincees": ("g", 0.5),
+}
+_MASS = {"g": 1.0, "kg": 1000.0, "mg": 0.001}
+_VOLUME = {"ml": 1.0, "cl": 10.0, "l": 1000.0}
+_VOLUME_HINTS = ("cuillere", "cuillère", "cas", "cac", "verre", "tasse")
+
+
+def _normalize_unit(unit: str) -> str:
+    n = "".join(
+        c for c in unicodedata.normalize("NFKD", unit or "") if not unicodedata.combining(c)
+    ).lower()
+    return re.sub(r"[.\s]+", " ", n).strip()
+
+
+def _resolve_grams(
+    quantity: Optional[float], unit: str, density: Optional[float]
+) -> tuple[Optional[float], str]:
+    qty = float(quantity or 0)
+    n = _normalize_unit(unit)
+    if n in _MASS:
+        return qty * _MASS[n], "ok"
+    kind, factor = _SPOON_TABLE.get(n, ("ml", _VOLUME.get(n)))
+    if kind == "g":
+        return qty * factor, "ok"
+    if factor is not None and density is not None:
+        return qty * factor * float(density), "ok"
+    u = (unit or "").strip().lower()
+    if u in {"ml", "cl", "l"} or any(sp in u for sp in _VOLUME_HINTS):
+        return None, "missing_density"
+    return None, "unknown_unit"
+
+
+def upgrade() -> None:
+    op.add_column("ingredients", sa.Column("quantity_g", sa.Float(), nullable=True))
+    op.add_column(
+        "ingredients",
+        sa.Column(
+            "gram_status", sa.String(length=20), nullable=False,
+            server_default="unknown_unit",
+        ),
+    )
+    op.alter_column("ingredients", "gram_status", server_default=None)
+
+    # Backfill with the rules the flush hook applies at runtime.
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT i.ingredient_id, i.quantity, i.unit, d.density_g_per_ml "
+        "FROM ingredients i LEFT JOIN ingredient_database d ON d.id = i.ingredient_db_id"
+    ))
+    values = []
+    for ingredient_id, quantity, unit, density in rows:
+        grams, status = _resolve_grams(quantity, unit, density)
+        values.append({"id": ingredient_id, "grams": grams, "status": status})
+    if values:
+        bind.execute(
+            sa.text(
+                "UPDATE ingredients SET quantity_g = :grams, gram_status = :status "
+                "WHERE ingredient_id = :id"
+            ),
+            values,
+        )
+
+
+def downgrade() -> None:
+    op.drop_column("ingredients", "gram_status")
+    op.drop_column("ingredients", "quantity_g")
@@ -0,0 +1,33 @@
+"""recipes: is_favorite / created_at NOT NULL (keyset cursor columns)
+
+Revision ID: a2c7e5f9d314
+Revises: 5d9b7e3c1a24
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a2c7e5f9d314"
+down_revision: Union[str, None] = "5d9b7e3c1a24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # GET /api/recipes pages with `(is_favorite, created_at, recipe_id) < cursor`:
+    # a NULL in either column makes the comparison NULL, so the row is never
+    # returned past the first page, and a NULL in the cursor itself fails to
+    # decode. Rows without a creation date sort last, as before.
+    op.execute("UPDATE recipes SET is_favorite = false WHERE is_favorite IS NULL")
+    op.execute("UPDATE recipes SET created_at = 'epoch' WHERE created_at IS NULL")
+    op.alter_column("recipes", "is_favorite", existing_type=sa.Boolean(), nullable=False)
+    op.alter_column("recipes", "created_at", existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade() -> None:
+    op.alter_column("recipes", "created_at", existing_type=sa.DateTime(), nullable=True)
+    op.alter_column("recipes", "is_favorite", existing_type=sa.Boolean(), nullable=True)
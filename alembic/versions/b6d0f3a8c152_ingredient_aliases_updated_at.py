@@ -0,0 +1,27 @@
+"""ingredient_database: aliases_updated_at (alias writes off the engine fingerprint)
+
+Revision ID: b6d0f3a8c152
+Revises: a2c7e5f9d314
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "b6d0f3a8c152"
+down_revision: Union[str, None] = "a2c7e5f9d314"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Alias writes used to bump updated_at, which is also the nutrition
+    # engine's snapshot fingerprint. NULL until the row's aliases change.
+    op.add_column("ingredient_database", sa.Column("aliases_updated_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("ingredient_database", "aliases_updated_at")
@@ -0,0 +1,123 @@
+"""ingredients: re-resolve quantity_g with the unit grammar
+
+Revision ID: c51e0d7a3b86
+Revises: 9e4a6c2b7f13
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+import re
+import unicodedata
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "c51e0d7a3b86"
+down_revision: Union[str, None] = "9e4a6c2b7f13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Frozen copy of the unit grammar (`backend/utils/units.py`) and of
+# `resolve_grams` as of this revision, so the backfill does not change with
+# the app code. Token → (kind, grams or ml per unit).
+_UNITS: dict[str, tuple[str, float]] = {
+    "g": ("mass", 1.0),
+    "kg": ("mass", 1000.0),
+    "mg": ("mass", 0.001),
+    "pincee": ("mass", 0.5),
+    "ml": ("volume", 1.0),
+    "cl": ("volume", 10.0),
+    "dl": ("volume", 100.0),
+    "l": ("volume", 1000.0),
+    "cas": ("volume", 15.0),
+    "cad": ("volume", 10.0),
+    "cac": ("volume", 5.0),
+    "verre": ("volume", 200.0),
+    "tasse": ("volume", 240.0),
+}
+_SPOON = r"c(?:uil(?:l?eree?)?s?)? ?(?:(?:a|de) ?)?"
+_GRAMMAR: dict[str, str] = {
+    "g": r"g|gr|grs|grammes?",
+    "kg": r"kg|kgs|kilos?|kilogrammes?",
+    "mg": r"mg|milligrammes?",
+    "pincee": r"pincees?|pinc",
+    "ml": r"ml|millilitres?",
+    "cl": r"cl|centilitres?",
+    "dl": r"dl|decilitres?",
+    "l": r"l|lt|litres?",
+    "cas": _SPOON + r"s(?:oupe)?s?",
+    "cad": _SPOON + r"d(?:essert)?s?",
+    "cac": _SPOON + r"c(?:afe)?s?",
+    "verre": r"verres?",
+    "tasse": r"tasses?",
+    "piece": r"p|pc|pcs|pces?|pieces?|unites?|u",
+    "sachet": r"sachets?",
+    "paquet": r"paquets?|pqt",
+    "boite": r"boites?|bte|conserves?",
+    "pot": r"pots?",
+    "bouteille": r"bouteilles?|btle",
+    "brique": r"briques?",
+    "barquette": r"barquettes?",
+    "botte": r"bottes?",
+    "tranche": r"tranches?",
+    "gousse": r"gousses?",
+    "feuille": r"feuilles?",
+    "brin": r"brins?",
+    "poignee": r"poignees?",
+}
+_PARSER = re.compile("|".join(f"(?P<{tok}>{pat})" for tok, pat in _GRAMMAR.items()))
+
+
+def _unit(unit: str) -> Optional[tuple[str, float]]:
+    """(kind, factor) of a raw unit; count units and unknown ones → None."""
+    n = "".join(
+        c for c in unicodedata.normalize("NFKD", unit or "") if not unicodedata.combining(c)
+    ).lower()
+    m = _PARSER.fullmatch(re.sub(r"[.'’\s]+", " ", n).strip())
+    return _UNITS.get(m.lastgroup) if m else None
+
+
+def _resolve_grams(
+    quantity: Optional[float], unit: str, density: Optional[float]
+) -> tuple[Optional[float], str]:
+    d = _unit(unit)
+    if d is None:
+        return None, "unknown_unit"
+    kind, factor = d
+    if kind == "mass":
+        return float(quantity or 0) * factor, "ok"
+    if density is None:
+        return None, "missing_density"
+    return float(quantity or 0) * factor * float(density), "ok"
+
+
+def upgrade() -> None:
+    # Data only: spellings like "c. à s.", "dl" or "cuillère à dessert" now
+    # resolve, so rows backfilled with the old spoon table may be stale.
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT i.ingredient_id, i.quantity, i.unit, d.density_g_per_ml, "
+        "i.quantity_g, i.gram_status "
+        "FROM ingredients i LEFT JOIN ingredient_database d ON d.id = i.ingredient_db_id"
+    ))
+    values = []
+    for ingredient_id, quantity, unit, density, old_grams, old_status in rows:
+        grams, status = _resolve_grams(quantity, unit, density)
+        if (grams, status) != (old_grams, old_status):
+            values.append({"id": ingredient_id, "grams": grams, "status": status})
+    if values:
+        bind.execute(
+            sa.text(
+                "UPDATE ingredients SET quantity_g = :grams, gram_status = :status "
+                "WHERE ingredient_id = :id"
+            ),
+            values,
+        )
+        # Rollups were computed from the old grams; they rebuild on read.
+        op.execute("DELETE FROM recipe_nutrition")
+
+
+def downgrade() -> None:
+    pass
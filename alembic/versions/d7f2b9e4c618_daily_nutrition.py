@@ -0,0 +1,38 @@
+"""daily_nutrition: per-day nutrition rollup
+
+Revision ID: d7f2b9e4c618
+Revises: c51e0d7a3b86
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "d7f2b9e4c618"
+down_revision: Union[str, None] = "c51e0d7a3b86"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows are built on first read of a day — nothing to backfill.
+    op.create_table(
+        "daily_nutrition",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column(
+            "totals",
+            postgresql.JSONB(),
+            nullable=False,
+            server_default=sa.text("'{}'::jsonb"),
+        ),
+        sa.Column("untracked_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("computed_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("daily_nutrition")
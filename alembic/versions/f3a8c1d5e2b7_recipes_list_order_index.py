@@ -0,0 +1,30 @@
+"""recipes: composite index for the list order / keyset cursor
+
+Revision ID: f3a8c1d5e2b7
+Revises: d7f2b9e4c618
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "f3a8c1d5e2b7"
+down_revision: Union[str, None] = "d7f2b9e4c618"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # GET /api/recipes orders by (is_favorite, created_at, recipe_id) DESC and
+    # pages with a row comparison on the same key: one backward index scan.
+    op.create_index(
+        "ix_recipes_list_order",
+        "recipes",
+        ["is_favorite", "created_at", "recipe_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_recipes_list_order", table_name="recipes")
@@ -94,7 +94,7 @@ export default function IngredientsPage() {
         });
         if (cancelled) return;
         setItems(res.items);
-        setTotal(res.total);
+        setTotal(res.total ?? 0);
       } finally {
         if (!cancelled) setLoading(false);
       }
@@ -33,7 +33,7 @@ import { CSS } from "@dnd-kit/utilities";
 import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import * as api from "@/lib/api";
-import type { MealPlanSlot, MealPlanWeek, Recipe } from "@/lib/types";
+import type { MealPlanSlot, MealPlanWeek, RecipeSummary } from "@/lib/types";
 import { addDays, dayLabelFR, isoDate, mondayOf, shortDateFR } from "@/lib/dates";
 import { RecipePickerDialog } from "@/components/recipe-picker-dialog";
 import { RecipeDetailDialog } from "@/components/recipe-detail-dialog";
@@ -178,7 +178,7 @@ export default function MealPlanPage() {
     }
   }
 
-  async function pickRecipe(recipe: Recipe) {
+  async function pickRecipe(recipe: RecipeSummary) {
     if (!pickerDate) return;
     try {
       await api.addMealToDay({
@@ -1,13 +1,13 @@
 "use client";
 
-import { useCallback, useEffect, useMemo, useState } from "react";
+import { useCallback, useEffect, useState } from "react";
 import { Plus, Star, StarOff, Clock, Flame, Users } from "lucide-react";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent } from "@/components/ui/card";
 import { Input } from "@/components/ui/input";
 import { Badge } from "@/components/ui/badge";
 import * as api from "@/lib/api";
-import type { Recipe } from "@/lib/types";
+import type { Recipe, RecipeSummary } from "@/lib/types";
 import { RecipeFormDialog } from "@/components/recipe-form-dialog";
 import { RecipeDetailDialog } from "@/components/recipe-detail-dialog";
 
@@ -34,7 +34,7 @@ export default function RecipesPage() {
   const dCuisine = useDebounced(cuisine);
   const dTag = useDebounced(tag);
 
-  const [recipes, setRecipes] = useState<Recipe[]>([]);
+  const [recipes, setRecipes] = useState<RecipeSummary[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
@@ -46,11 +46,12 @@ export default function RecipesPage() {
     setLoading(true);
     setError(null);
     try {
-      const res = await api.listRecipes({
+      const res = await api.listRecipeSummaries({
         search: dSearch || undefined,
         ingredient: dIngredient || undefined,
         cuisine: dCuisine || undefined,
         tag: dTag || undefined,
+        tags: category === "all" ? undefined : [category],
         limit: 200,
       });
       setRecipes(res.recipes);
@@ -59,21 +60,18 @@ export default function RecipesPage() {
     } finally {
       setLoading(false);
     }
-  }, [dSearch, dIngredient, dCuisine, dTag]);
+  }, [dSearch, dIngredient, dCuisine, dTag, category]);
 
   useEffect(() => {
     load();
   }, [load]);
 
-  const filtered = useMemo(() => {
-    if (category === "all") return recipes;
-    return recipes.filter((r) => (r.tags || []).map((t) => t.toLowerCase()).includes(category));
-  }, [recipes, category]);
-
-  async function onToggleFavorite(r: Recipe) {
+  async function onToggleFavorite(r: RecipeSummary) {
     try {
-      const updated = await api.toggleFavorite(r.recipe_id, !r.is_favorite);
-      setRecipes((rs) => rs.map((x) => (x.recipe_id === r.recipe_id ? updated : x)));
+      const { is_favorite } = await api.toggleFavorite(r.recipe_id, !r.is_favorite);
+      setRecipes((rs) =>
+        rs.map((x) => (x.recipe_id === r.recipe_id ? { ...x, is_favorite } : x))
+      );
     } catch (e) {
       console.error(e);
     }
@@ -141,12 +139,12 @@ export default function RecipesPage() {
 
       {error && <p className="text-destructive">{error}</p>}
       {loading && <p className="text-muted-foreground">Chargement…</p>}
-      {!loading && filtered.length === 0 && (
+      {!loading && recipes.length === 0 && (
         <p className="text-muted-foreground">Aucune recette.</p>
       )}
 
       <div className="grid gap-4 sm:grid-cols-2 lg:grid-cols-3">
-        {filtered.map((r) => (
+        {recipes.map((r) => (
           <Card
             key={r.recipe_id}
             className={
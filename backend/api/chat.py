@@ -3,8 +3,8 @@ In-app assistant: streams Gemini 2.5 Flash responses with one read-only tool
 (list_recipes). Tools are plain Python functions — the SDK introspects their
 type hints + docstrings and handles automatic function calling.
 """
+import functools
 import json
-import os
 import random
 from datetime import date, datetime, timedelta
 from typing import List, Optional
@@ -12,10 +12,8 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
-from google import genai
-from google.genai import types
 from pydantic import BaseModel
-from sqlalchemy import String, desc, func
+from sqlalchemy import desc, func
 from sqlalchemy.orm import Session, joinedload, selectinload
 
 from backend.db.models import (
@@ -28,15 +26,20 @@ from backend.db.models import (
     ShoppingList,
     ShoppingListContribution,
 )
-from backend.db.session import get_db
+from backend.db.session import get_session_factory
+from backend.services import recipe_search, recipe_tags
+from backend.services.daily_nutrition import invalidate_days
+from backend.utils import gemini
+from backend.utils.perf import TimedRoute, timed_stream
 
-router = APIRouter(prefix="/api/chat", tags=["chat"])
+router = APIRouter(prefix="/api/chat", tags=["chat"], route_class=TimedRoute)
 
 SYSTEM_INSTRUCTION = (
     "You are a helpful in-app assistant for the user's personal food app.\n"
     "\n"
     "You can:\n"
     "- browse the user's recipes (search, fetch detail, fetch nutrition)\n"
+    "- suggest what to cook from the ingredients the user has on hand\n"
     "- read and edit the weekly meal plan (add/remove meals, regenerate the week)\n"
     "- read the shopping list and re-categorize it by supermarket section\n"
     "- create new recipes; edit recipe metadata; add/update/remove ingredients on a recipe; delete recipes\n"
@@ -76,30 +79,31 @@ def _build_list_recipes_tool(db: Session):
         """Search the user's saved recipes and return summaries.
 
         Args:
-            search: Free-text search in recipe name and description.
+            search: Full-text search (French, accent-insensitive) over name,
+                description, cuisine, tags, ingredients and steps; results
+                come back most relevant first.
             cuisine: Filter by cuisine type (partial, case-insensitive).
             ingredient: Filter to recipes containing this ingredient.
-            tag: Filter by tag.
+            tag: Filter by tag (exact whole tag, case-insensitive).
             limit: Max recipes to return (default 20).
         """
         q = db.query(Recipe).options(selectinload(Recipe.ingredients))
-        if search:
-            q = q.filter(
-                Recipe.name.ilike(f"%{search}%")
-                | Recipe.description.ilike(f"%{search}%")
-            )
+        order = [desc(Recipe.is_favorite), desc(Recipe.created_at)]
+        text_query = recipe_search.ts_query(search)
+        if text_query is not None and db.scalar(recipe_search.stopwords_only(text_query)):
+            text_query = None
+        if text_query is not None:
+            q = q.filter(recipe_search.matches(text_query))
+            order.insert(0, desc(recipe_search.rank(text_query)))
         if cuisine:
             q = q.filter(Recipe.cuisine_type.ilike(f"%{cuisine}%"))
         if ingredient:
-            q = q.join(Ingredient).filter(
-                Ingredient.name.ilike(f"%{ingredient}%")
-            ).distinct()
-        if tag:
-            q = q.filter(
-                func.lower(func.cast(Recipe.tags, String)).contains(tag.lower())
-            )
+            # EXISTS rather than JOIN + DISTINCT, which can't ORDER BY the rank.
+            q = q.filter(Recipe.ingredients.any(Ingredient.name.ilike(f"%{ingredient}%")))
+        if tag and (tag_clause := recipe_tags.tag_filter([tag])) is not None:
+            q = q.filter(tag_clause)
         recipes = (
-            q.order_by(desc(Recipe.is_favorite), desc(Recipe.created_at))
+            q.order_by(*order)
             .limit(limit)
             .all()
         )
@@ -200,24 +204,44 @@ def _build_meal_plan_tools(db: Session):
             sid = UUID(slot_id)
         except (ValueError, TypeError) as e:
             return {"error": str(e)}
+        slot_date = (
+            db.query(MealPlanSlot.slot_date).filter(MealPlanSlot.slot_id == sid).scalar()
+        )
         deleted = (
             db.query(MealPlanSlot)
             .filter(MealPlanSlot.slot_id == sid)
             .delete(synchronize_session=False)
         )
+        invalidate_days(db, [slot_date])
         db.commit()
         return {"deleted": bool(deleted)}
 
     def generate_meal_plan(
-        week_start: str, meals_per_day: int = 3, overwrite: bool = False
+        week_start: str,
+        meals_per_day: int = 3,
+        overwrite: bool = False,
+        mode: str = "optimize",
+        sex: str = "male",
+        avoid_repeats: bool = True,
+        favorites_only: bool = True,
     ) -> dict:
-        """Auto-fill the week with N random meals per day (favorites if any).
+        """Auto-fill the week with N meals per day (favorites if any).
 
         Args:
             week_start: Monday of the week, YYYY-MM-DD.
             meals_per_day: How many meals to ensure per day (default 3).
             overwrite: If true, replace any existing meals in the week.
+            mode: 'optimize' (default) picks recipes and portions so each day
+                lands close to the ANSES nutrient targets; 'random' picks
+                recipes at random.
+            sex: 'male' or 'female', selects the ANSES targets.
+            avoid_repeats: If true, don't plan the same recipe twice in the
+                week while the pool allows it (optimize mode).
+            favorites_only: If true (default), draw from favorite recipes
+                when there are any; otherwise from every recipe.
         """
+        from backend.services.meal_plan_optimizer import candidate_pool, optimize_meals
+
         try:
             monday = _parse(week_start)
         except ValueError as e:
@@ -226,31 +250,41 @@ def _build_meal_plan_tools(db: Session):
             return {"error": "week_start must be a Monday"}
         if meals_per_day < 1 or meals_per_day > 10:
             return {"error": "meals_per_day must be between 1 and 10"}
+        if mode not in ("optimize", "random"):
+            return {"error": "mode must be 'optimize' or 'random'"}
+        if sex not in ("male", "female"):
+            return {"error": "sex must be 'male' or 'female'"}
         sunday = monday + timedelta(days=6)
 
         if overwrite:
             db.query(MealPlanSlot).filter(
                 MealPlanSlot.slot_date >= monday, MealPlanSlot.slot_date <= sunday
             ).delete(synchronize_session=False)
+            invalidate_days(db, (monday + timedelta(days=i) for i in range(7)))
             db.flush()
 
-        favorites = db.query(Recipe).filter(Recipe.is_favorite == True).all()  # noqa: E712
-        pool = favorites or db.query(Recipe).limit(50).all()
+        pool = candidate_pool(db, favorites_only)
         if not pool:
             return {"error": "No recipes available"}
 
-        for day_offset in range(7):
-            d = monday + timedelta(days=day_offset)
-            existing_count = _next_position(d)  # next position == current count
-            target = meals_per_day if overwrite else max(0, meals_per_day - existing_count)
-            for i in range(target):
-                recipe = random.choice(pool)
+        # next position == current count
+        start = {d: _next_position(d) for d in (monday + timedelta(days=i) for i in range(7))}
+        needs = {d: max(0, meals_per_day - pos) for d, pos in start.items()}
+        if mode == "optimize":
+            picks = optimize_meals(db, pool, needs, meals_per_day, sex, avoid_repeats)
+        else:
+            picks = {
+                d: [(r, r.servings or 1) for r in (random.choice(pool) for _ in range(n))]
+                for d, n in needs.items()
+            }
+        for d, meals in picks.items():
+            for i, (recipe, servings) in enumerate(meals):
                 db.add(
                     MealPlanSlot(
                         slot_date=d,
-                        position=(existing_count + i) if not overwrite else i,
+                        position=start[d] + i,
                         recipe_id=recipe.recipe_id,
-                        servings=recipe.servings or 1,
+                        servings=servings,
                     )
                 )
         db.commit()
@@ -613,13 +647,10 @@ def _build_recipe_edit_tools(db: Session):
             iid = UUID(ingredient_id)
         except (ValueError, TypeError) as e:
             return {"error": str(e)}
-        deleted = (
-            db.query(Ingredient)
-            .filter(Ingredient.ingredient_id == iid)
-            .delete(synchronize_session=False)
-        )
-        db.commit()
-        return {"deleted": bool(deleted)}
+        ing = db.query(Ingredient).filter(Ingredient.ingredient_id == iid).first()
+        if ing is not None:
+            db.delete(ing); db.commit()
+        return {"deleted": ing is not None}
 
     def delete_recipe(recipe_id: str, dry_run: bool = True) -> dict:
         """Delete a recipe (and its ingredients/instructions via cascade).
@@ -758,24 +789,16 @@ def _build_recipe_read_tools(db: Session):
             recipe_id: UUID of the recipe.
         """
         from uuid import UUID
-        from backend.utils.nutrition import compute_recipe_nutrition
+        from backend.services.recipe_nutrition import get_rollup, promoted_nutrition
         try:
             uid = UUID(recipe_id)
         except ValueError:
             return {"error": f"Invalid recipe_id: {recipe_id}"}
-        r = (
-            db.query(Recipe)
-            .options(selectinload(Recipe.ingredients))
-            .filter(Recipe.recipe_id == uid)
-            .first()
-        )
-        if not r:
+        rollup = get_rollup(db, uid, persist=False)
+        if rollup is None:
             return {"error": "Recipe not found"}
-        nutrition = compute_recipe_nutrition(r.ingredients, db)
-        servings = r.servings if r.servings and r.servings > 0 else 1
-        nutrition["per_serving"] = {k: round(v / servings, 2) for k, v in nutrition.items()}
-        nutrition["servings"] = servings
-        nutrition["recipe_name"] = r.name
+        nutrition = promoted_nutrition(rollup, digits=2)
+        nutrition["recipe_name"] = db.get(Recipe, uid).name
         return nutrition
 
     return [get_recipe, recipe_overview, get_recipe_nutrition]
@@ -870,6 +893,42 @@ def _build_seasonality_tools(db: Session):
     return [get_in_season, suggest_seasonal_recipes]
 
 
+def _build_pantry_tools(db: Session):
+    """'What can I cook?' over the pantry inverted index."""
+
+    def recipes_from_pantry(
+        ingredients: List[str], limit: int = 10, min_coverage: float = 0.0
+    ) -> dict:
+        """Rank the user's saved recipes by how many of their ingredients the
+        user already has. Each result carries its coverage (0..1) and the
+        ingredients still missing.
+
+        Args:
+            ingredients: What the user has on hand, free text (e.g.
+                ["poulet", "tomates", "riz"]).
+            limit: Max recipes to return (default 10, max 50).
+            min_coverage: Only recipes at least this well covered (0..1).
+        """
+        from backend.services.pantry import search_pantry
+        results, unresolved = search_pantry(
+            db, ingredients, limit=max(1, min(limit, 50)), min_coverage=min_coverage
+        )
+        return {
+            "recipes": [
+                {
+                    "recipe_id": str(m.recipe_id),
+                    "name": m.name,
+                    "coverage": round(m.coverage, 2),
+                    "missing": m.missing,
+                }
+                for m in results
+            ],
+            "unresolved": unresolved,
+        }
+
+    return [recipes_from_pantry]
+
+
 def _build_reference_read_tools(db: Session):
     """Read-only lookup into the ingredient reference DB (CIQUAL + curated)."""
 
@@ -882,11 +941,11 @@ def _build_reference_read_tools(db: Session):
         Args:
             name: free-text query; matches alim_nom_fr or any alias.
         """
-        from backend.api.ingredients import search_ingredients, get_ingredient
-        hits = search_ingredients(q=name, limit=8, db=db)
+        from backend.api.ingredients import ingredient_detail, search_ingredients_sync
+        hits = search_ingredients_sync(db, q=name, limit=8)
         out = []
         for h in hits:
-            detail = get_ingredient(ingredient_id=h.id, db=db)
+            detail = ingredient_detail(db, UUID(h.id))
             d = detail.model_dump() if hasattr(detail, "model_dump") else dict(detail)
             missing = [
                 k for k, v in (d.get("nutrition_data") or {}).items()
@@ -1075,30 +1134,41 @@ def _build_reference_write_tools(db: Session):
         row, err = _resolve(ingredient_db_id)
         if err:
             return err
+        row_id, name = row.id, row.alim_nom_fr
         try:
-            res = llm_fill_proposal(ingredient_id=str(row.id), db=db)
+            # Ends the read transaction before waiting on Gemini.
+            res = llm_fill_proposal(ingredient_id=str(row_id), db=db)
         except HTTPException as e:
             return {"error": e.detail}
         proposal = res.proposal if hasattr(res, "proposal") else (res.get("proposal") or {})
         if dry_run:
             return {
-                "id": str(row.id),
-                "name": row.alim_nom_fr,
+                "id": str(row_id),
+                "name": name,
                 "applied": False,
                 "proposal": proposal,
             }
         if not proposal:
-            return {"id": str(row.id), "applied": False, "note": "no missing nutrients to fill"}
+            return {"id": str(row_id), "applied": False, "note": "no missing nutrients to fill"}
+        # New transaction: re-read the row under lock and fill only cells
+        # still empty, so edits made while the LLM answered are kept.
+        row = db.get(IngredientDatabase, row_id, with_for_update=True, populate_existing=True)
+        if row is None:
+            return {"error": "Ingredient not found"}
         merged = dict(row.nutrition_data or {})
-        merged.update(proposal)
+        filled = [k for k in proposal if merged.get(k) is None or merged.get(k) == ""]
+        if not filled:
+            db.commit()
+            return {"id": str(row_id), "applied": False, "note": "cells were filled meanwhile"}
+        merged.update({k: proposal[k] for k in filled})
         row.nutrition_data = merged
         _mark(row, by="llm")
         db.commit()
         return {
-            "id": str(row.id),
+            "id": str(row_id),
             "name": row.alim_nom_fr,
             "applied": True,
-            "filled": list(proposal.keys()),
+            "filled": filled,
         }
 
     return [
@@ -1109,46 +1179,68 @@ def _build_reference_write_tools(db: Session):
     ]
 
 
-def _to_contents(messages: List[ChatMessage]) -> List[types.Content]:
+def _to_contents(messages: List[ChatMessage]) -> list:
+    types = gemini.types()
     return [
         types.Content(role=m.role, parts=[types.Part(text=m.text)])
         for m in messages
     ]
 
 
+_TOOL_BUILDERS = [
+    _build_list_recipes_tool,
+    _build_recipe_read_tools,
+    _build_meal_plan_tools,
+    _build_shopping_tools,
+    _build_shopping_read_tools,
+    _build_recipe_edit_tools,
+    _build_nutrition_tools,
+    _build_seasonality_tools,
+    _build_pantry_tools,
+    _build_reference_read_tools,
+    _build_shopping_write_tools,
+    _build_reference_write_tools,
+]
+
+
+def _scoped_tools(builder, session_factory) -> list:
+    """`builder`'s tools, each invocation running in its own short-lived
+    session from `session_factory` — rather than one session (and pool
+    connection) held for the whole streamed turn, including every second
+    spent waiting on Gemini. Signatures and docstrings are kept for the
+    SDK's introspection."""
+    def build(db) -> list:
+        tools = builder(db)
+        return tools if isinstance(tools, list) else [tools]
+
+    def bind(i: int, template):
+        @functools.wraps(template)
+        def tool(*args, **kwargs):
+            with session_factory() as db:
+                return build(db)[i](*args, **kwargs)
+        return tool
+
+    # Builders only close over db; nothing touches it at build time.
+    return [bind(i, t) for i, t in enumerate(build(None))]
+
+
 @router.post("")
-def chat(req: ChatRequest, db: Session = Depends(get_db)):
+def chat(req: ChatRequest, session_factory=Depends(get_session_factory)):
     if not req.messages:
         raise HTTPException(status_code=400, detail="messages is empty")
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise HTTPException(status_code=500, detail="GEMINI_API_KEY is not set")
-
-    client = genai.Client(api_key=api_key)
-    config = types.GenerateContentConfig(
+    client = gemini.client()
+    config = gemini.types().GenerateContentConfig(
         system_instruction=SYSTEM_INSTRUCTION,
-        tools=[
-            _build_list_recipes_tool(db),
-            *_build_recipe_read_tools(db),
-            *_build_meal_plan_tools(db),
-            *_build_shopping_tools(db),
-            *_build_shopping_read_tools(db),
-            *_build_recipe_edit_tools(db),
-            *_build_nutrition_tools(db),
-            *_build_seasonality_tools(db),
-            *_build_reference_read_tools(db),
-            *_build_shopping_write_tools(db),
-            *_build_reference_write_tools(db),
-        ],
+        tools=[t for b in _TOOL_BUILDERS for t in _scoped_tools(b, session_factory)],
     )
 
     def event_stream():
         try:
-            for chunk in client.models.generate_content_stream(
+            for chunk in timed_stream(client.models.generate_content_stream(
                 model="gemini-2.5-flash",
                 contents=_to_contents(req.messages),
                 config=config,
-            ):
+            ), site="chat"):
                 if chunk.text:
                     yield f"data: {json.dumps({'text': chunk.text})}\n\n"
             yield "data: [DONE]\n\n"
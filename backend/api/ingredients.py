@@ -12,21 +12,25 @@
 from __future__ import annotations
 
 import json
-import os
 from datetime import datetime, timezone
 from typing import Any, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import func, or_
+from sqlalchemy import func, or_, select, union
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
 
 from backend.db.models import IngredientAlias, IngredientDatabase
-from backend.db.session import get_db
+from backend.db.session import get_async_read_db, get_db, get_read_db, release_connection
 from backend.services.categorize import CATEGORIES
+from backend.services import touch  # noqa: F401  (registers the updated_at hook)
+from backend.utils import cursor as keyset, gemini
+from backend.utils.http_cache import etag, not_modified
+from backend.utils.perf import TimedRoute, llm_timer
 
-router = APIRouter(prefix="/api/ingredients", tags=["ingredients"])
+router = APIRouter(prefix="/api/ingredients", tags=["ingredients"], route_class=TimedRoute)
 
 
 # ---------- Schemas ----------
@@ -65,7 +69,8 @@ class IngredientDetail(IngredientRow):
 
 class IngredientListResponse(BaseModel):
     items: List[IngredientRow]
-    total: int
+    total: Optional[int] = None  # null with with_total=false (default on cursor pages)
+    next_cursor: Optional[str] = None  # null on the last page
 
 
 class IngredientUpdate(BaseModel):
@@ -131,49 +136,37 @@ def _mark_modified(row: IngredientDatabase, by: str) -> None:
 
 
 def _gemini_client():
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise HTTPException(status_code=500, detail="GEMINI_API_KEY is not set")
-    from google import genai
-    return genai.Client(api_key=api_key)
+    return gemini.client()
 
 
-# ---------- Endpoints ----------
+# Last change to a row or its aliases (greatest() skips the NULL of rows
+# whose aliases were never edited).
+_changed_at = func.greatest(IngredientDatabase.updated_at, IngredientDatabase.aliases_updated_at)
 
-@router.get("/search", response_model=List[IngredientSearchResponse])
-def search_ingredients(
-    q: str = Query(..., min_length=1),
-    limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
-):
-    """Autocomplete. Matches canonical name OR any alias."""
-    needle = q.strip().lower()
-    if not needle:
-        return []
-    pattern = f"%{needle}%"
 
-    # Direct name matches.
-    name_rows = (
-        db.query(IngredientDatabase)
-        .filter(IngredientDatabase.alim_nom_fr.ilike(pattern))
+def _search_stmt(needle: str, limit: int):
+    """The autocomplete query, shared by the async endpoint and the sync
+    chat tools: rows whose name matches, plus the canonical rows of the
+    matching aliases, in one round trip."""
+    pattern = f"%{needle}%"
+    by_name = (
+        select(IngredientDatabase.id)
+        .where(IngredientDatabase.alim_nom_fr.ilike(pattern))
         .limit(limit * 2)
-        .all()
     )
-    # Alias matches → resolve to canonical.
-    alias_rows = (
-        db.query(IngredientAlias)
-        .filter(IngredientAlias.alias_text.ilike(pattern))
+    by_alias = (
+        select(IngredientAlias.ingredient_db_id)
+        .where(IngredientAlias.alias_text.ilike(pattern))
         .limit(limit * 2)
-        .all()
     )
-    by_id: dict[str, IngredientDatabase] = {str(r.id): r for r in name_rows}
-    for a in alias_rows:
-        if str(a.ingredient_db_id) not in by_id:
-            ref = db.get(IngredientDatabase, a.ingredient_db_id)
-            if ref:
-                by_id[str(ref.id)] = ref
+    return select(IngredientDatabase).where(
+        IngredientDatabase.id.in_(union(by_name, by_alias))
+    )
+
 
+def _ranked(needle: str, rows, limit: int) -> list[IngredientSearchResponse]:
     # Score: exact > startswith > contains.
+    by_id: dict[str, IngredientDatabase] = {str(r.id): r for r in rows}
     scored = []
     for r in by_id.values():
         n = r.alim_nom_fr.lower()
@@ -195,8 +188,34 @@ def search_ingredients(
     ]
 
 
+# ---------- Endpoints ----------
+
+@router.get("/search", response_model=List[IngredientSearchResponse])
+async def search_ingredients(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Autocomplete. Matches canonical name OR any alias."""
+    needle = q.strip().lower()
+    if not needle:
+        return []
+    rows = (await db.scalars(_search_stmt(needle, limit))).all()
+    return _ranked(needle, rows, limit)
+
+
+def search_ingredients_sync(db: Session, q: str, limit: int = 20) -> list[IngredientSearchResponse]:
+    """`search_ingredients` for callers holding a sync Session (chat tools)."""
+    needle = q.strip().lower()
+    if not needle:
+        return []
+    return _ranked(needle, db.scalars(_search_stmt(needle, limit)).all(), limit)
+
+
 @router.get("", response_model=IngredientListResponse)
 def list_ingredients(
+    request: Request,
+    response: Response,
     search: Optional[str] = None,
     category: Optional[str] = None,
     missing: bool = False,
@@ -205,8 +224,18 @@ def list_ingredients(
     source: Optional[str] = None,
     skip: int = 0,
     limit: int = Query(50, ge=1, le=200),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    with_total: Optional[bool] = None,
+    db: Session = Depends(get_read_db),
 ):
+    """Browse the knowledge base by name. `cursor` (the previous page's
+    `next_cursor`) pages on the unique `alim_nom_fr` instead of `skip`, so
+    deep pages cost what the first does; `with_total=false` also skips the
+    `count(*)` over the whole filtered table. It defaults to true on the
+    first page only, so cursor pages skip the count unless asked."""
+    if with_total is None:
+        with_total = cursor is None
+    after = keyset.decode(cursor, (keyset.text,)) if cursor else None
     q = db.query(IngredientDatabase)
     if search:
         pat = f"%{search.strip().lower()}%"
@@ -245,23 +274,59 @@ def list_ingredients(
             )
         )
 
-    total = q.with_entities(func.count(IngredientDatabase.id)).scalar() or 0
-    rows = (
-        q.options(selectinload(IngredientDatabase.aliases))
-        .order_by(IngredientDatabase.alim_nom_fr)
-        .offset(skip)
-        .limit(limit)
-        .all()
+    total = None
+    if with_total:
+        total, latest = q.with_entities(
+            func.count(IngredientDatabase.id), func.max(_changed_at)
+        ).one()
+        tag = etag("ingredients", total, latest, skip, cursor, limit)
+        if (hit := not_modified(request, response, tag)) is not None:
+            return hit
+
+    q = q.order_by(IngredientDatabase.alim_nom_fr)
+    if after is not None:
+        q = q.filter(IngredientDatabase.alim_nom_fr > after[0])
+    else:
+        q = q.offset(skip)
+    rows, next_cursor = keyset.next_cursor(
+        q.options(selectinload(IngredientDatabase.aliases)).limit(limit + 1).all(),
+        limit,
+        lambda r: [r.alim_nom_fr],
+    )
+
+    if not with_total:
+        tag = etag(
+            "ingredients-page", [(r.id, r.updated_at, r.aliases_updated_at) for r in rows], cursor, limit
+        )
+        if (hit := not_modified(request, response, tag)) is not None:
+            return hit
+
+    return IngredientListResponse(
+        items=[_to_row(r) for r in rows], total=total, next_cursor=next_cursor
     )
-    return IngredientListResponse(items=[_to_row(r) for r in rows], total=total)
 
 
 @router.get("/{ingredient_id}", response_model=IngredientDetail)
-def get_ingredient(ingredient_id: str, db: Session = Depends(get_db)):
+def get_ingredient(
+    ingredient_id: str,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+):
     try:
         uid = UUID(ingredient_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid ingredient ID format")
+    latest = db.scalar(select(_changed_at).where(IngredientDatabase.id == uid))
+    if latest is not None:
+        hit = not_modified(request, response, etag("ingredient", uid, latest), latest)
+        if hit is not None:
+            return hit
+    return ingredient_detail(db, uid)
+
+
+def ingredient_detail(db: Session, uid: UUID) -> IngredientDetail:
+    """`get_ingredient` for in-process callers (chat tools); 404 if absent."""
     row = (
         db.query(IngredientDatabase)
         .options(selectinload(IngredientDatabase.aliases))
@@ -336,11 +401,10 @@ def delete_alias(ingredient_id: str, alias_id: str, db: Session = Depends(get_db
         aid = UUID(alias_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid alias_id")
-    deleted = (
-        db.query(IngredientAlias).filter(IngredientAlias.alias_id == aid).delete()
-    )
-    if not deleted:
+    alias = db.get(IngredientAlias, aid)
+    if alias is None:
         raise HTTPException(status_code=404, detail="Alias not found")
+    db.delete(alias)  # ORM delete: the flush hook bumps the row's updated_at
     db.commit()
 
 
@@ -356,26 +420,29 @@ def llm_fill_proposal(ingredient_id: str, db: Session = Depends(get_db)):
     if not row:
         raise HTTPException(status_code=404, detail="Ingredient not found")
 
+    name = row.alim_nom_fr
     nd = dict(row.nutrition_data or {})
     empty_keys = [k for k, v in nd.items() if v is None or v == ""]
     if not empty_keys:
         return LLMFillResponse(proposal={})
 
     client = _gemini_client()
-    from google.genai import types
+    types = gemini.types()
 
+    release_connection(db)  # don't hold a connection while Gemini answers
     prompt = (
-        f"Pour l'ingrédient « {row.alim_nom_fr} », propose des valeurs nutritionnelles "
+        f"Pour l'ingrédient « {name} », propose des valeurs nutritionnelles "
         "réalistes (par 100 g) pour les colonnes manquantes ci-dessous. "
         "Réponds UNIQUEMENT avec un JSON {colonne: valeur_numérique}. "
         "Si tu ne peux pas estimer une colonne, omets-la.\n\n"
         f"Colonnes manquantes: {empty_keys}"
     )
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=[types.Content(role="user", parts=[types.Part(text=prompt)])],
-        config=types.GenerateContentConfig(response_mime_type="application/json"),
-    )
+    with llm_timer("llm-fill"):
+        response = client.models.generate_content(
+            model="gemini-2.5-flash",
+            contents=[types.Content(role="user", parts=[types.Part(text=prompt)])],
+            config=types.GenerateContentConfig(response_mime_type="application/json"),
+        )
     try:
         proposal = json.loads(response.text or "{}")
     except (ValueError, json.JSONDecodeError) as e:
@@ -422,18 +489,22 @@ def llm_density(ingredient_id: str, db: Session = Depends(get_db)):
     if not row:
         raise HTTPException(status_code=404, detail="Ingredient not found")
 
+    name = row.alim_nom_fr
+
     client = _gemini_client()
-    from google.genai import types
+    types = gemini.types()
+    release_connection(db)  # don't hold a connection while Gemini answers
     prompt = (
-        f"Estime la densité en g/ml d'un mililitre de « {row.alim_nom_fr} ». "
+        f"Estime la densité en g/ml d'un mililitre de « {name} ». "
         "Réponds UNIQUEMENT en JSON {value: number, reason: string}. "
         "Pour information: eau ≈ 1.0, lait ≈ 1.03, huile végétale ≈ 0.92, miel ≈ 1.42."
     )
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=[types.Content(role="user", parts=[types.Part(text=prompt)])],
-        config=types.GenerateContentConfig(response_mime_type="application/json"),
-    )
+    with llm_timer("llm-density"):
+        response = client.models.generate_content(
+            model="gemini-2.5-flash",
+            contents=[types.Content(role="user", parts=[types.Part(text=prompt)])],
+            config=types.GenerateContentConfig(response_mime_type="application/json"),
+        )
     try:
         parsed = json.loads(response.text or "{}")
         value = float(parsed.get("value"))
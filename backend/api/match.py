@@ -14,10 +14,11 @@ from pydantic import BaseModel, ConfigDict
 from sqlalchemy.orm import Session
 
 from backend.db.models import IngredientDatabase
-from backend.db.session import get_db
+from backend.db.session import get_db, release_connection
 from backend.services import ingredient_match
+from backend.utils.perf import TimedRoute
 
-router = APIRouter(prefix="/api/match", tags=["match"])
+router = APIRouter(prefix="/api/match", tags=["match"], route_class=TimedRoute)
 
 
 class CanonicalRow(BaseModel):
@@ -55,7 +56,9 @@ def candidates(
     exact = ingredient_match.lookup_exact(db, name)
     if exact:
         return CandidatesResponse(exact=_to_row(exact), llm_candidates=[])
-    cands = ingredient_match.llm_candidates(db, name)
+    pool = ingredient_match.candidate_pool(db, name)
+    release_connection(db)  # don't hold a connection while Gemini answers
+    cands = ingredient_match.rank_candidates(name, pool)
     return CandidatesResponse(
         exact=None, llm_candidates=[CandidateOut(**c) for c in cands]
     )
@@ -4,13 +4,15 @@ from datetime import date, datetime, timedelta
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 
 from pydantic import BaseModel
 
-from backend.db.models import IngredientDatabase, MealPlanSlot, Recipe
-from backend.db.session import get_db
+from backend.db.models import MealPlanSlot, Recipe
+from backend.db.session import get_async_read_db, get_db, get_read_db
 from backend.schemas import (
     MealPlanReorderRequest,
     MealPlanSlotCreate,
@@ -18,15 +20,19 @@ from backend.schemas import (
     MealPlanSlotUpdate,
     MealPlanWeekResponse,
 )
+from backend.services.daily_nutrition import get_days, invalidate_days
+from backend.services.meal_plan_optimizer import candidate_pool, optimize_meals
 from backend.services.reference import DAILY_MACROS, rdi_for
 from backend.services.shopping_list_sync import (
     cleanup_orphan_items,
     sync_slot_added,
     sync_slot_changed,
 )
-from backend.utils.nutrition import convert_to_grams, safe_float
+from backend.services.weekly_nutrition import week_nutrition
+from backend.utils.http_cache import etag, not_modified
+from backend.utils.perf import TimedRoute
 
-router = APIRouter(prefix="/api/meal-plan", tags=["meal-plan"])
+router = APIRouter(prefix="/api/meal-plan", tags=["meal-plan"], route_class=TimedRoute)
 
 DEFAULT_MEALS_PER_DAY = 3
 
@@ -66,19 +72,30 @@ def _next_position(db: Session, d: date) -> int:
 
 
 @router.get("", response_model=MealPlanWeekResponse)
-def get_meal_plan(
+async def get_meal_plan(
+    request: Request,
+    response: Response,
     week_start: str = Query(..., description="Monday in YYYY-MM-DD"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     monday = _ensure_monday(_parse_date(week_start))
     sunday = monday + timedelta(days=6)
-    slots = (
-        db.query(MealPlanSlot)
+    # Slots carry their recipe's name: a renamed recipe changes the week too.
+    n_slots, latest_slot, latest_recipe = (await db.execute(
+        select(func.count(), func.max(MealPlanSlot.updated_at), func.max(Recipe.updated_at))
+        .select_from(MealPlanSlot)
+        .outerjoin(Recipe, Recipe.recipe_id == MealPlanSlot.recipe_id)
+        .where(MealPlanSlot.slot_date >= monday, MealPlanSlot.slot_date <= sunday)
+    )).one()
+    tag = etag("meal-plan", monday, n_slots, latest_slot, latest_recipe)
+    if (hit := not_modified(request, response, tag)) is not None:
+        return hit
+    slots = (await db.scalars(
+        select(MealPlanSlot)
         .options(joinedload(MealPlanSlot.recipe))
-        .filter(MealPlanSlot.slot_date >= monday, MealPlanSlot.slot_date <= sunday)
+        .where(MealPlanSlot.slot_date >= monday, MealPlanSlot.slot_date <= sunday)
         .order_by(MealPlanSlot.slot_date, MealPlanSlot.position)
-        .all()
-    )
+    )).all()
     return MealPlanWeekResponse(
         week_start=monday.isoformat(),
         slots=[_to_response(s) for s in slots],
@@ -180,11 +197,15 @@ def reorder(payload: MealPlanReorderRequest, db: Session = Depends(get_db)):
 def delete_meal(slot_id: UUID, db: Session = Depends(get_db)):
     # FK ON DELETE CASCADE on shopping_list_contributions.slot_id removes the
     # contributions; we then prune any items left empty.
+    slot_date = (
+        db.query(MealPlanSlot.slot_date).filter(MealPlanSlot.slot_id == slot_id).scalar()
+    )
     deleted = (
         db.query(MealPlanSlot)
         .filter(MealPlanSlot.slot_id == slot_id)
         .delete(synchronize_session=False)
     )
+    invalidate_days(db, [slot_date])
     db.flush()
     cleanup_orphan_items(db)
     db.commit()
@@ -197,8 +218,18 @@ def generate(
     week_start: str = Query(...),
     meals_per_day: int = Query(DEFAULT_MEALS_PER_DAY, ge=1, le=10),
     overwrite: bool = Query(False),
+    mode: str = Query("optimize", pattern="^(optimize|random)$"),
+    sex: str = Query("male", pattern="^(male|female)$"),
+    avoid_repeats: bool = Query(True),
+    favorites_only: bool = Query(True),
     db: Session = Depends(get_db),
 ):
+    """Fill the week up to `meals_per_day` meals per day.
+
+    `optimize` (default) picks recipes and portions so each day lands close
+    to the ANSES targets (see `services/meal_plan_optimizer.py`); `random`
+    draws recipes uniformly, one full recipe per slot. Both draw from the
+    favorites unless `favorites_only=false` or none are starred."""
     monday = _ensure_monday(_parse_date(week_start))
     sunday = monday + timedelta(days=6)
 
@@ -206,24 +237,31 @@ def generate(
         db.query(MealPlanSlot).filter(
             MealPlanSlot.slot_date >= monday, MealPlanSlot.slot_date <= sunday
         ).delete(synchronize_session=False)
+        invalidate_days(db, (monday + timedelta(days=i) for i in range(7)))
         db.flush()
 
-    favorites = db.query(Recipe).filter(Recipe.is_favorite == True).all()  # noqa: E712
-    pool = favorites or db.query(Recipe).limit(50).all()
+    pool = candidate_pool(db, favorites_only)
     if not pool:
         raise HTTPException(status_code=400, detail="No recipes available")
 
+    start = {d: _next_position(db, d) for d in (monday + timedelta(days=i) for i in range(7))}
+    needs = {d: max(0, meals_per_day - pos) for d, pos in start.items()}
+    if mode == "optimize":
+        picks = optimize_meals(db, pool, needs, meals_per_day, sex, avoid_repeats)
+    else:
+        picks = {
+            d: [(r, r.servings or 1) for r in (random.choice(pool) for _ in range(n))]
+            for d, n in needs.items()
+        }
+
     new_slots: list[MealPlanSlot] = []
-    for day_offset in range(7):
-        d = monday + timedelta(days=day_offset)
-        existing = _next_position(db, d)
-        for i in range(meals_per_day - existing if not overwrite else meals_per_day):
-            recipe = random.choice(pool)
+    for d, meals in picks.items():
+        for i, (recipe, servings) in enumerate(meals):
             slot = MealPlanSlot(
                 slot_date=d,
-                position=existing + i if not overwrite else i,
+                position=start[d] + i,
                 recipe_id=recipe.recipe_id,
-                servings=recipe.servings or 1,
+                servings=servings,
             )
             db.add(slot)
             new_slots.append(slot)
@@ -269,101 +307,36 @@ class WeeklyNutritionResponse(BaseModel):
     untracked: list[UntrackedItem]
 
 
-def _zero_macros() -> dict[str, float]:
-    return {k: 0.0 for k in DAILY_MACROS}
-
-
 @router.get("/nutrition", response_model=WeeklyNutritionResponse)
 def get_weekly_nutrition(
     week_start: str = Query(..., description="Monday in YYYY-MM-DD"),
     sex: str = Query("male", pattern="^(male|female)$"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Aggregate nutrition over the week's slots.
 
-    For each `MealPlanSlot.recipe.ingredients`:
-      - Resolve the canonical row via `ingredient_db_id` (NULL → untracked).
-      - Convert quantity to grams via `convert_to_grams` (spoon table +
-        density). Failure modes recorded as `missing_density` / `unknown_unit`.
-      - Multiply each per-100g nutrient by `grams * (slot.servings / recipe.servings)`.
+    Day totals are read from the `daily_nutrition` rollup, like the range
+    endpoint; untracked ingredients (missing FK, missing density, unknown
+    unit, empty nutrition row) come from the slots' recipe rollups and are
+    reported with the slot's date (see `services/weekly_nutrition.py`).
     """
     monday = _ensure_monday(_parse_date(week_start))
-    sunday = monday + timedelta(days=6)
-
-    slots = (
-        db.query(MealPlanSlot)
-        .options(joinedload(MealPlanSlot.recipe))
-        .filter(MealPlanSlot.slot_date >= monday, MealPlanSlot.slot_date <= sunday)
-        .order_by(MealPlanSlot.slot_date, MealPlanSlot.position)
-        .all()
-    )
-
-    days_macros: dict[date, dict[str, float]] = {
-        monday + timedelta(days=i): _zero_macros() for i in range(7)
-    }
-    week_full: dict[str, float] = {}
-    untracked: list[UntrackedItem] = []
-
-    for slot in slots:
-        recipe = slot.recipe
-        if recipe is None or not recipe.ingredients:
-            continue
-        ratio = (slot.servings or 1) / max(1, recipe.servings or 1)
-        for ing in recipe.ingredients:
-            if ing.ingredient_db_id is None:
-                untracked.append(UntrackedItem(
-                    slot_date=slot.slot_date.isoformat(),
-                    recipe_name=recipe.name,
-                    ingredient_name=ing.name,
-                    reason="missing_fk",
-                ))
-                continue
-            row = db.get(IngredientDatabase, ing.ingredient_db_id)
-            if row is None:
-                continue
-            grams = convert_to_grams(ing.quantity or 0, ing.unit or "", row.density_g_per_ml)
-            if grams is None:
-                u = (ing.unit or "").strip().lower()
-                volume_or_spoon = u in {"ml", "cl", "l"} or any(
-                    sp in u for sp in ("cuillere", "cuillère", "cas", "cac", "verre", "tasse")
-                )
-                reason = "missing_density" if volume_or_spoon else "unknown_unit"
-                untracked.append(UntrackedItem(
-                    slot_date=slot.slot_date.isoformat(),
-                    recipe_name=recipe.name,
-                    ingredient_name=ing.name,
-                    reason=reason,
-                ))
-                continue
-            if not row.nutrition_data:
-                untracked.append(UntrackedItem(
-                    slot_date=slot.slot_date.isoformat(),
-                    recipe_name=recipe.name,
-                    ingredient_name=ing.name,
-                    reason="no_data",
-                ))
-                continue
-
-            scale = grams * ratio / 100.0
-            for key, raw in row.nutrition_data.items():
-                v = safe_float(raw)
-                if v is None:
-                    continue
-                contribution = v * scale
-                week_full[key] = week_full.get(key, 0.0) + contribution
-                if key in DAILY_MACROS:
-                    days_macros[slot.slot_date][key] = (
-                        days_macros[slot.slot_date].get(key, 0.0) + contribution
-                    )
+    totals = week_nutrition(db, monday)
 
     days = [
         NutritionDay(
             date=d.isoformat(),
-            macros={k: round(days_macros[d].get(k, 0.0), 2) for k in DAILY_MACROS},
+            macros={
+                k: round(totals.days.get(d, {}).get(k, 0.0), 2) for k in DAILY_MACROS
+            },
         )
-        for d in sorted(days_macros)
+        for d in (monday + timedelta(days=i) for i in range(7))
+    ]
+    week = {k: round(v, 2) for k, v in totals.week.items()}
+    untracked = [
+        UntrackedItem(**{**u, "slot_date": u["slot_date"].isoformat()})
+        for u in totals.untracked
     ]
-    week = {k: round(v, 2) for k, v in week_full.items()}
     return WeeklyNutritionResponse(
         week_start=monday.isoformat(),
         days=days,
@@ -371,3 +344,68 @@ def get_weekly_nutrition(
         rdi=rdi_for(sex),  # type: ignore[arg-type]
         untracked=untracked,
     )
+
+
+# ---- Range nutrition ----
+
+MAX_RANGE_DAYS = 366
+
+
+class RangeNutritionDay(BaseModel):
+    date: str
+    totals: dict[str, float]
+    untracked_count: int
+
+
+class RangeNutritionResponse(BaseModel):
+    start: str
+    end: str
+    days: list[RangeNutritionDay]
+    period: dict[str, float]
+    rdi: dict[str, float]  # daily targets
+    period_rdi: dict[str, float]  # daily targets × number of days
+
+
+@router.get("/nutrition/range", response_model=RangeNutritionResponse)
+def get_range_nutrition(
+    start: str = Query(..., alias="from", description="First day, YYYY-MM-DD"),
+    end: str = Query(..., alias="to", description="Last day (inclusive), YYYY-MM-DD"),
+    sex: str = Query("male", pattern="^(male|female)$"),
+    db: Session = Depends(get_read_db),
+):
+    """Per-day and whole-period totals for every CIQUAL key over [from, to].
+
+    Days are read from the `daily_nutrition` rollup, which the writes keep
+    current; a day never built is computed for this response only (see
+    `services/daily_nutrition.py`)."""
+    first, last = _parse_date(start), _parse_date(end)
+    if last < first:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    n_days = (last - first).days + 1
+    if n_days > MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=400, detail=f"Range too long: max {MAX_RANGE_DAYS} days"
+        )
+
+    rows = get_days(db, first, last, persist=False)
+    period: dict[str, float] = {}
+    days = []
+    for d in (first + timedelta(days=i) for i in range(n_days)):
+        row = rows.get(d)
+        totals = row.totals if row else {}
+        for key, v in totals.items():
+            period[key] = period.get(key, 0.0) + v
+        days.append(RangeNutritionDay(
+            date=d.isoformat(),
+            totals={k: round(v, 2) for k, v in totals.items()},
+            untracked_count=row.untracked_count if row else 0,
+        ))
+    rdi = rdi_for(sex)  # type: ignore[arg-type]
+    return RangeNutritionResponse(
+        start=first.isoformat(),
+        end=last.isoformat(),
+        days=days,
+        period={k: round(v, 2) for k, v in period.items()},
+        rdi=rdi,
+        period_rdi={k: round(v * n_days, 2) for k, v in rdi.items()},
+    )
@@ -1,80 +1,288 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import desc, String, func
-from typing import Optional
+from sqlalchemy import desc, func, select, tuple_
+from typing import List, Literal, Optional, Union
 from uuid import UUID
 
-from backend.db.session import get_db
+from backend.db.session import get_async_read_db, get_db, get_read_db
 from backend.db.models import Recipe, Ingredient, Instruction
 from backend.schemas import (
     RecipeCreate,
     RecipeUpdate,
     RecipeResponse,
-    RecipeListResponse
+    PantryResponse,
+    RecipeListResponse,
+    RecipeSummaryListResponse,
+    TagCount,
 )
-from backend.utils.nutrition import compute_recipe_nutrition
+from backend.services import recipe_search, recipe_tags
+from backend.services.pantry import search_pantry
+from backend.services.recipe_nutrition import get_rollup, promoted_nutrition
+from backend.services.recipe_update import diff_ingredients, diff_instructions
+from backend.services.shopping_list_sync import sync_recipe_changed
+from backend.utils import cursor as keyset
+from backend.utils.fast_json import json_response
+from backend.utils.http_cache import etag, not_modified
+from backend.utils.perf import TimedRoute
 
-router = APIRouter(prefix="/api/recipes", tags=["recipes"])
+router = APIRouter(prefix="/api/recipes", tags=["recipes"], route_class=TimedRoute)
+
+# Projected columns for the bulk list, in the response schemas' field order.
+_RECIPE_COLS = (
+    Recipe.name, Recipe.description, Recipe.prep_time, Recipe.cook_time,
+    Recipe.servings, Recipe.cuisine_type, Recipe.tags, Recipe.image_url,
+    Recipe.is_favorite, Recipe.recipe_id, Recipe.created_at, Recipe.updated_at,
+)
+_RECIPE_KEYS = tuple(c.key for c in _RECIPE_COLS)
+_INGREDIENT_COLS = (
+    Ingredient.name, Ingredient.quantity, Ingredient.unit, Ingredient.notes,
+    Ingredient.ingredient_db_id, Ingredient.ingredient_id,
+)
+# List order (favorites first, then newest); recipe_id breaks created_at
+# ties so the keyset cursor is total. Backed by ix_recipes_list_order.
+# A text search puts its ts_rank in front.
+_SORT_KEY = (Recipe.is_favorite, Recipe.created_at, Recipe.recipe_id)
+_SORT_NAMES = tuple(c.key for c in _SORT_KEY)
+_CURSOR_PARSERS = (keyset.flag, keyset.timestamp, keyset.uuid)
+_INSTRUCTION_COLS = (
+    Instruction.step_number, Instruction.instruction_text, Instruction.instruction_id,
+)
 
 
-@router.get("", response_model=RecipeListResponse)
-def list_recipes(
+async def _recipe_dicts(db: AsyncSession, page) -> list[dict]:
+    """Projected recipe rows → dicts shaped like `RecipeResponse`, children
+    fetched with one IN query each (as `selectinload` would)."""
+    recipes = [{**dict(zip(_RECIPE_KEYS, r)), "tags": r.tags or []} for r in page]
+    by_id = {r["recipe_id"]: r for r in recipes}
+    for r in recipes:
+        r["ingredients"], r["instructions"] = [], []
+    if not by_id:
+        return recipes
+    for row in await db.execute(
+        select(Ingredient.recipe_id, *_INGREDIENT_COLS).where(Ingredient.recipe_id.in_(by_id))
+    ):
+        rid, *values = row
+        by_id[rid]["ingredients"].append(dict(zip(row._fields[1:], values)))
+    for row in await db.execute(
+        select(Instruction.recipe_id, *_INSTRUCTION_COLS)
+        .where(Instruction.recipe_id.in_(by_id))
+        .order_by(Instruction.step_number)
+    ):
+        rid, *values = row
+        by_id[rid]["instructions"].append(dict(zip(row._fields[1:], values)))
+    return recipes
+
+
+def _summary_dict(row) -> dict:
+    return {
+        **dict(zip(_RECIPE_KEYS, row)),
+        "tags": row.tags or [],
+        "ingredient_count": row.ingredient_count,
+    }
+
+
+@router.get("", response_model=Union[RecipeListResponse, RecipeSummaryListResponse])
+async def list_recipes(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     search: Optional[str] = None,
     cuisine: Optional[str] = None,
     ingredient: Optional[str] = None,
     tag: Optional[str] = None,
-    db: Session = Depends(get_db)
+    tags: Optional[List[str]] = Query(None),
+    tag_mode: recipe_tags.TagMode = "all",
+    cursor: Optional[str] = None,
+    with_total: Optional[bool] = None,
+    fields: Literal["full", "summary"] = "full",
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """List all recipes with optional filtering
     
-    - search: Search in recipe name and description
+    - search: French full-text search over name, description, cuisine, tags,
+      ingredients and steps (every word as a prefix); results by relevance
     - cuisine: Filter by cuisine type
     - ingredient: Filter by ingredient name (partial match, e.g., "poulet" matches "poulet cru")
-    - tag: Filter by tag
+    - tag / tags (repeatable): exact, case-insensitive tags; `tag_mode`
+      `all` (default) or `any` of them
+    - cursor: `next_cursor` from the previous page (replaces `skip`; every
+      page costs the same, see utils/cursor.py)
+    - with_total: false skips the filtered `count(*)` (`total` is null).
+      Defaults to true on the first page only: pages read with a `cursor`
+      skip the count unless asked, so they cost what page 1 does
+    - fields: `summary` lists the recipe columns + an ingredient count
+      instead of full ingredients / instructions (use the detail endpoint
+      for those), in one statement
+
+    Conditional: answers 304 when the client's ETag still matches the
+    filtered set's count + latest `updated_at` (without the total: the
+    page's own rows).
     """
+    if with_total is None:
+        with_total = cursor is None
+    tag_clause = recipe_tags.tag_filter([*([tag] if tag else []), *(tags or [])], tag_mode)
+    text_query = recipe_search.ts_query(search)
+    if text_query is not None and await db.scalar(recipe_search.stopwords_only(text_query)):
+        text_query = None
+    sort_key, sort_names, parsers, extra_cols = _SORT_KEY, _SORT_NAMES, _CURSOR_PARSERS, ()
+    if text_query is not None:
+        relevance = recipe_search.rank(text_query)
+        sort_key, sort_names = (relevance, *_SORT_KEY), ("rank", *_SORT_NAMES)
+        parsers, extra_cols = (keyset.number, *_CURSOR_PARSERS), (relevance.label("rank"),)
+    after = keyset.decode(cursor, parsers) if cursor else None
     
     def apply_filters(q):
-        if search:
-            q = q.filter(
-                Recipe.name.ilike(f"%{search}%") |
-                Recipe.description.ilike(f"%{search}%")
-            )
+        if text_query is not None:
+            q = q.where(recipe_search.matches(text_query))
         if cuisine:
-            q = q.filter(Recipe.cuisine_type.ilike(f"%{cuisine}%"))
+            q = q.where(Recipe.cuisine_type.ilike(f"%{cuisine}%"))
         if ingredient:
-            q = q.join(Ingredient).filter(
-                Ingredient.name.ilike(f"%{ingredient}%")
-            ).distinct()
-        if tag:
-            q = q.filter(
-                func.lower(func.cast(Recipe.tags, String)).contains(tag.lower())
-            )
+            # EXISTS, not JOIN + DISTINCT: keeps one row per recipe for the
+            # window aggregates of the summary mode.
+            q = q.where(Recipe.ingredients.any(Ingredient.name.ilike(f"%{ingredient}%")))
+        if tag_clause is not None:
+            q = q.where(tag_clause)
         return q
 
-    query = apply_filters(
-        db.query(Recipe).options(
-            selectinload(Recipe.ingredients),
-            selectinload(Recipe.instructions),
+    def totals():
+        matched = apply_filters(select(Recipe.recipe_id, Recipe.updated_at)).subquery()
+        return select(func.count(), func.max(matched.c.updated_at)).select_from(matched)
+
+    if fields == "summary":
+        return await _list_summaries(
+            db, request, response, apply_filters, totals, extra_cols, sort_names,
+            after, skip, cursor, limit, with_total,
         )
+
+    total = None
+    if with_total:
+        total, latest = (await db.execute(totals())).one()
+        validator = etag("recipes", total, latest, skip, cursor, limit)
+        if (hit := not_modified(request, response, validator)) is not None:
+            return hit
+
+    # Plain rows + orjson rather than ORM objects validated into
+    # RecipeResponse (see utils/fast_json.py).
+    query = apply_filters(select(*_RECIPE_COLS, *extra_cols)).order_by(*(desc(c) for c in sort_key))
+    if after is not None:
+        query = query.where(tuple_(*sort_key) < tuple(after))
+    else:
+        query = query.offset(skip)
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    page, next_cursor = keyset.next_cursor(rows, limit, lambda r: [r._mapping[k] for k in sort_names])
+
+    if not with_total:
+        validator = etag("recipes-page", [(r.recipe_id, r.updated_at) for r in page], cursor, limit)
+        if (hit := not_modified(request, response, validator)) is not None:
+            return hit
+
+    return json_response(
+        {"recipes": await _recipe_dicts(db, page), "total": total, "next_cursor": next_cursor},
+        response,
+    )
+
+
+async def _list_summaries(
+    db: AsyncSession, request: Request, response: Response, apply_filters, totals,
+    extra_cols, sort_names, after, skip, cursor, limit, with_total,
+) -> Response:
+    """`fields=summary`: one statement. Window aggregates over the filtered
+    set give the total + latest `updated_at` (no separate count query), and
+    the ingredient count is only evaluated for the page's rows. The ETag is
+    checked once the page is read."""
+    window = (
+        (func.count().over().label("total"), func.max(Recipe.updated_at).over().label("latest"))
+        if with_total else ()
+    )
+    filtered = apply_filters(select(*_RECIPE_COLS, *extra_cols, *window)).subquery()
+    sort_cols = [filtered.c[k] for k in sort_names]
+    n_ingredients = (
+        select(func.count(Ingredient.ingredient_id))
+        .where(Ingredient.recipe_id == filtered.c.recipe_id)
+        .scalar_subquery()
+        .label("ingredient_count")
+    )
+    query = select(filtered, n_ingredients).order_by(*(desc(c) for c in sort_cols))
+    if after is not None:
+        query = query.where(tuple_(*sort_cols) < tuple(after))
+    else:
+        query = query.offset(skip)
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    page, next_cursor = keyset.next_cursor(rows, limit, lambda r: [r._mapping[k] for k in sort_names])
+
+    total = None
+    if with_total:
+        # Past the last page there is no row to carry the aggregates.
+        total, latest = (rows[0].total, rows[0].latest) if rows else (await db.execute(totals())).one()
+        validator = etag("recipes-summary", total, latest, skip, cursor, limit)
+    else:
+        validator = etag("recipes-summary-page", [(r.recipe_id, r.updated_at) for r in page], cursor, limit)
+    if (hit := not_modified(request, response, validator)) is not None:
+        return hit
+    return json_response(
+        {"recipes": [_summary_dict(r) for r in page], "total": total, "next_cursor": next_cursor},
+        response,
     )
-    total = apply_filters(db.query(Recipe)).count()
 
-    # Favorites first, then newest
-    recipes = query.order_by(desc(Recipe.is_favorite), desc(Recipe.created_at)).offset(skip).limit(limit).all()
-    
-    return RecipeListResponse(recipes=recipes, total=total)
+
+@router.get("/tags", response_model=List[TagCount])
+async def list_tags(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Every tag in use with its recipe count, most used first (for the
+    tag chips). Conditional on the recipes' count + latest `updated_at`."""
+    total, latest = (await db.execute(select(func.count(), func.max(Recipe.updated_at)))).one()
+    if (hit := not_modified(request, response, etag("recipe-tags", total, latest))) is not None:
+        return hit
+    rows = (await db.execute(recipe_tags.tag_counts_stmt())).all()
+    return [TagCount(tag=t, count=n) for t, n in rows]
+
+
+@router.get("/pantry", response_model=PantryResponse)
+def cook_from_pantry(
+    ingredients: List[str] = Query([]),
+    ingredient_db_ids: List[UUID] = Query([]),
+    limit: int = Query(20, ge=1, le=100),
+    min_coverage: float = Query(0.0, ge=0.0, le=1.0),
+    db: Session = Depends(get_read_db),
+):
+    """What can I cook with what I have? Recipes ranked by the share of
+    their ingredients the pantry covers, each with what's missing.
+
+    - ingredients (repeatable): free text ("poulet", "tomates")
+    - ingredient_db_ids (repeatable): CIQUAL rows
+    - min_coverage: drop recipes below this share (0..1)
+    """
+    results, unresolved = search_pantry(
+        db, ingredients, ingredient_db_ids, limit=limit, min_coverage=min_coverage
+    )
+    return PantryResponse(results=results, unresolved=unresolved)
 
 
 @router.get("/{recipe_id}", response_model=RecipeResponse)
-def get_recipe(recipe_id: UUID, db: Session = Depends(get_db)):
-    """Get a single recipe by ID"""
+async def get_recipe(
+    recipe_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Get a single recipe by ID (conditional on its `updated_at`)"""
+    latest = await db.scalar(select(Recipe.updated_at).where(Recipe.recipe_id == recipe_id))
+    if latest is not None:
+        hit = not_modified(request, response, etag("recipe", recipe_id, latest), latest)
+        if hit is not None:
+            return hit
     # Eagerly load ingredients and instructions
-    recipe = db.query(Recipe).options(
-        selectinload(Recipe.ingredients),
-        selectinload(Recipe.instructions)
-    ).filter(Recipe.recipe_id == recipe_id).first()
+    recipe = await db.scalar(
+        select(Recipe).options(
+            selectinload(Recipe.ingredients),
+            selectinload(Recipe.instructions)
+        ).where(Recipe.recipe_id == recipe_id)
+    )
     
     if not recipe:
         raise HTTPException(
@@ -86,28 +294,16 @@ def get_recipe(recipe_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.get("/{recipe_id}/nutrition")
-def get_recipe_nutrition(recipe_id: UUID, db: Session = Depends(get_db)):
-    """Get nutrition information for a recipe"""
-    recipe = db.query(Recipe).options(
-        selectinload(Recipe.ingredients)
-    ).filter(Recipe.recipe_id == recipe_id).first()
-    
-    if not recipe:
+def get_recipe_nutrition(recipe_id: UUID, db: Session = Depends(get_read_db)):
+    """Get nutrition information for a recipe (served from the
+    materialized `recipe_nutrition` rollup)."""
+    rollup = get_rollup(db, recipe_id, persist=False)
+    if rollup is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Recipe with id {recipe_id} not found"
         )
-    
-    # Calculate nutrition
-    nutrition = compute_recipe_nutrition(recipe.ingredients, db)
-    
-    # Add per-serving values
-    servings = recipe.servings if recipe.servings > 0 else 1
-    nutrition["per_serving"] = {
-        k: round(v / servings, 1) for k, v in nutrition.items()
-    }
-    nutrition["servings"] = servings
-    
+    nutrition = promoted_nutrition(rollup)
     return nutrition
 
 
@@ -178,37 +374,22 @@ def update_recipe(
     
     # Update recipe fields
     update_data = recipe_data.dict(exclude_unset=True, exclude={"ingredients", "instructions"})
+    if update_data.get("is_favorite", False) is None:
+        del update_data["is_favorite"]  # NOT NULL: an explicit null leaves it as is
+    shopping_changed = "servings" in update_data and update_data["servings"] != recipe.servings
     for field, value in update_data.items():
         setattr(recipe, field, value)
     
-    # Update ingredients if provided
+    # Ingredients / instructions are diffed against the existing rows: only
+    # changed lines are written and untouched ones keep their CIQUAL link.
     if recipe_data.ingredients is not None:
-        # Delete existing ingredients
-        db.query(Ingredient).filter(Ingredient.recipe_id == recipe_id).delete()
-        # Add new ingredients
-        for ing_data in recipe_data.ingredients:
-            ingredient = Ingredient(
-                recipe_id=recipe.recipe_id,
-                name=ing_data.name,
-                quantity=ing_data.quantity,
-                unit=ing_data.unit,
-                notes=ing_data.notes
-            )
-            db.add(ingredient)
-    
-    # Update instructions if provided
+        shopping_changed |= diff_ingredients(db, recipe, recipe_data.ingredients)
     if recipe_data.instructions is not None:
-        # Delete existing instructions
-        db.query(Instruction).filter(Instruction.recipe_id == recipe_id).delete()
-        # Add new instructions
-        for idx, instr_data in enumerate(recipe_data.instructions):
-            instruction = Instruction(
-                recipe_id=recipe.recipe_id,
-                step_number=idx + 1,
-                instruction_text=instr_data.instruction_text
-            )
-            db.add(instruction)
+        diff_instructions(db, recipe, recipe_data.instructions)
     
+    db.flush()
+    if shopping_changed:
+        sync_recipe_changed(db, recipe.recipe_id)
     db.commit()
     # Eagerly load relationships for response
     db.refresh(recipe)
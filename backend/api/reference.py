@@ -6,27 +6,41 @@ from __future__ import annotations
 from datetime import date
 from typing import Optional
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request, Response
 
 from backend.services import reference
+from backend.utils.fast_json import json_response
+from backend.utils.http_cache import etag, not_modified
+from backend.utils.perf import TimedRoute
 
-router = APIRouter(prefix="/api/reference", tags=["reference"])
+router = APIRouter(prefix="/api/reference", tags=["reference"], route_class=TimedRoute)
 
 
 @router.get("/rdi")
-def get_rdi():
+def get_rdi(request: Request, response: Response):
     """Full ANSES daily intake reference table (sources + both sexes)."""
-    return reference.rdi_payload()
+    if (hit := not_modified(request, response, reference.rdi_etag())) is not None:
+        return hit
+    return json_response(reference.rdi_json(), response)
 
 
 @router.get("/seasonality")
-def get_seasonality():
+def get_seasonality(request: Request, response: Response):
     """Full Interfel calendar (every fruit + légume × 12 months)."""
-    return reference.seasonality_payload()
+    if (hit := not_modified(request, response, reference.seasonality_etag())) is not None:
+        return hit
+    return json_response(reference.seasonality_json(), response)
 
 
 @router.get("/seasonality/in-season")
-def get_in_season(month: Optional[int] = Query(None, ge=1, le=12)):
+def get_in_season(
+    request: Request,
+    response: Response,
+    month: Optional[int] = Query(None, ge=1, le=12),
+):
     """Items in season for the given month (defaults to the current month)."""
     m = month if month is not None else date.today().month
+    tag = etag(reference.seasonality_etag(), m)
+    if (hit := not_modified(request, response, tag)) is not None:
+        return hit
     return {"month": m, "items": reference.seasonality_for(m)}
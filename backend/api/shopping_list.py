@@ -1,14 +1,15 @@
 """Shopping list — items hold contributions describing where each
 piece of the quantity came from (manual or meal-plan slot)."""
 import json
-import os
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
 
 from backend.db.models import ShoppingList, ShoppingListContribution
-from backend.db.session import get_db
+from backend.db.session import get_async_db, get_db, release_connection
 from backend.schemas import (
     ShoppingListItemCreate,
     ShoppingListItemResponse,
@@ -18,20 +19,59 @@ from backend.schemas import (
 )
 from backend.services.categorize import CATEGORIES, learn_category
 from backend.services.shopping_list_sync import _find_or_create_item
+from backend.utils import gemini
+from backend.utils.http_cache import etag, not_modified
+from backend.utils.perf import TimedRoute, llm_timer
 
-router = APIRouter(prefix="/api/shopping-list", tags=["shopping-list"])
+router = APIRouter(prefix="/api/shopping-list", tags=["shopping-list"], route_class=TimedRoute)
 
 
-def _query_items(db: Session, include_checked: bool = True):
-    q = db.query(ShoppingList).options(selectinload(ShoppingList.contributions))
+def _items_stmt(include_checked: bool = True):
+    q = select(ShoppingList).options(selectinload(ShoppingList.contributions))
+    if not include_checked:
+        q = q.where(ShoppingList.is_checked == False)  # noqa: E712
+    return q.order_by(ShoppingList.is_checked, ShoppingList.position)
+
+
+def _validator_stmt(include_checked: bool = True):
+    """Count + latest change of the items and of their contributions (which
+    carry no updated_at of their own: added / removed rows move the count
+    or the latest created_at)."""
+    items = select(ShoppingList.item_id, ShoppingList.updated_at)
     if not include_checked:
-        q = q.filter(ShoppingList.is_checked == False)  # noqa: E712
-    return q.order_by(ShoppingList.is_checked, ShoppingList.position).all()
+        items = items.where(ShoppingList.is_checked == False)  # noqa: E712
+    items = items.subquery()
+    contribs = (
+        select(ShoppingListContribution.created_at)
+        .where(ShoppingListContribution.item_id.in_(select(items.c.item_id)))
+        .subquery()
+    )
+    return select(
+        select(func.count()).select_from(items).scalar_subquery(),
+        select(func.max(items.c.updated_at)).scalar_subquery(),
+        select(func.count()).select_from(contribs).scalar_subquery(),
+        select(func.max(contribs.c.created_at)).scalar_subquery(),
+    )
+
+
+def _query_items(db: Session, include_checked: bool = True):
+    return db.scalars(_items_stmt(include_checked)).all()
 
 
 @router.get("", response_model=ShoppingListResponse)
-def list_items(include_checked: bool = Query(True), db: Session = Depends(get_db)):
-    items = _query_items(db, include_checked)
+async def list_items(
+    request: Request,
+    response: Response,
+    include_checked: bool = Query(True),
+    db: AsyncSession = Depends(get_async_db),
+):
+    n_items, latest, n_contribs, latest_contrib = (
+        await db.execute(_validator_stmt(include_checked))
+    ).one()
+    tag = etag("shopping-list", include_checked, n_items, latest, n_contribs, latest_contrib)
+    if (hit := not_modified(request, response, tag)) is not None:
+        return hit
+    items = (await db.scalars(_items_stmt(include_checked))).all()
     return ShoppingListResponse(items=items, total=len(items))
 
 
@@ -147,13 +187,8 @@ def clear_all(db: Session = Depends(get_db)):
 
 def _gemini_categorize(names: list[str]) -> dict[str, str]:
     """Call Gemini once with all ingredient names; return {name: category}."""
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise HTTPException(status_code=500, detail="GEMINI_API_KEY is not set")
-
-    # Lazy import keeps cold start of unrelated endpoints fast.
-    from google import genai
-    from google.genai import types
+    client = gemini.client()
+    types = gemini.types()
 
     prompt = (
         "Classe chaque ingrédient ci-dessous dans EXACTEMENT une des catégories suivantes. "
@@ -161,12 +196,12 @@ def _gemini_categorize(names: list[str]) -> dict[str, str]:
         f"Catégories autorisées: {CATEGORIES}\n\n"
         f"Ingrédients: {names}\n"
     )
-    client = genai.Client(api_key=api_key)
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=[types.Content(role="user", parts=[types.Part(text=prompt)])],
-        config=types.GenerateContentConfig(response_mime_type="application/json"),
-    )
+    with llm_timer("categorize"):
+        response = client.models.generate_content(
+            model="gemini-2.5-flash",
+            contents=[types.Content(role="user", parts=[types.Part(text=prompt)])],
+            config=types.GenerateContentConfig(response_mime_type="application/json"),
+        )
     try:
         raw = response.text or "{}"
         parsed = json.loads(raw)
@@ -197,8 +232,13 @@ def categorize_with_ai(
         return ShoppingListResponse(items=_query_items(db), total=len(_query_items(db)))
 
     names = [it.name for it in items]
+    ids = [it.item_id for it in items]
+    release_connection(db)  # don't hold a connection while Gemini answers
     mapping = _gemini_categorize(names)
 
+    # Items left the session with the read transaction; reload in one query
+    # (skipping any deleted meanwhile).
+    items = db.query(ShoppingList).filter(ShoppingList.item_id.in_(ids)).all()
     for it in items:
         proposed = mapping.get(it.name)
         if proposed and proposed in CATEGORIES:
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Integer, Float, Text, ForeignKey, DateTime, Boolean
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
+from sqlalchemy import DDL, Column, String, Integer, Float, Text, ForeignKey, DateTime, Boolean, Index, event
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY, TSVECTOR
 from datetime import datetime, timezone
 import uuid
 from backend.db.session import Base
@@ -9,6 +9,13 @@ from backend.db.session import Base
 class Recipe(Base):
     """Recipe model"""
     __tablename__ = "recipes"
+    __table_args__ = (
+        # List order + keyset cursor of GET /api/recipes (scanned backwards).
+        Index("ix_recipes_list_order", "is_favorite", "created_at", "recipe_id"),
+        Index("ix_recipes_search_vector", "search_vector", postgresql_using="gin"),
+        # Tag filters (@> / &&), see backend/services/recipe_tags.py.
+        Index("ix_recipes_tags", "tags", postgresql_using="gin"),
+    )
     
     recipe_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False, index=True)
@@ -19,9 +26,14 @@ class Recipe(Base):
     cuisine_type = Column(String(100), index=True)
     tags = Column(ARRAY(String), default=[])
     image_url = Column(String(500))  # URL or path to image (replacing Google Drive file ID)
-    is_favorite = Column(Boolean, default=False, index=True)  # Star/favorite flag
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    # NOT NULL: both are in the keyset cursor, where a NULL drops out of
+    # the row comparison.
+    is_favorite = Column(Boolean, default=False, nullable=False, index=True)  # Star/favorite flag
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    # Full-text document (name, cuisine, tags, ingredients, description,
+    # steps) — maintained by backend/services/recipe_search.py.
+    search_vector = deferred(Column(TSVECTOR))
     
     # Relationships
     ingredients = relationship("Ingredient", back_populates="recipe", cascade="all, delete-orphan")
@@ -31,6 +43,27 @@ class Recipe(Base):
         return f"<Recipe(name='{self.name}', recipe_id='{self.recipe_id}')>"
 
 
+# Text search configuration for recipe search: French stemming over
+# unaccented words, so "pates" finds "pâtes". Where the unaccent extension
+# isn't available it is a plain copy of `french`.
+SEARCH_CONFIG = "french_unaccent"
+SEARCH_CONFIG_DDL = f"""
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{SEARCH_CONFIG}') THEN
+        CREATE TEXT SEARCH CONFIGURATION {SEARCH_CONFIG} (COPY = french);
+        IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'unaccent') THEN
+            CREATE EXTENSION IF NOT EXISTS unaccent;
+            ALTER TEXT SEARCH CONFIGURATION {SEARCH_CONFIG}
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, french_stem;
+        END IF;
+    END IF;
+END
+$$;
+"""
+event.listen(Recipe.__table__, "after_create", DDL(SEARCH_CONFIG_DDL))
+
+
 class Ingredient(Base):
     """Ingredient model - belongs to a recipe"""
     __tablename__ = "ingredients"
@@ -47,6 +80,10 @@ class Ingredient(Base):
         nullable=True,
         index=True,
     )
+    # quantity × unit resolved to grams (density of the linked row for
+    # volumes); kept current by the flush hook in services/ingredient_grams.py.
+    quantity_g = Column(Float, nullable=True)
+    gram_status = Column(String(20), nullable=False, default="unknown_unit")  # 'ok' | 'missing_density' | 'unknown_unit'
 
     # Relationship
     recipe = relationship("Recipe", back_populates="ingredients")
@@ -106,6 +143,46 @@ class MealPlanSlot(Base):
         return f"<MealPlanSlot({self.slot_date} #{self.position} -> {self.recipe_id})>"
 
 
+class RecipeNutrition(Base):
+    """Materialized nutrition rollup for one recipe: totals for every CIQUAL
+    key at the recipe's own servings. Rows are dropped whenever an input
+    changes and rebuilt when that transaction commits (see
+    services/recipe_nutrition.py); reads never write them."""
+    __tablename__ = "recipe_nutrition"
+
+    recipe_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("recipes.recipe_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    servings = Column(Integer, nullable=False, default=1)
+    totals = Column(JSONB, nullable=False, default=dict)  # {ciqual_key: value}
+    per_serving = Column(JSONB, nullable=False, default=dict)
+    untracked_count = Column(Integer, nullable=False, default=0)
+    untracked = Column(JSONB, nullable=False, default=list)  # [{ingredient_name, reason}]
+    computed_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"<RecipeNutrition(recipe_id='{self.recipe_id}', untracked={self.untracked_count})>"
+
+
+class DailyNutrition(Base):
+    """Pre-aggregated nutrition for one calendar day of the meal plan: the
+    sum of its slots' recipe rollups, scaled by slot servings. Recomputed in
+    the same transaction as any meal-plan write touching the day or any
+    change to one of its recipes (see services/daily_nutrition.py). Days
+    without slots have no row."""
+    __tablename__ = "daily_nutrition"
+
+    day = Column(Date, primary_key=True)
+    totals = Column(JSONB, nullable=False, default=dict)  # {ciqual_key: value}
+    untracked_count = Column(Integer, nullable=False, default=0)
+    computed_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"<DailyNutrition(day={self.day}, untracked={self.untracked_count})>"
+
+
 class ShoppingList(Base):
     """One ingredient on the shopping list. Quantity & sources live in
     ShoppingListContribution rows (one ingredient may have several)."""
@@ -195,6 +272,9 @@ class IngredientDatabase(Base):
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
+    # Alias writes bump this, not `updated_at`: `updated_at` also
+    # fingerprints the nutrition engine snapshot, which aliases don't feed.
+    aliases_updated_at = Column(DateTime, nullable=True)
 
     aliases = relationship(
         "IngredientAlias",
@@ -206,6 +286,25 @@ class IngredientDatabase(Base):
         return f"<IngredientDatabase(name='{self.alim_nom_fr}')>"
 
 
+class IngredientNutrient(Base):
+    """Pre-parsed numeric copy of one `nutrition_data` cell (per 100 g).
+    Written whenever nutrition_data is (see services/nutrients.py), so hot
+    paths and SQL aggregation never parse CIQUAL strings. Unparseable or
+    empty cells have no row."""
+    __tablename__ = "ingredient_nutrients"
+
+    ingredient_db_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("ingredient_database.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    nutrient_key = Column(String(255), primary_key=True, index=True)
+    value = Column(Float, nullable=False)
+
+    def __repr__(self):
+        return f"<IngredientNutrient({self.ingredient_db_id} {self.nutrient_key}={self.value})>"
+
+
 class IngredientAlias(Base):
     """Free-text → CIQUAL canonical match, persisted so we don't re-LLM
     every time. `created_by` tracks who confirmed the alias."""
@@ -1,6 +1,14 @@
 import os
+import threading
+import time
+from collections import deque
+
+from fastapi import Request
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -11,41 +19,407 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL environment variable is not set")
 
-# Ensure SSL mode is set for Neon
-if "sslmode" not in DATABASE_URL:
-    separator = "&" if "?" in DATABASE_URL else "?"
-    DATABASE_URL = f"{DATABASE_URL}{separator}sslmode=require"
+
+
+def _with_sslmode(url: str) -> str:
+    # Ensure SSL mode is set for Neon
+    if "sslmode" not in url:
+        separator = "&" if "?" in url else "?"
+        url = f"{url}{separator}sslmode=require"
+    return url
+
+
+DATABASE_URL = _with_sslmode(DATABASE_URL)
+
+# Optional read replica (e.g. a Neon read replica endpoint). Safe GET
+# handlers read from it through `get_read_db` / `get_async_read_db`;
+# unset, they use the primary like everything else.
+READ_DATABASE_URL = _with_sslmode(os.environ["READ_DATABASE_URL"]) if os.getenv("READ_DATABASE_URL") else None
+# After a client writes, its reads stay on the primary for this many
+# seconds (replica lag vs. read-your-own-writes), via the cookie below.
+READ_AFTER_WRITE_S = float(os.getenv("READ_AFTER_WRITE_S", "5"))
+PRIMARY_COOKIE = "db_primary_until"
+
+# ---- Connection pool profiles ----
+#
+# DB_POOL_PROFILE picks how connections are pooled:
+#   serverless  — one short-lived function per request behind an external
+#                 pooler (Neon's "-pooler" endpoint / pgbouncer): NullPool,
+#                 the pooler does the pooling. Default on Vercel.
+#   selfhosted  — long-lived multi-worker process (uvicorn/gunicorn):
+#                 a real per-process QueuePool. Default elsewhere.
+#   test        — a small pool, enough for a TestClient plus fixtures.
+# DB_POOL_SIZE / DB_MAX_OVERFLOW / DB_POOL_TIMEOUT override the profile's
+# numbers; DB_POOL_WARM is how many connections `warm_pool` opens at startup.
+
+POOL_PROFILES: dict[str, dict] = {
+    "serverless": {"poolclass": "null", "warm": 0},
+    "selfhosted": {
+        "poolclass": "queue", "pool_size": 5, "max_overflow": 10,
+        "pool_timeout": 10, "pool_recycle": 1800, "warm": 2,
+    },
+    "test": {
+        "poolclass": "queue", "pool_size": 2, "max_overflow": 2,
+        "pool_timeout": 5, "pool_recycle": 300, "warm": 0,
+    },
+}
+
+
+def pool_profile_name() -> str:
+    name = os.getenv("DB_POOL_PROFILE") or ("serverless" if os.getenv("VERCEL") else "selfhosted")
+    if name not in POOL_PROFILES:
+        raise RuntimeError(
+            f"DB_POOL_PROFILE={name!r} is not one of {', '.join(POOL_PROFILES)}"
+        )
+    return name
+
+
+def pool_settings(name: str) -> dict:
+    """Profile `name` with any DB_POOL_* env overrides applied (sizing ones
+    only where the profile has a queue pool)."""
+    settings = dict(POOL_PROFILES[name])
+    for env, key in (
+        ("DB_POOL_SIZE", "pool_size"),
+        ("DB_MAX_OVERFLOW", "max_overflow"),
+        ("DB_POOL_TIMEOUT", "pool_timeout"),
+        ("DB_POOL_WARM", "warm"),
+    ):
+        if os.getenv(env) and (key in settings):
+            settings[key] = int(os.environ[env])
+    return settings
+
+
+def _percentile_ms(sorted_s: list[float], q: float) -> float:
+    if not sorted_s:
+        return 0.0
+    return round(sorted_s[min(len(sorted_s) - 1, int(q * len(sorted_s)))] * 1000, 3)
+
+
+class PoolMetrics:
+    """Checkout counters for the app engine's pool (see `pool_status`)."""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._waits: deque[float] = deque(maxlen=window)
+        self.checkouts = 0
+        self.overflow_checkouts = 0  # checkouts served beyond pool_size
+        self.timeouts = 0
+        self.wait_total_s = 0.0
+        self.wait_max_s = 0.0
+
+    def record(self, wait_s: float, overflowed: bool) -> None:
+        with self._lock:
+            self._waits.append(wait_s)
+            self.checkouts += 1
+            self.overflow_checkouts += overflowed
+            self.wait_total_s += wait_s
+            self.wait_max_s = max(self.wait_max_s, wait_s)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            return {
+                "checkouts": self.checkouts,
+                "overflow_checkouts": self.overflow_checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_p50": _percentile_ms(waits, 0.50),
+                "wait_ms_p95": _percentile_ms(waits, 0.95),
+                "wait_ms_max": round(self.wait_max_s * 1000, 3),
+                "wait_ms_total": round(self.wait_total_s * 1000, 3),
+            }
+
+
+# Module-level so the counters survive `pool.recreate()` after a disconnect.
+pool_metrics = PoolMetrics()
+
+
+class _TimedPool:
+    """Mixin timing `Pool.connect()` — i.e. how long a request waited for a
+    connection, including opening a new one."""
+
+    def connect(self):
+        t0 = time.perf_counter()
+        try:
+            conn = super().connect()
+        except sa_exc.TimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        overflowed = isinstance(self, QueuePool) and self.overflow() > 0
+        pool_metrics.record(time.perf_counter() - t0, overflowed)
+        return conn
+
+
+class TimedQueuePool(_TimedPool, QueuePool):
+    pass
+
+
+class TimedNullPool(_TimedPool, NullPool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPool, AsyncAdaptedQueuePool):
+    pass
+
 
 _engine = None
+_async_engine = None
+_read_engine = None
+_async_read_engine = None
 _SessionLocal = None
+_AsyncSessionLocal = None
+_ReadSessionLocal = None
+_AsyncReadSessionLocal = None
+_pool_profile: str | None = None
+
+
+def _engine_kwargs(queue_pool) -> dict:
+    global _pool_profile
+    _pool_profile = pool_profile_name()
+    settings = pool_settings(_pool_profile)
+    settings.pop("warm")
+    poolclass = TimedNullPool if settings.pop("poolclass") == "null" else queue_pool
+    return {"poolclass": poolclass, "pool_pre_ping": True, "echo": False, **settings}
+
 
 def get_engine():
     """Get or create the database engine"""
     global _engine
     if _engine is None:
-        _engine = create_engine(
-            DATABASE_URL,
-            pool_pre_ping=True,
-            pool_size=1,
-            max_overflow=0,
-            pool_recycle=300,
-            echo=False,
-        )
+        _engine = create_engine(DATABASE_URL, **_engine_kwargs(TimedQueuePool))
     return _engine
 
-def get_db():
-    """Dependency for getting database session"""
+
+def async_database_url(url: str) -> str:
+    """Same database through psycopg's native async driver (already our sync
+    driver, so sslmode & co. carry over unchanged)."""
+    scheme, rest = url.split("://", 1)
+    if scheme in ("postgres", "postgresql") or scheme.startswith("postgresql+"):
+        scheme = "postgresql+psycopg"
+    return f"{scheme}://{rest}"
+
+
+def get_async_engine():
+    """Get or create the async engine. Same pool profile as `get_engine`,
+    but its own pool: a process running both holds up to twice the
+    profile's connections."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            async_database_url(DATABASE_URL), **_engine_kwargs(TimedAsyncQueuePool)
+        )
+    return _async_engine
+
+
+def get_read_engine():
+    """Engine on the read replica — the primary's engine when there is no
+    READ_DATABASE_URL. Replica sessions run READ ONLY transactions."""
+    global _read_engine
+    if READ_DATABASE_URL is None:
+        return get_engine()
+    if _read_engine is None:
+        _read_engine = create_engine(
+            READ_DATABASE_URL, **_engine_kwargs(TimedQueuePool)
+        ).execution_options(postgresql_readonly=True)
+    return _read_engine
+
+
+def get_async_read_engine():
+    global _async_read_engine
+    if READ_DATABASE_URL is None:
+        return get_async_engine()
+    if _async_read_engine is None:
+        _async_read_engine = create_async_engine(
+            async_database_url(READ_DATABASE_URL), **_engine_kwargs(TimedAsyncQueuePool)
+        ).execution_options(postgresql_readonly=True)
+    return _async_read_engine
+
+
+def warm_pool(n: int | None = None) -> int:
+    """Open up to `n` connections (default: the profile's `warm`) and return
+    them to the pool, so the first requests don't pay for TLS + auth.
+    Returns how many were opened; a no-op under NullPool."""
+    engine = get_engine()
+    if n is None:
+        n = pool_settings(_pool_profile)["warm"]
+    if not isinstance(engine.pool, QueuePool):
+        return 0
+    n = min(n, engine.pool.size())
+    conns = []
+    try:
+        for _ in range(n):
+            conns.append(engine.connect())
+    finally:
+        for c in conns:
+            c.close()
+    return len(conns)
+
+
+def _pool_state(pool) -> dict:
+    state = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        state.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "in_use": pool.checkedout(),
+            "overflow": max(0, pool.overflow()),
+            "max_overflow": pool._max_overflow,
+        })
+    return state
+
+
+def pool_status() -> dict:
+    """Live state + counters of the app engines' pools (counters cover both
+    the sync and the async engine)."""
+    status = {"profile": _pool_profile, **_pool_state(get_engine().pool)}
+    if _async_engine is not None:
+        status["async"] = _pool_state(_async_engine.pool)
+    if _read_engine is not None:
+        status["replica"] = _pool_state(_read_engine.pool)
+    if _async_read_engine is not None:
+        status["replica_async"] = _pool_state(_async_read_engine.pool)
+    status.update(pool_metrics.snapshot())
+    return status
+
+def _session_local():
     global _SessionLocal
     if _SessionLocal is None:
         engine = get_engine()
         _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    
-    db = _SessionLocal()
+    return _SessionLocal
+
+
+def get_db():
+    """Dependency for getting database session"""
+    db = _session_local()()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_session_factory():
+    """Dependency returning the session factory itself, for handlers that
+    must not hold a connection across slow external calls (the streamed
+    chat). Open short sessions with `with factory() as db:` around each
+    piece of DB work."""
+    return _session_local()
+
+
+def release_connection(db: Session) -> None:
+    """End `db`'s transaction so its connection goes back to the pool
+    before a slow external call (Gemini). Call it from the handler, between
+    its read phase and the call: it commits, so it refuses to run with
+    unflushed changes in the session rather than commit them on someone
+    else's behalf. Loaded objects are expired and reload (taking a
+    connection again) on next access."""
+    if db.new or db.dirty or db.deleted:
+        raise RuntimeError("release_connection() with pending changes in the session")
+    db.commit()
+
+
+async def get_async_db():
+    """Dependency for an `AsyncSession`, for `async def` handlers: waiting on
+    the database then yields the event loop instead of holding a threadpool
+    worker. The ORM flush hooks still fire (they hang off the wrapped sync
+    Session). Objects stay loaded after commit — lazy loads would need IO,
+    so handlers eager-load what they return."""
+    global _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        _AsyncSessionLocal = async_sessionmaker(
+            get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    async with _AsyncSessionLocal() as db:
+        yield db
+
+
+
+# ---- Read replica routing ----
+
+def is_replica(db) -> bool:
+    """True for sessions on the read replica (they can't write)."""
+    return bool(db.info.get("replica"))
+
+
+def _use_replica(request: Request) -> bool:
+    if READ_DATABASE_URL is None:
+        return False
+    try:
+        pinned_until = float(request.cookies.get(PRIMARY_COOKIE, 0))
+    except ValueError:
+        pinned_until = 0
+    return time.time() >= pinned_until
+
+
+def get_read_db(request: Request):
+    """`get_db` for safe GET handlers: a session on the read replica, unless
+    there is none or this client wrote within READ_AFTER_WRITE_S."""
+    global _ReadSessionLocal
+    if not _use_replica(request):
+        yield from get_db()
+        return
+    if _ReadSessionLocal is None:
+        _ReadSessionLocal = sessionmaker(
+            autocommit=False, autoflush=False, bind=get_read_engine(), info={"replica": True}
+        )
+    db = _ReadSessionLocal()
     try:
         yield db
     finally:
         db.close()
 
+
+async def get_async_read_db(request: Request):
+    """`get_async_db` counterpart of `get_read_db`."""
+    global _AsyncReadSessionLocal
+    if not _use_replica(request):
+        async for db in get_async_db():
+            yield db
+        return
+    if _AsyncReadSessionLocal is None:
+        _AsyncReadSessionLocal = async_sessionmaker(
+            get_async_read_engine(), autoflush=False, expire_on_commit=False,
+            info={"replica": True},
+        )
+    async with _AsyncReadSessionLocal() as db:
+        yield db
+
+
+class PrimaryAfterWriteMiddleware:
+    """Pure ASGI middleware: a successful non-GET response sets a short-lived
+    cookie pinning that client's reads to the primary, so it reads its own
+    writes even while the replica lags. A no-op without a replica."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            READ_DATABASE_URL is None
+            or scope["type"] != "http"
+            or scope["method"] in ("GET", "HEAD", "OPTIONS")
+        ):
+            return await self.app(scope, receive, send)
+
+        async def send_pinned(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + READ_AFTER_WRITE_S
+                cookie = (
+                    f"{PRIMARY_COOKIE}={until:.3f}; Max-Age={READ_AFTER_WRITE_S:.0f}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode())],
+                }
+            await send(message)
+
+        await self.app(scope, receive, send_pinned)
+
+
 # Base class for SQLAlchemy models
 Base = declarative_base()
 
@@ -1,18 +1,75 @@
-from fastapi import FastAPI
+import hmac
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import Depends, FastAPI, Header, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from dotenv import load_dotenv
-from backend.db.session import get_engine
+from backend.db.session import PrimaryAfterWriteMiddleware, get_engine, pool_status, warm_pool
+from backend.services.reference import rdi_json, seasonality_json
+from backend.utils import metrics
+from backend.utils.perf import PerfMiddleware
 from sqlalchemy import text
 from backend.api import recipes, ingredients, shopping_list, chat, meal_plan, match, reference
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+
+def warm_up() -> dict:
+    """Pay a cold instance's one-off costs up front: parse (and re-dump)
+    the reference JSON and open one DB connection (which also wakes a suspended Neon
+    compute). Returns how long each took, in ms."""
+    t0 = time.perf_counter()
+    rdi_json()
+    seasonality_json()
+    t1 = time.perf_counter()
+    with get_engine().connect() as conn:
+        conn.execute(text("SELECT 1"))
+    t2 = time.perf_counter()
+    return {
+        "reference_ms": round((t1 - t0) * 1000, 1),
+        "db_ms": round((t2 - t1) * 1000, 1),
+    }
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Pre-connect so the first requests don't pay for TLS + auth.
+    try:
+        warm_pool()
+        if os.getenv("APP_WARMUP") == "1":
+            logger.info("warm-up: %s", warm_up())
+    except Exception as e:
+        logger.warning("warm-up failed: %s", e)
+    yield
+
+
 app = FastAPI(
     title="Food App API",
     description="Backend API for recipe management and meal planning",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Server-Timing header + per-request log line (see backend/utils/perf.py).
+app.add_middleware(PerfMiddleware)
+
+# Pins a client's reads to the primary right after it writes (no-op
+# without READ_DATABASE_URL).
+app.add_middleware(PrimaryAfterWriteMiddleware)
+
+# Compresses bodies over 1 KB for clients that accept gzip (the recipe
+# list and reference tables shrink ~5-10x). text/event-stream — the chat
+# stream — is excluded by starlette.
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -37,6 +94,39 @@ def health():
         engine = get_engine()
         with engine.connect() as conn:
             conn.execute(text("SELECT 1"))
-        return {"status": "ok", "database": "connected"}
+        return {"status": "ok", "database": "connected", "pool": pool_status()}
     except Exception as e:
-        return {"status": "error", "database": "disconnected", "error": str(e)}
+        return {
+            "status": "error", "database": "disconnected", "error": str(e),
+            "pool": pool_status(),
+        }
+
+
+def require_ops_token(authorization: Optional[str] = Header(None)) -> None:
+    """Gate for the operational endpoints, which vercel.json routes publicly:
+    with OPS_TOKEN set they need `Authorization: Bearer <OPS_TOKEN>`; without
+    it they are only served off Vercel (local dev, self-hosted)."""
+    token = os.getenv("OPS_TOKEN")
+    if not token:
+        if os.getenv("VERCEL"):
+            raise HTTPException(status_code=404, detail="Not Found")
+        return
+    if not hmac.compare_digest(authorization or "", f"Bearer {token}"):
+        raise HTTPException(status_code=401, detail="Invalid or missing ops token")
+
+
+@app.get("/warmup", dependencies=[Depends(require_ops_token)])
+def warmup():
+    """Cron/ping target keeping an instance (and the database) warm."""
+    return warm_up()
+
+
+@app.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+    dependencies=[Depends(require_ops_token)],
+)
+def prometheus_metrics():
+    """Prometheus text exposition of this process' metrics (see backend/utils/metrics.py)."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -81,9 +81,46 @@ class RecipeResponse(RecipeBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class RecipeSummary(RecipeBase):
+    """List-view projection: no ingredients / instructions, just their count."""
+    recipe_id: UUID
+    created_at: datetime
+    updated_at: datetime
+    ingredient_count: int
+
+
+class RecipeSummaryListResponse(BaseModel):
+    recipes: List[RecipeSummary]
+    total: Optional[int] = None  # null with with_total=false (default on cursor pages)
+    next_cursor: Optional[str] = None  # null on the last page
+
+
+class TagCount(BaseModel):
+    tag: str
+    count: int
+
+
+class PantryMatchResponse(BaseModel):
+    recipe_id: UUID
+    name: str
+    is_favorite: bool
+    coverage: float  # matched / total, 0..1
+    matched: int
+    total: int
+    missing: List[str]  # ingredient names not covered by the pantry
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PantryResponse(BaseModel):
+    results: List[PantryMatchResponse]
+    unresolved: List[str]  # pantry entries that matched no ingredient
+
+
 class RecipeListResponse(BaseModel):
     recipes: List[RecipeResponse]
-    total: int
+    total: Optional[int] = None  # null with with_total=false (default on cursor pages)
+    next_cursor: Optional[str] = None  # null on the last page
 
 
 # Shopping List schemas — items hold zero+ contributions describing where
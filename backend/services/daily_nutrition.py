@@ -0,0 +1,180 @@
+"""
+Per-day nutrition rollup (`daily_nutrition` table).
+
+A day's row is the sum of its slots' recipe rollups (see
+`services/recipe_nutrition.py`) scaled by `slot.servings / recipe.servings`.
+Rows are kept current two ways:
+
+  - Meal-plan writes. The `before_flush` hook below marks the days of every
+    added, moved, re-assigned or re-served slot dirty and drops their rows;
+    `before_commit` recomputes them, so the new rows land in the same
+    transaction as the slot change. Bulk `query(...).delete()` on slots
+    bypasses the hook — those call sites use `invalidate_days` explicitly.
+  - Recipe changes. Whenever a recipe's rollup is invalidated, the rows of
+    every day planning that recipe are dropped as well (done by
+    `recipe_nutrition.invalidate_recipes`); the same `before_commit` hook
+    rebuilds the rollup, then those days.
+
+So rows are only written by transactions that change their inputs.
+Readers go through `get_days(..., persist=False)`: a day that was never
+built is computed for the response, nothing is written — a GET takes no
+row locks and never races another GET on the upsert.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from itertools import chain
+from typing import Iterable
+
+from sqlalchemy import delete, event, inspect
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, joinedload
+
+from backend.db.models import DailyNutrition, MealPlanSlot
+from backend.services.recipe_nutrition import get_rollups, rebuild_dirty
+
+_DIRTY = "daily_nutrition_dirty"
+
+
+def invalidate_days(db: Session, days: Iterable[date]) -> None:
+    """Drop these days' rows now and recompute them when `db` commits."""
+    days = {d for d in days if d is not None}
+    if not days:
+        return
+    db.execute(
+        delete(DailyNutrition)
+        .where(DailyNutrition.day.in_(days))
+        .execution_options(synchronize_session=False)
+    )
+    db.info.setdefault(_DIRTY, set()).update(days)
+
+
+@event.listens_for(Session, "before_flush")
+def _invalidate_on_flush(session: Session, _flush_context, _instances) -> None:
+    days: set = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, MealPlanSlot):
+            continue
+        state = inspect(obj)
+        if obj in session.dirty and not any(
+            state.attrs[a].history.has_changes()
+            for a in ("slot_date", "recipe_id", "servings")
+        ):
+            continue
+        days.add(obj.slot_date)
+        # Moved across days: the old day loses a meal too.
+        days.update(state.attrs.slot_date.history.deleted or ())
+    invalidate_days(session, days)
+
+
+@event.listens_for(Session, "before_commit")
+def _refresh_on_commit(session: Session) -> None:
+    # Commit's own flush runs after this event: flush first so the hook
+    # above sees every pending slot change.
+    session.flush()
+    days = session.info.pop(_DIRTY, None) or set()
+    recipes = rebuild_dirty(session)
+    if recipes:
+        days.update(
+            d for (d,) in session.query(MealPlanSlot.slot_date)
+            .filter(MealPlanSlot.recipe_id.in_(recipes))
+            .distinct()
+        )
+    if days:
+        refresh_days(session, days)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_on_rollback(session: Session) -> None:
+    session.info.pop(_DIRTY, None)
+
+
+def refresh_days(db: Session, days: Iterable[date]) -> None:
+    """Recompute + upsert the rows of these days. Flushes nothing itself."""
+    days = set(days)
+    if not days:
+        return
+    # Days are marked dirty at flush time, so what we read here is current.
+    db.info.get(_DIRTY, set()).difference_update(days)
+    values = _compute_days(db, days)
+
+    emptied = days - {v["day"] for v in values}
+    if emptied:  # the day's last slot went away: no row
+        db.execute(
+            delete(DailyNutrition)
+            .where(DailyNutrition.day.in_(emptied))
+            .execution_options(synchronize_session=False)
+        )
+    if not values:
+        return
+    stmt = pg_insert(DailyNutrition).values(values)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[DailyNutrition.day],
+        set_={c: stmt.excluded[c] for c in ("totals", "untracked_count", "computed_at")},
+    ))
+
+
+def _compute_days(db: Session, days: set[date], *, persist: bool = True) -> list[dict]:
+    """Row values for the planned days among `days` (`persist` is passed to
+    `get_rollups`)."""
+    slots = (
+        db.query(MealPlanSlot)
+        .options(joinedload(MealPlanSlot.recipe))
+        .filter(MealPlanSlot.slot_date.in_(days))
+        .all()
+    )
+    rollups = get_rollups(db, {s.recipe_id for s in slots}, persist=persist)
+
+    totals: dict[date, dict[str, float]] = {}
+    untracked: dict[date, int] = {}
+    for s in slots:
+        totals.setdefault(s.slot_date, {})
+        untracked.setdefault(s.slot_date, 0)
+        rollup = rollups.get(s.recipe_id)
+        if rollup is None:
+            continue
+        ratio = (s.servings or 1) / max(1, rollup.servings or 1)
+        day = totals[s.slot_date]
+        for key, v in rollup.totals.items():
+            day[key] = day.get(key, 0.0) + v * ratio
+        untracked[s.slot_date] += rollup.untracked_count
+
+    now = datetime.now(timezone.utc)
+    return [
+        {"day": d, "totals": t, "untracked_count": untracked[d], "computed_at": now}
+        for d, t in totals.items()
+    ]
+
+
+def get_days(
+    db: Session, start: date, end: date, *, persist: bool = True
+) -> dict[date, DailyNutrition]:
+    """Rows for every planned day in [start, end], building missing ones.
+
+    Days without slots are absent. May upsert rollups + daily rows; flushes
+    nothing itself — the caller commits. With `persist=False` (readers)
+    missing days come back as transient rows, nothing is written."""
+    def _load() -> dict[date, DailyNutrition]:
+        rows = (
+            db.query(DailyNutrition)
+            .populate_existing()
+            .filter(DailyNutrition.day >= start, DailyNutrition.day <= end)
+            .all()
+        )
+        return {r.day: r for r in rows}
+
+    found = _load()
+    planned = {
+        d for (d,) in db.query(MealPlanSlot.slot_date)
+        .filter(MealPlanSlot.slot_date >= start, MealPlanSlot.slot_date <= end)
+        .distinct()
+    }
+    missing = planned - found.keys()
+    if missing and not persist:
+        found.update(
+            (v["day"], DailyNutrition(**v)) for v in _compute_days(db, missing, persist=False)
+        )
+    elif missing:
+        refresh_days(db, missing)
+        found = _load()
+    return found
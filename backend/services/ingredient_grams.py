@@ -0,0 +1,67 @@
+"""
+Keeps `Ingredient.quantity_g` / `gram_status` current.
+
+The gram equivalent of an ingredient line only changes when its quantity,
+unit or linked canonical row changes, or when that row's density does. The
+`before_flush` hook below recomputes exactly those lines, so recipe
+create/update, the chat ingredient tools and density curation all land with
+a ready float and nutrition aggregation never re-parses a unit string.
+"""
+from __future__ import annotations
+
+from itertools import chain
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from backend.db.models import Ingredient, IngredientDatabase
+from backend.utils.nutrition import resolve_grams
+
+_INPUTS = ("quantity", "unit", "ingredient_db_id", "ingredient_db")
+
+
+def _changed(obj, attrs) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[a].history.has_changes() for a in attrs)
+
+
+@event.listens_for(Session, "before_flush")
+def _resolve_on_flush(session: Session, _flush_context, _instances) -> None:
+    stale: set[Ingredient] = set()
+    redensified: set = set()
+    for obj in chain(session.new, session.dirty):
+        if isinstance(obj, Ingredient):
+            if obj in session.new or _changed(obj, _INPUTS):
+                stale.add(obj)
+        elif isinstance(obj, IngredientDatabase) and obj in session.dirty:
+            if _changed(obj, ("density_g_per_ml",)):
+                redensified.add(obj.id)
+
+    with session.no_autoflush:
+        if redensified:
+            stale.update(
+                session.query(Ingredient)
+                .filter(Ingredient.ingredient_db_id.in_(redensified))
+                .all()
+            )
+        if not stale:
+            return
+        # One round trip for every linked row; in-session rows keep their
+        # pending (not yet flushed) density.
+        fks = {i.ingredient_db_id for i in stale if i.ingredient_db_id is not None}
+        rows = {
+            r.id: r
+            for r in session.query(IngredientDatabase)
+            .filter(IngredientDatabase.id.in_(fks))
+            .all()
+        } if fks else {}
+
+    for ing in stale:
+        row = rows.get(ing.ingredient_db_id)
+        if row is None and ing.ingredient_db_id is None:
+            # Linked through the relationship only; the FK lands at flush.
+            linked = inspect(ing).attrs.ingredient_db.loaded_value
+            row = linked if isinstance(linked, IngredientDatabase) else None
+        ing.quantity_g, ing.gram_status = resolve_grams(
+            ing.quantity, ing.unit, row.density_g_per_ml if row is not None else None
+        )
@@ -4,7 +4,9 @@ Free-text ingredient name → IngredientDatabase row.
 Three resolution layers, cheapest first:
 
   1. lookup_exact(name)    — case-insensitive match on alim_nom_fr OR alias_text.
-  2. llm_candidates(name)  — pg_trgm pre-filter to ~30 rows, Gemini ranks top-3.
+  2. candidate_pool(name)  — pg_trgm pre-filter to ~30 rows;
+     rank_candidates(...)   — Gemini ranks top-3 (no DB access, so callers
+                              end their transaction in between).
   3. confirm_match()       — user-chosen winner; persists an alias for next time.
   4. create_new()          — user rejected all; mints a new IngredientDatabase row
                              (source='user', modified=true) plus an alias.
@@ -22,6 +24,8 @@ from sqlalchemy import func, text
 from sqlalchemy.orm import Session
 
 from backend.db.models import IngredientAlias, IngredientDatabase
+from backend.utils import gemini
+from backend.utils.perf import llm_timer
 
 CANDIDATE_PREFILTER_LIMIT = 30
 LLM_TOP_K = 3
@@ -90,16 +94,26 @@ def _trigram_candidates(db: Session, name: str, limit: int) -> list[IngredientDa
     return q.limit(limit).all()
 
 
-def llm_candidates(db: Session, name: str, k: int = LLM_TOP_K) -> list[dict]:
-    """Returns up to k candidates: [{ingredient_db_id, name, reason, confidence}]."""
-    pool = _trigram_candidates(db, name, CANDIDATE_PREFILTER_LIMIT)
+def candidate_pool(db: Session, name: str) -> list[dict]:
+    """Pre-filtered rows for `rank_candidates`: [{id, name}], best first."""
+    return [
+        {"id": str(r.id), "name": r.alim_nom_fr}
+        for r in _trigram_candidates(db, name, CANDIDATE_PREFILTER_LIMIT)
+    ]
+
+
+def rank_candidates(name: str, pool: list[dict], k: int = LLM_TOP_K) -> list[dict]:
+    """Returns up to k candidates: [{ingredient_db_id, name, reason, confidence}].
+
+    Takes no session: the caller ends its transaction (see
+    `release_connection`) before this waits on Gemini."""
     if not pool:
         return []
     if len(pool) <= k:
         return [
             {
-                "ingredient_db_id": str(r.id),
-                "name": r.alim_nom_fr,
+                "ingredient_db_id": r["id"],
+                "name": r["name"],
                 "reason": "Seul candidat trouvé par similarité.",
                 "confidence": 0.5,
             }
@@ -111,45 +125,43 @@ def llm_candidates(db: Session, name: str, k: int = LLM_TOP_K) -> list[dict]:
         # Without an LLM, return the top-k by trigram order untouched.
         return [
             {
-                "ingredient_db_id": str(r.id),
-                "name": r.alim_nom_fr,
+                "ingredient_db_id": r["id"],
+                "name": r["name"],
                 "reason": "Similarité trigramme.",
                 "confidence": 0.4,
             }
             for r in pool[:k]
         ]
 
-    from google import genai
-    from google.genai import types
-
-    catalog = [{"id": str(r.id), "name": r.alim_nom_fr} for r in pool]
+    types = gemini.types()
+    names = {c["id"]: c["name"] for c in pool}
     prompt = (
         f"L'utilisateur a saisi l'ingrédient « {name} ». "
         f"Choisis dans la liste ci-dessous les {k} meilleurs candidats CIQUAL "
         "qui correspondent à cet ingrédient. Réponds UNIQUEMENT avec un JSON de la forme "
         '{"candidates": [{"id": "...", "reason": "...", "confidence": 0-1}]}.\n\n'
-        f"Liste: {json.dumps(catalog, ensure_ascii=False)}"
-    )
-    client = genai.Client(api_key=api_key)
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=[types.Content(role="user", parts=[types.Part(text=prompt)])],
-        config=types.GenerateContentConfig(response_mime_type="application/json"),
+        f"Liste: {json.dumps(pool, ensure_ascii=False)}"
     )
+    client = gemini.client()
+    with llm_timer("match"):
+        response = client.models.generate_content(
+            model="gemini-2.5-flash",
+            contents=[types.Content(role="user", parts=[types.Part(text=prompt)])],
+            config=types.GenerateContentConfig(response_mime_type="application/json"),
+        )
     try:
         parsed = json.loads(response.text or "{}")
     except (ValueError, json.JSONDecodeError) as e:
         raise HTTPException(status_code=502, detail=f"Bad LLM response: {e}")
 
-    by_id = {str(r.id): r for r in pool}
     out: list[dict] = []
     for c in (parsed.get("candidates") or [])[:k]:
         cid = str(c.get("id") or "")
-        if cid in by_id:
+        if cid in names:
             out.append(
                 {
                     "ingredient_db_id": cid,
-                    "name": by_id[cid].alim_nom_fr,
+                    "name": names[cid],
                     "reason": str(c.get("reason") or ""),
                     "confidence": float(c.get("confidence") or 0.0),
                 }
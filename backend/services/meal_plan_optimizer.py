@@ -0,0 +1,129 @@
+"""
+Nutrition-target meal plan generation.
+
+Each candidate recipe is reduced to its per-serving vector over the ANSES
+keys (from its `recipe_nutrition` rollup). Meals are then filled greedily,
+one slot at a time: every (recipe, portions) pair is scored at once against
+the day's target pro-rated to the meals filled so far,
+
+    loss = Σ_k  f(total_k / (rdi_k × filled / meals_per_day))
+
+with f(x) = (x - 1)² for regular nutrients and max(0, x - 1)² for the
+lower-is-better ones (salt, saturated fat, …), which only cost when over.
+A 1,000-recipe pool × 3 portion choices × ~30 nutrients is one small numpy
+broadcast per slot, so a full week takes a few milliseconds.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import Sequence
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from backend.db.models import MealPlanSlot, Recipe
+from backend.services.recipe_nutrition import get_rollups
+from backend.services.reference import lower_is_better_set, rdi_for
+
+# Portions the optimizer may put on one slot.
+SERVING_CHOICES: tuple[int, ...] = (1, 2, 3)
+
+
+def greedy_fill(
+    vectors: np.ndarray,
+    targets: np.ndarray,
+    lower: np.ndarray,
+    needs: Sequence[int],
+    meals_per_day: int,
+    base: np.ndarray | None = None,
+    base_meals: Sequence[int] | None = None,
+    avoid_repeats: bool = True,
+    choices: Sequence[int] = SERVING_CHOICES,
+) -> list[list[tuple[int, int]]]:
+    """Pick (recipe index, portions) for each meal to add, day by day.
+
+    vectors[r, k]: per-serving amount of nutrient k in recipe r.
+    targets[k]: daily target; lower[k]: True for lower-is-better nutrients.
+    needs[d]: meals to add on day d; base[d, k] / base_meals[d]: what the
+    day already holds. Repeats are avoided across the whole call while the
+    pool allows it."""
+    n_days, n_recipes = len(needs), vectors.shape[0]
+    base = np.zeros((n_days, vectors.shape[1])) if base is None else base
+    base_meals = [0] * n_days if base_meals is None else base_meals
+    portions = np.asarray(choices, dtype=float)
+    # candidates[r, s, k] = vectors[r, k] × portions[s]
+    candidates = vectors[:, None, :] * portions[None, :, None]
+    safe_targets = np.where(targets > 0, targets, 1.0)
+    used = np.zeros(n_recipes, dtype=bool)
+
+    plan: list[list[tuple[int, int]]] = []
+    for d in range(n_days):
+        day_total = base[d].copy()
+        day_plan: list[tuple[int, int]] = []
+        for m in range(needs[d]):
+            filled = min(base_meals[d] + m + 1, meals_per_day) / meals_per_day
+            ratio = (day_total + candidates) / (safe_targets * filled)
+            over = ratio - 1.0
+            loss = np.where(lower, np.maximum(over, 0.0), over) ** 2
+            loss = np.where(targets > 0, loss, 0.0).sum(axis=2)  # [r, s]
+            if avoid_repeats and not used.all():
+                loss[used] = np.inf
+            r, s = np.unravel_index(np.argmin(loss), loss.shape)
+            used[r] = True
+            day_total += candidates[r, s]
+            day_plan.append((int(r), int(choices[s])))
+        plan.append(day_plan)
+    return plan
+
+
+def optimize_meals(
+    db: Session,
+    pool: list[Recipe],
+    needs: dict[date, int],
+    meals_per_day: int,
+    sex: str = "male",
+    avoid_repeats: bool = True,
+) -> dict[date, list[tuple[Recipe, int]]]:
+    """(recipe, portions) to add per day so each day lands near the ANSES
+    targets, taking the day's existing slots into account. May upsert
+    recipe rollups; the caller commits."""
+    days = sorted(needs)
+    existing = (
+        db.query(MealPlanSlot).filter(MealPlanSlot.slot_date.in_(days)).all()
+        if days else []
+    )
+    rollups = get_rollups(db, {r.recipe_id for r in pool} | {s.recipe_id for s in existing})
+
+    rdi = rdi_for(sex)  # type: ignore[arg-type]
+    keys = list(rdi)
+    targets = np.array([rdi[k] for k in keys])
+    lower_keys = lower_is_better_set()
+    lower = np.array([k in lower_keys for k in keys])
+
+    def per_serving(recipe_id) -> np.ndarray:
+        rollup = rollups.get(recipe_id)
+        per = rollup.per_serving if rollup else {}
+        return np.array([per.get(k, 0.0) for k in keys])
+
+    vectors = np.array([per_serving(r.recipe_id) for r in pool]).reshape(len(pool), len(keys))
+    index = {d: i for i, d in enumerate(days)}
+    base = np.zeros((len(days), len(keys)))
+    base_meals = [0] * len(days)
+    for s in existing:
+        base[index[s.slot_date]] += per_serving(s.recipe_id) * (s.servings or 1)
+        base_meals[index[s.slot_date]] += 1
+
+    picks = greedy_fill(
+        vectors, targets, lower, [needs[d] for d in days], meals_per_day,
+        base=base, base_meals=base_meals, avoid_repeats=avoid_repeats,
+    )
+    return {d: [(pool[r], portions) for r, portions in picks[i]] for i, d in enumerate(days)}
+
+
+def candidate_pool(db: Session, favorites_only: bool = True) -> list[Recipe]:
+    """Favorites when asked for (and any exist), else every recipe."""
+    if favorites_only:
+        favorites = db.query(Recipe).filter(Recipe.is_favorite == True).all()  # noqa: E712
+        if favorites:
+            return favorites
+    return db.query(Recipe).all()
@@ -0,0 +1,62 @@
+"""
+Typed nutrient storage: `ingredient_nutrients` mirrors every parseable
+`ingredient_database.nutrition_data` cell as a float.
+
+`nutrition_data` stays the source of truth (raw CIQUAL strings like
+"traces", "<0,1", "1,5"). The `after_flush` hook below rewrites the typed
+copy of any row whose nutrition_data was inserted or changed, so the CIQUAL
+loader, PATCH /api/ingredients/{id}, llm-fill confirm and the chat
+`fill_ingredient_nutrition` tool all parse exactly once, at write time.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, event, insert, inspect
+from sqlalchemy.orm import Session
+
+from backend.db.models import IngredientDatabase, IngredientNutrient
+from backend.utils.nutrition import safe_float
+
+
+def parse_nutrition(nutrition_data: Optional[dict]) -> dict[str, float]:
+    """{key: raw CIQUAL cell} → {key: float}, dropping unparseable cells."""
+    out: dict[str, float] = {}
+    for key, raw in (nutrition_data or {}).items():
+        v = safe_float(raw)
+        if v is not None:
+            out[key] = v
+    return out
+
+
+def sync_nutrients(db, rows: Iterable[IngredientDatabase]) -> None:
+    """Rewrite the typed copy of each row's nutrition_data. Rows must be
+    flushed (have an id). `db` is a Session or Connection; nothing is
+    committed."""
+    rows = [r for r in rows if r.id is not None]
+    if not rows:
+        return
+    db.execute(
+        delete(IngredientNutrient)
+        .where(IngredientNutrient.ingredient_db_id.in_([r.id for r in rows]))
+        .execution_options(synchronize_session=False)
+    )
+    values = [
+        {"ingredient_db_id": r.id, "nutrient_key": k, "value": v}
+        for r in rows
+        for k, v in parse_nutrition(r.nutrition_data).items()
+    ]
+    if values:
+        db.execute(insert(IngredientNutrient), values)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_on_flush(session: Session, _flush_context) -> None:
+    changed = [
+        obj
+        for obj in list(session.new) + list(session.dirty)
+        if isinstance(obj, IngredientDatabase)
+        and inspect(obj).attrs.nutrition_data.history.has_changes()
+    ]
+    # Core-level connection: we're inside the flush, no ORM state to sync.
+    sync_nutrients(session.connection(), changed)
@@ -0,0 +1,152 @@
+"""
+Vectorized nutrition aggregation over the ingredient knowledge base.
+
+The typed `ingredient_nutrients` table is loaded once per process into a
+dense float matrix — rows = ingredient ids, columns = CIQUAL keys, NaN where
+a cell is unknown — so no CIQUAL string is parsed on a hot path. Ingredient
+grams are read pre-resolved from `Ingredient.quantity_g`, so any nutrition
+question reduces to a gram-weighted product over a sparse weight vector:
+
+    totals[group, key] = Σ_i  weight_i × M[row_i, key]      (weight = grams / 100)
+
+The snapshot is keyed on (row count, max(updated_at)). Every curation write
+goes through the ORM and bumps `updated_at`, so the next request reloads.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import and_, cast, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from backend.db.models import Ingredient, IngredientDatabase, IngredientNutrient
+# Register the flush hooks that keep ingredient_nutrients and
+# Ingredient.quantity_g in sync — the engine reads both as-is.
+from backend.services import ingredient_grams, nutrients  # noqa: F401
+from backend.utils import metrics
+
+
+@dataclass
+class WeightPlan:
+    """Sparse weights ready for `NutritionEngine.aggregate`, plus the
+    ingredients that could not contribute and why."""
+    rows: list[int] = field(default_factory=list)
+    weights: list[float] = field(default_factory=list)
+    groups: list[int] = field(default_factory=list)
+    untracked: list[tuple[int, Ingredient, str]] = field(default_factory=list)
+
+
+class NutritionEngine:
+    def __init__(
+        self,
+        ids: list[UUID],
+        keys: list[str],
+        matrix: np.ndarray,
+        has_data: np.ndarray,
+        fingerprint: tuple = (),
+    ):
+        self.keys = keys
+        self.matrix = matrix
+        self.has_data = has_data
+        self.fingerprint = fingerprint
+        self.row_index: dict[UUID, int] = {uid: i for i, uid in enumerate(ids)}
+        self.key_index: dict[str, int] = {k: j for j, k in enumerate(keys)}
+
+    @classmethod
+    def load(cls, db: Session, fingerprint: tuple = ()) -> "NutritionEngine":
+        has_data = and_(
+            IngredientDatabase.nutrition_data.is_not(None),
+            IngredientDatabase.nutrition_data != cast({}, JSONB),
+        )
+        rows = db.query(IngredientDatabase.id, has_data).all()
+        # One row per ingredient: parallel key/value arrays, already floats.
+        cells = db.query(
+            IngredientNutrient.ingredient_db_id,
+            func.array_agg(IngredientNutrient.nutrient_key),
+            func.array_agg(IngredientNutrient.value),
+        ).group_by(IngredientNutrient.ingredient_db_id).all()
+
+        row_index = {r[0]: i for i, r in enumerate(rows)}
+        keys: dict[str, int] = {}
+        for _, names, _ in cells:
+            for k in names:
+                keys.setdefault(k, len(keys))
+        matrix = np.full((len(rows), len(keys)), np.nan)
+        for uid, names, values in cells:
+            i = row_index.get(uid)
+            if i is not None:
+                matrix[i, [keys[k] for k in names]] = values
+        has = np.array([bool(r[1]) for r in rows], dtype=bool)
+        return cls([r[0] for r in rows], list(keys), matrix, has, fingerprint)
+
+    def plan(
+        self,
+        items: Iterable[tuple[int, Ingredient, float]],
+    ) -> WeightPlan:
+        """Turn (group, ingredient, scale) triples into sparse weights.
+
+        `scale` multiplies the ingredient's persisted `quantity_g` (e.g. the
+        slot/recipe servings ratio). Reasons recorded on `untracked` mirror
+        the weekly dashboard: missing_fk, missing_density, unknown_unit,
+        no_data."""
+        plan = WeightPlan()
+        for group, ing, scale in items:
+            if ing.ingredient_db_id is None:
+                plan.untracked.append((group, ing, "missing_fk"))
+                continue
+            i = self.row_index.get(ing.ingredient_db_id)
+            if i is None:
+                continue
+            if ing.gram_status != "ok":
+                plan.untracked.append((group, ing, ing.gram_status))
+                continue
+            if not self.has_data[i]:
+                plan.untracked.append((group, ing, "no_data"))
+                continue
+            plan.rows.append(i)
+            plan.weights.append(ing.quantity_g * scale / 100.0)
+            plan.groups.append(group)
+        return plan
+
+    def aggregate(self, plan: WeightPlan, n_groups: int = 1) -> tuple[np.ndarray, np.ndarray]:
+        """Returns (totals[n_groups, n_keys], present[n_groups, n_keys]).
+
+        `present[g, j]` is True when at least one row contributing to group g
+        has a known value for key j — callers use it to omit keys nobody
+        reported."""
+        totals = np.zeros((n_groups, len(self.keys)))
+        present = np.zeros((n_groups, len(self.keys)), dtype=bool)
+        if not plan.rows:
+            return totals, present
+        sub = self.matrix[np.asarray(plan.rows)]
+        groups = np.asarray(plan.groups)
+        contrib = np.nan_to_num(sub) * np.asarray(plan.weights)[:, None]
+        np.add.at(totals, groups, contrib)
+        np.logical_or.at(present, groups, ~np.isnan(sub))
+        return totals, present
+
+
+_lock = threading.Lock()
+_engine: Optional[NutritionEngine] = None
+
+
+def nutrition_engine(db: Session) -> NutritionEngine:
+    """Process-wide engine, reloaded when the knowledge base changed."""
+    global _engine
+    count, last = db.query(
+        func.count(IngredientDatabase.id), func.max(IngredientDatabase.updated_at)
+    ).one()
+    fingerprint = (count, last)
+    with _lock:
+        outcome = "hit"
+        if _engine is None or _engine.fingerprint != fingerprint:
+            outcome = "miss" if _engine is None else "reload"
+            _engine = NutritionEngine.load(db, fingerprint)
+        engine = _engine
+    metrics.count_snapshot("nutrition_engine", outcome)
+    return engine
@@ -0,0 +1,200 @@
+"""
+"What can I cook?" — rank recipes by how much of them the pantry covers.
+
+An inverted index over every recipe's ingredients is loaded once per
+process:
+
+  key → postings (sorted recipe positions, int array)
+
+where the key is the CIQUAL row (`Ingredient.ingredient_db_id`) for linked
+ingredients and the normalized name (`name:<tokens>`) for unlinked ones.
+Each recipe counts each key once. A pantry resolves to a set of keys, and
+ranking is then one `hits[postings] += 1` per pantry key plus a vectorized
+coverage = hits / size over all recipes, instead of an `ILIKE` join per
+ingredient.
+
+Free text resolves through the same vocabulary: a pantry entry matches every
+recipe-ingredient name containing all of its (normalized) words, which yields
+that name's key (the CIQUAL row when linked). It also matches a canonical
+CIQUAL name or alias exactly (`ingredient_match.lookup_exact`).
+
+The snapshot is keyed on the recipes' (count, max(updated_at)). Ingredient
+edits bump their recipe's `updated_at` (services/touch.py), so the next
+request after any change reloads.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from backend.db.models import Ingredient, Recipe
+from backend.services.ingredient_match import lookup_exact
+from backend.utils import metrics
+
+# Dropped from names before matching ("pommes de terre" → pomme terre).
+_STOP_WORDS = {"a", "au", "aux", "d", "de", "des", "du", "en", "et", "l", "la", "le", "les"}
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def name_tokens(name: str) -> tuple[str, ...]:
+    """Unaccented, case-folded words of `name`, French plural `s`/`x`
+    stripped, stop words dropped: "Tomates séchées" → ("tomate", "sechee")."""
+    text = (name or "").casefold().replace("œ", "oe").replace("æ", "ae")
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    words = []
+    for w in _WORD.findall(text):
+        if w in _STOP_WORDS:
+            continue
+        if len(w) > 3 and w[-1] in "sx":
+            w = w[:-1]
+        words.append(w)
+    return tuple(words)
+
+
+@dataclass
+class PantryMatch:
+    recipe_id: UUID
+    name: str
+    is_favorite: bool
+    matched: int
+    total: int
+    missing: list[str] = field(default_factory=list)
+
+    @property
+    def coverage(self) -> float:
+        return self.matched / self.total if self.total else 0.0
+
+
+class PantryIndex:
+    def __init__(
+        self,
+        recipes: list[tuple[UUID, str, bool]],
+        entries: list[list[tuple[object, str]]],
+        fingerprint: tuple = (),
+    ):
+        """`entries[i]`: (key, display name) of recipe i's ingredients."""
+        self.fingerprint = fingerprint
+        self.recipe_ids = [r[0] for r in recipes]
+        self.names = [r[1] for r in recipes]
+        self.favorite = np.array([bool(r[2]) for r in recipes], dtype=bool)
+        self.entries = [list({k: n for k, n in e}.items()) for e in entries]
+        self.sizes = np.array([len(e) for e in self.entries], dtype=np.int32)
+
+        postings: dict[object, list[int]] = defaultdict(list)
+        # Recipe-ingredient vocabulary: name words → the keys seen under it.
+        self.vocab: dict[tuple[str, ...], set] = defaultdict(set)
+        self.by_token: dict[str, set[tuple[str, ...]]] = defaultdict(set)
+        for i, e in enumerate(self.entries):
+            for key, display in e:
+                postings[key].append(i)
+        for e in entries:
+            for key, display in e:
+                tokens = name_tokens(display)
+                if tokens:
+                    self.vocab[tokens].add(key)
+                    for t in tokens:
+                        self.by_token[t].add(tokens)
+        self.postings = {k: np.array(v, dtype=np.int32) for k, v in postings.items()}
+
+    @staticmethod
+    def key_for(ingredient_db_id: Optional[UUID], name: str) -> object:
+        return ingredient_db_id if ingredient_db_id is not None else "name:" + " ".join(name_tokens(name))
+
+    @classmethod
+    def load(cls, db: Session, fingerprint: tuple = ()) -> "PantryIndex":
+        recipes = db.query(Recipe.recipe_id, Recipe.name, Recipe.is_favorite).all()
+        position = {r[0]: i for i, r in enumerate(recipes)}
+        entries: list[list[tuple[object, str]]] = [[] for _ in recipes]
+        rows = db.query(Ingredient.recipe_id, Ingredient.ingredient_db_id, Ingredient.name).all()
+        for recipe_id, db_id, name in rows:
+            i = position.get(recipe_id)
+            if i is not None and (db_id is not None or name_tokens(name)):
+                entries[i].append((cls.key_for(db_id, name), name))
+        return cls(list(recipes), entries, fingerprint)
+
+    def keys_for_text(self, text: str) -> set:
+        """Every key whose recipe-ingredient name contains all of `text`'s
+        words ("poulet" → "poulet cru", "blanc de poulet", ...)."""
+        tokens = name_tokens(text)
+        if not tokens:
+            return set()
+        names = set.intersection(*(self.by_token.get(t, set()) for t in tokens))
+        return set().union(*(self.vocab[n] for n in names)) if names else set()
+
+    def rank(self, keys: Iterable, limit: int = 20, min_coverage: float = 0.0) -> list[PantryMatch]:
+        have = set(keys)
+        hits = np.zeros(len(self.recipe_ids), dtype=np.int32)
+        for key in have:
+            p = self.postings.get(key)
+            if p is not None:
+                hits[p] += 1  # postings are unique per recipe
+        if not hits.any():
+            return []
+        coverage = hits / np.maximum(self.sizes, 1)
+        candidates = np.flatnonzero((hits > 0) & (coverage >= min_coverage))
+        # Best coverage, then fewest missing, then favorites first.
+        order = np.lexsort((
+            ~self.favorite[candidates],
+            self.sizes[candidates] - hits[candidates],
+            -coverage[candidates],
+        ))
+        return [
+            PantryMatch(
+                recipe_id=self.recipe_ids[i],
+                name=self.names[i],
+                is_favorite=bool(self.favorite[i]),
+                matched=int(hits[i]),
+                total=int(self.sizes[i]),
+                missing=[n for k, n in self.entries[i] if k not in have],
+            )
+            for i in candidates[order[:limit]]
+        ]
+
+
+_lock = threading.Lock()
+_index: Optional[PantryIndex] = None
+
+
+def pantry_index(db: Session) -> PantryIndex:
+    """Process-wide index, reloaded when any recipe changed."""
+    global _index
+    fingerprint = tuple(db.query(func.count(Recipe.recipe_id), func.max(Recipe.updated_at)).one())
+    with _lock:
+        outcome = "hit"
+        if _index is None or _index.fingerprint != fingerprint:
+            outcome = "miss" if _index is None else "reload"
+            _index = PantryIndex.load(db, fingerprint)
+        index = _index
+    metrics.count_snapshot("pantry_index", outcome)
+    return index
+
+
+def search_pantry(
+    db: Session,
+    names: Iterable[str] = (),
+    ingredient_db_ids: Iterable[UUID] = (),
+    limit: int = 20,
+    min_coverage: float = 0.0,
+) -> tuple[list[PantryMatch], list[str]]:
+    """Recipes ranked by pantry coverage, and the free-text entries that
+    matched no ingredient at all."""
+    index = pantry_index(db)
+    keys: set = set(ingredient_db_ids)
+    unresolved = []
+    for name in names:
+        found = index.keys_for_text(name)
+        if (row := lookup_exact(db, name)) is not None:
+            found.add(row.id)
+        if not found:
+            unresolved.append(name)
+        keys |= found
+    return index.rank(keys, limit=limit, min_coverage=min_coverage), unresolved
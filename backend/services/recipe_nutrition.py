@@ -0,0 +1,229 @@
+"""
+Materialized per-recipe nutrition (`recipe_nutrition` table).
+
+A rollup row holds totals + per-serving values for every CIQUAL key and the
+list of ingredients that could not be tracked. Rows are written on the
+write path only: dropped as soon as one of their inputs changes, and
+rebuilt when that transaction commits (`rebuild_dirty`, run by the
+`before_commit` hook of services/daily_nutrition.py). Inputs:
+
+  - an `Ingredient` of the recipe is added, edited, relinked or deleted,
+  - the recipe's `servings` change,
+  - a linked `IngredientDatabase` row changes `nutrition_data` or
+    `density_g_per_ml`.
+
+Anything flowing through the ORM unit of work is caught by the
+`before_flush` hook below. Bulk `query(...).delete()` / `update()` calls
+bypass it, so those call sites must use `invalidate_recipes` explicitly.
+
+Dropping a rollup also drops the `daily_nutrition` rows of every day that
+plans the recipe; those are rebuilt at the same commit.
+
+Readers (GET handlers, chat read tools) never write: they pass
+`persist=False`, and a rollup that was never built is computed for the
+response only.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Iterable, Optional
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import delete, event, inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, selectinload
+
+from backend.db.models import (
+    DailyNutrition,
+    Ingredient,
+    IngredientDatabase,
+    MealPlanSlot,
+    Recipe,
+    RecipeNutrition,
+)
+from backend.services.nutrition_engine import nutrition_engine
+from backend.utils.nutrition import NUTRITION_KEYS
+
+
+_DIRTY = "recipe_nutrition_dirty"
+
+
+def _invalidate(db: Session, recipe_ids: set) -> None:
+    """Drop these rollups (and their days) now; rebuild them at commit."""
+    if not recipe_ids:
+        return
+    db.execute(
+        delete(RecipeNutrition)
+        .where(RecipeNutrition.recipe_id.in_(recipe_ids))
+        .execution_options(synchronize_session=False)
+    )
+    db.info.setdefault(_DIRTY, set()).update(recipe_ids)
+    days = select(MealPlanSlot.slot_date).where(MealPlanSlot.recipe_id.in_(recipe_ids))
+    db.execute(
+        delete(DailyNutrition)
+        .where(DailyNutrition.day.in_(days))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def invalidate_recipes(db: Session, recipe_ids: Iterable[UUID]) -> None:
+    ids = {rid for rid in recipe_ids if rid is not None}
+    if not ids:
+        return
+    _invalidate(db, ids)
+
+
+def invalidate_all(db: Session) -> None:
+    """Drop every rollup and day row, for bulk reference-data reloads that
+    bypass the hooks (scripts/load_ciqual_2025.py). Every recipe is rebuilt
+    at commit."""
+    for model in (RecipeNutrition, DailyNutrition):
+        db.execute(delete(model).execution_options(synchronize_session=False))
+    db.info.setdefault(_DIRTY, set()).update(db.scalars(select(Recipe.recipe_id)))
+
+
+def invalidate_ingredient_db(db: Session, ingredient_db_ids: Iterable[UUID]) -> None:
+    """Drop the rollup of every recipe using one of these canonical rows."""
+    ids = {i for i in ingredient_db_ids if i is not None}
+    if not ids:
+        return
+    _invalidate(db, set(db.scalars(
+        select(Ingredient.recipe_id.distinct()).where(Ingredient.ingredient_db_id.in_(ids))
+    )))
+
+
+def _changed(obj, *attrs: str) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[a].history.has_changes() for a in attrs)
+
+
+@event.listens_for(Session, "before_flush")
+def _invalidate_on_flush(session: Session, _flush_context, _instances) -> None:
+    recipe_ids: set = set()
+    db_ids: set = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Ingredient):
+            if obj in session.dirty and not session.is_modified(obj):
+                continue
+            recipe_ids.add(obj.recipe_id or (obj.recipe.recipe_id if obj.recipe else None))
+            # Moved to another recipe: the old one loses an ingredient too.
+            recipe_ids.update(inspect(obj).attrs.recipe_id.history.deleted or ())
+        elif isinstance(obj, Recipe) and obj in session.dirty:
+            if _changed(obj, "servings"):
+                recipe_ids.add(obj.recipe_id)
+        elif isinstance(obj, IngredientDatabase) and obj in session.dirty:
+            if _changed(obj, "nutrition_data", "density_g_per_ml"):
+                db_ids.add(obj.id)
+    invalidate_recipes(session, recipe_ids)
+    invalidate_ingredient_db(session, db_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_on_rollback(session: Session) -> None:
+    session.info.pop(_DIRTY, None)
+
+
+def rebuild_dirty(db: Session) -> set:
+    """Rebuild the rollups dropped in this transaction; returns their
+    recipe ids. Called at commit, after the final flush."""
+    ids = db.info.pop(_DIRTY, None)
+    if ids:
+        get_rollups(db, ids)
+    return ids or set()
+
+
+def _compute(db: Session, recipes: list[Recipe]) -> list[dict]:
+    engine = nutrition_engine(db)
+    plan = engine.plan(
+        (n, ing, 1.0) for n, r in enumerate(recipes) for ing in r.ingredients
+    )
+    totals, present = engine.aggregate(plan, n_groups=len(recipes))
+    untracked: list[list[dict]] = [[] for _ in recipes]
+    for n, ing, reason in plan.untracked:
+        untracked[n].append({"ingredient_name": ing.name, "reason": reason})
+
+    now = datetime.now(timezone.utc)
+    out = []
+    for n, r in enumerate(recipes):
+        servings = max(1, r.servings or 1)
+        cols = np.flatnonzero(present[n])
+        row_totals = {engine.keys[j]: float(totals[n, j]) for j in cols}
+        out.append({
+            "recipe_id": r.recipe_id,
+            "servings": servings,
+            "totals": row_totals,
+            "per_serving": {k: v / servings for k, v in row_totals.items()},
+            "untracked_count": len(untracked[n]),
+            "untracked": untracked[n],
+            "computed_at": now,
+        })
+    return out
+
+
+def get_rollups(
+    db: Session, recipe_ids: Iterable[UUID], *, persist: bool = True
+) -> dict[UUID, RecipeNutrition]:
+    """Rollups for the given recipes, computing + upserting any missing ones.
+
+    Flushes but does not commit — the caller owns the transaction. With
+    `persist=False` (readers) missing rollups are computed
+    but returned as transient objects, nothing is written."""
+    ids = {rid for rid in recipe_ids if rid is not None}
+    if not ids:
+        return {}
+
+    def _load(wanted) -> dict[UUID, RecipeNutrition]:
+        rows = (
+            db.query(RecipeNutrition)
+            .populate_existing()
+            .filter(RecipeNutrition.recipe_id.in_(wanted))
+            .all()
+        )
+        return {r.recipe_id: r for r in rows}
+
+    found = _load(ids)
+    missing = ids - found.keys()
+    if not missing:
+        return found
+
+    recipes = (
+        db.query(Recipe)
+        .options(selectinload(Recipe.ingredients))
+        .filter(Recipe.recipe_id.in_(missing))
+        .all()
+    )
+    if recipes:
+        values = _compute(db, recipes)
+        if not persist:
+            found.update((v["recipe_id"], RecipeNutrition(**v)) for v in values)
+            return found
+        stmt = pg_insert(RecipeNutrition).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[RecipeNutrition.recipe_id],
+            set_={c: stmt.excluded[c] for c in values[0] if c != "recipe_id"},
+        )
+        db.execute(stmt)
+        found.update(_load({r.recipe_id for r in recipes}))
+    return found
+
+
+def get_rollup(
+    db: Session, recipe_id: UUID, *, persist: bool = True
+) -> Optional[RecipeNutrition]:
+    return get_rollups(db, [recipe_id], persist=persist).get(recipe_id)
+
+
+def promoted_nutrition(rollup: RecipeNutrition, digits: int = 1) -> dict:
+    """The six promoted nutrients (calories, proteins, …) — total, per
+    serving and servings — the shape served by /api/recipes/{id}/nutrition."""
+    totals = rollup.totals or {}
+    per = rollup.per_serving or {}
+    out: dict = {k: round(totals.get(key, 0.0), digits) for k, key in NUTRITION_KEYS.items()}
+    out["per_serving"] = {
+        k: round(per.get(key, 0.0), digits) for k, key in NUTRITION_KEYS.items()
+    }
+    out["servings"] = rollup.servings
+    out["untracked_count"] = rollup.untracked_count
+    return out
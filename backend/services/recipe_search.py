@@ -0,0 +1,133 @@
+"""
+French full-text search over recipes (`recipes.search_vector`).
+
+The vector is a weighted document built in SQL from the recipe and its
+children:
+
+  A  name
+  B  cuisine, tags, ingredient names
+  C  description
+  D  instruction text
+
+parsed with the `french_unaccent` configuration (stemming + accent
+folding, see `SEARCH_CONFIG` in models.py) and indexed with GIN, so a
+search is an index lookup + `ts_rank` over the matches rather than an
+`ILIKE '%q%'` scan of every row.
+
+The `after_flush` hook below rebuilds the vector of every recipe whose
+searchable columns or Ingredient / Instruction rows went through the unit
+of work. Bulk `query(...).delete()` bypasses it, so those call sites use
+`refresh_search` explicitly.
+"""
+from __future__ import annotations
+
+import re
+from itertools import chain
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import event, func, inspect, literal, literal_column, select, update
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from backend.db.models import SEARCH_CONFIG, Ingredient, Instruction, Recipe
+
+_SEARCHABLE = ("name", "description", "cuisine_type", "tags")
+_CHILD_SEARCHABLE = {Ingredient: ("name", "recipe_id"), Instruction: ("instruction_text", "recipe_id")}
+_WORD = re.compile(r"\w+")
+
+
+def _config():
+    return literal(SEARCH_CONFIG, REGCONFIG)
+
+
+def _part(text, weight: str):
+    return func.setweight(
+        func.to_tsvector(_config(), func.coalesce(text, "")), literal_column(f"'{weight}'")
+    )
+
+
+def document() -> ColumnElement:
+    """The weighted tsvector of the `recipes` row it is evaluated against."""
+    ingredients = (
+        select(func.string_agg(Ingredient.name, " "))
+        .where(Ingredient.recipe_id == Recipe.recipe_id)
+        .scalar_subquery()
+    )
+    steps = (
+        select(func.string_agg(Instruction.instruction_text, " "))
+        .where(Instruction.recipe_id == Recipe.recipe_id)
+        .scalar_subquery()
+    )
+    tags = func.array_to_string(Recipe.tags, " ")
+    return (
+        _part(Recipe.name, "A")
+        .op("||")(_part(func.concat_ws(" ", Recipe.cuisine_type, tags, ingredients), "B"))
+        .op("||")(_part(Recipe.description, "C"))
+        .op("||")(_part(steps, "D"))
+    )
+
+
+def refresh_search(db: Session, recipe_ids: Optional[Iterable[UUID]] = None) -> None:
+    """Rebuild `search_vector` for `recipe_ids` (every recipe when None).
+    Leaves `updated_at` alone: callers changing content already bump it."""
+    stmt = update(Recipe).values(search_vector=document(), updated_at=Recipe.updated_at)
+    if recipe_ids is not None:
+        ids = {rid for rid in recipe_ids if rid is not None}
+        if not ids:
+            return
+        stmt = stmt.where(Recipe.recipe_id.in_(ids))
+    db.execute(stmt.execution_options(synchronize_session=False))
+
+
+def ts_query(text: Optional[str]) -> Optional[ColumnElement]:
+    """User input → tsquery matching every word as a prefix ("poul" finds
+    "poulet"), or None when there is nothing to search for. Words are
+    stemmed and unaccented by the same configuration as the document."""
+    words = _WORD.findall(text or "")
+    if not words:
+        return None
+    return func.to_tsquery(_config(), " & ".join(f"{w}:*" for w in words))
+
+
+def stopwords_only(query: ColumnElement):
+    """`SELECT numnode(query) = 0`: true when every word was a stopword
+    ("de la"). Such a query matches nothing, so callers drop it and list
+    as if no search was given."""
+    return select(func.numnode(query) == 0)
+
+
+def matches(query: ColumnElement) -> ColumnElement:
+    return Recipe.search_vector.op("@@")(query)
+
+
+def rank(query: ColumnElement) -> ColumnElement:
+    return func.ts_rank(Recipe.search_vector, query)
+
+
+def _child_recipe_ids(session: Session, obj) -> set:
+    state = inspect(obj)
+    if obj in session.dirty and not any(
+        state.attrs[a].history.has_changes() for a in _CHILD_SEARCHABLE[type(obj)]
+    ):
+        return set()
+    ids = {obj.recipe_id or (obj.recipe.recipe_id if obj.recipe is not None else None)}
+    # Moved to another recipe: the old one lost a word.
+    ids.update(state.attrs["recipe_id"].history.deleted or ())
+    return ids
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_on_flush(session: Session, _flush_context) -> None:
+    ids: set = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Recipe):
+            if obj in session.deleted:
+                continue
+            state = inspect(obj)
+            if obj in session.new or any(state.attrs[a].history.has_changes() for a in _SEARCHABLE):
+                ids.add(obj.recipe_id)
+        elif isinstance(obj, (Ingredient, Instruction)):
+            ids |= _child_recipe_ids(session, obj)
+    refresh_search(session, ids)
@@ -0,0 +1,55 @@
+"""
+Recipe tags: case-folded storage + indexed filtering.
+
+Tags are stored normalized — trimmed, inner whitespace collapsed,
+case-folded, de-duplicated in first-seen order — by the `set` listener
+below, so "Végé " and "végé" are one tag however a recipe is written
+(API, chat tools, scripts). Filters then compare whole tags with the
+array operators the GIN index on `recipes.tags` serves:
+
+  all  `tags @> ARRAY[...]`   (every requested tag)
+  any  `tags && ARRAY[...]`   (at least one)
+
+instead of stringifying each row's array for a substring `LIKE`.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Literal, Optional
+
+from sqlalchemy import Select, desc, event, func, select
+from sqlalchemy.sql.elements import ColumnElement
+
+from backend.db.models import Recipe
+
+TagMode = Literal["any", "all"]
+
+
+def normalize_tags(tags: Optional[Iterable[str]]) -> list[str]:
+    seen: dict[str, None] = {}
+    for t in tags or ():
+        t = " ".join(str(t).split()).casefold()
+        if t:
+            seen.setdefault(t)
+    return list(seen)
+
+
+def tag_filter(tags: Iterable[str], mode: TagMode = "all") -> Optional[ColumnElement]:
+    """WHERE clause for recipes carrying all / any of `tags` (None when
+    there is nothing to filter on)."""
+    wanted = normalize_tags(tags)
+    if not wanted:
+        return None
+    return Recipe.tags.contains(wanted) if mode == "all" else Recipe.tags.overlap(wanted)
+
+
+def tag_counts_stmt() -> Select:
+    """(tag, recipe count) rows, most used first."""
+    tag = func.unnest(Recipe.tags).label("tag")
+    used = select(tag).subquery()
+    count = func.count().label("count")
+    return select(used.c.tag, count).group_by(used.c.tag).order_by(desc(count), used.c.tag)
+
+
+@event.listens_for(Recipe.tags, "set", retval=True)
+def _normalize_on_set(_target, value, _oldvalue, _initiator):
+    return normalize_tags(value)
@@ -0,0 +1,82 @@
+"""
+Apply an edited ingredient / instruction list to a recipe as a diff.
+
+Incoming rows are matched to the existing ones and only the difference is
+written — changed columns on matched rows, inserts for new lines, deletes
+for dropped ones — through the unit of work, which batches each kind into
+one executemany at flush. Untouched rows keep their ids and their CIQUAL
+link (`ingredient_db_id`), and the flush hooks (touch, nutrition rollup,
+grams, search vector) only see what really changed.
+
+Ingredients match on their normalized name, duplicates pairing in order;
+instructions match by position.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Sequence
+
+from sqlalchemy.orm import Session
+
+from backend.db.models import Ingredient, Instruction, Recipe
+from backend.schemas import IngredientCreate, InstructionCreate
+
+# Columns that change what the recipe puts on the shopping list.
+_SHOPPING_INPUTS = ("name", "quantity", "unit", "ingredient_db_id")
+
+
+def _key(name: str) -> str:
+    return " ".join((name or "").split()).casefold()
+
+
+def _assign(obj, values: dict) -> bool:
+    """Set only the columns whose value differs; True if any did."""
+    changed = [k for k, v in values.items() if getattr(obj, k) != v]
+    for k in changed:
+        setattr(obj, k, values[k])
+    return bool(changed)
+
+
+def diff_ingredients(db: Session, recipe: Recipe, incoming: Sequence[IngredientCreate]) -> bool:
+    """Make `recipe.ingredients` match `incoming`. A matched row keeps its
+    `ingredient_db_id` unless the payload sets the field explicitly.
+    Returns whether anything the shopping list derives from changed."""
+    existing = defaultdict(list)
+    for ing in recipe.ingredients:
+        existing[_key(ing.name)].append(ing)
+
+    shopping_changed = False
+    for data in incoming:
+        values = data.model_dump(include={"name", "quantity", "unit", "notes"})
+        if "ingredient_db_id" in data.model_fields_set:
+            values["ingredient_db_id"] = data.ingredient_db_id
+        matches = existing.get(_key(data.name))
+        if matches:
+            row = matches.pop(0)
+            before = {k: getattr(row, k) for k in _SHOPPING_INPUTS}
+            if _assign(row, values):
+                shopping_changed |= any(getattr(row, k) != v for k, v in before.items())
+        else:
+            recipe.ingredients.append(Ingredient(**values))
+            shopping_changed = True
+
+    for rows in existing.values():
+        for row in rows:
+            recipe.ingredients.remove(row)
+            db.delete(row)
+            shopping_changed = True
+    return shopping_changed
+
+
+def diff_instructions(db: Session, recipe: Recipe, incoming: Sequence[InstructionCreate]) -> None:
+    """Make `recipe.instructions` match `incoming`, step i ↔ row i."""
+    rows = sorted(recipe.instructions, key=lambda i: i.step_number)
+    for idx, data in enumerate(incoming):
+        values = {"step_number": idx + 1, "instruction_text": data.instruction_text}
+        if idx < len(rows):
+            _assign(rows[idx], values)
+        else:
+            recipe.instructions.append(Instruction(**values))
+    for row in rows[len(incoming):]:
+        recipe.instructions.remove(row)
+        db.delete(row)
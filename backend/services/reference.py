@@ -13,6 +13,9 @@ from functools import lru_cache
 from pathlib import Path
 from typing import Literal
 
+from backend.utils.fast_json import dumps
+from backend.utils.http_cache import etag
+
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 
 Sex = Literal["male", "female"]
@@ -35,6 +38,18 @@ def rdi_payload() -> dict:
     return _rdi_payload()
 
 
+@lru_cache(maxsize=1)
+def rdi_etag() -> str:
+    """Content hash of `rdi_payload()` — the data only changes on deploy."""
+    return etag("rdi", _rdi_payload())
+
+
+@lru_cache(maxsize=1)
+def rdi_json() -> bytes:
+    """`rdi_payload()` serialized once — the endpoint serves these bytes."""
+    return dumps(_rdi_payload())
+
+
 def rdi_for(sex: Sex) -> dict[str, float]:
     """Daily intake target per CIQUAL key for the given sex."""
     field = "male_adult" if sex == "male" else "female_adult"
@@ -68,6 +83,16 @@ def seasonality_payload() -> dict:
     return _seasonality_payload()
 
 
+@lru_cache(maxsize=1)
+def seasonality_etag() -> str:
+    return etag("seasonality", _seasonality_payload())
+
+
+@lru_cache(maxsize=1)
+def seasonality_json() -> bytes:
+    return dumps(_seasonality_payload())
+
+
 def seasonality_for(month: int) -> list[dict]:
     """Items in season for the given month (1–12). Sorted: coeur > saison > disponibilite."""
     if not 1 <= month <= 12:
@@ -10,7 +10,9 @@ from __future__ import annotations
 
 from datetime import date
 from typing import Iterable
+from uuid import UUID
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from backend.db.models import (
@@ -20,6 +22,7 @@ from backend.db.models import (
     ShoppingListContribution,
 )
 from backend.services.categorize import categorize
+from backend.utils.units import unit_label
 
 
 _FR_WEEKDAYS = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche"]
@@ -34,16 +37,19 @@ def _source_label(recipe: Recipe, slot_date: date) -> str:
 
 
 def _scaled_quantity_text(qty: float, unit: str, ratio: float) -> str:
+    """Units go through the shared unit grammar, so "Cuillères à soupe" and
+    "c.à.s" from two recipes render the same; unknown units are kept as typed."""
     if not qty:
-        # No quantity on the recipe ingredient → keep the unit as-is, no number.
-        return (unit or "").strip()
+        # No quantity on the recipe ingredient → keep the unit, no number.
+        return unit_label(unit)
     scaled = qty * ratio
     # Trim 2-decimal noise: 1.0 → "1", 1.5 → "1.5", 0.33 → "0.33".
     if scaled == int(scaled):
         num = str(int(scaled))
     else:
         num = f"{round(scaled, 2)}".rstrip("0").rstrip(".")
-    return f"{num} {unit}".strip() if unit else num
+    label = unit_label(unit, scaled)
+    return f"{num} {label}".strip() if label else num
 
 
 def _next_position(db: Session) -> int:
@@ -118,6 +124,29 @@ def sync_slot_changed(db: Session, slot: MealPlanSlot) -> None:
     cleanup_orphan_items(db)
 
 
+def sync_recipe_changed(db: Session, recipe_id: UUID) -> int:
+    """Replace the contributions of every slot planning `recipe_id` after its
+    ingredients or servings changed. Slots with nothing left on the list
+    (cleared by the user) stay off it. Returns the number of slots re-synced."""
+    listed = select(ShoppingListContribution.slot_id).where(
+        ShoppingListContribution.recipe_id == recipe_id
+    )
+    slots = (
+        db.query(MealPlanSlot)
+        .filter(MealPlanSlot.recipe_id == recipe_id, MealPlanSlot.slot_id.in_(listed))
+        .all()
+    )
+    if not slots:
+        return 0
+    db.query(ShoppingListContribution).filter(
+        ShoppingListContribution.slot_id.in_([s.slot_id for s in slots])
+    ).delete(synchronize_session=False)
+    db.flush()
+    sync_slots_added(db, slots)
+    cleanup_orphan_items(db)
+    return len(slots)
+
+
 def cleanup_orphan_items(db: Session) -> int:
     """Delete items whose contributions list is now empty.
 
@@ -0,0 +1,79 @@
+"""
+Keep parents' `updated_at` current when only their children change.
+
+`updated_at` is what the HTTP validators (ETag / Last-Modified, see
+`utils/http_cache.py`) are derived from, so a recipe whose ingredient
+quantity changed must look changed even though no `recipes` column did.
+The `before_flush` hook below bumps:
+
+  - `Recipe.updated_at` for added / edited / removed Ingredient and
+    Instruction rows;
+  - `IngredientDatabase.aliases_updated_at` for added / re-pointed /
+    removed aliases. Not `updated_at`: that one also fingerprints the
+    nutrition engine snapshot (services/nutrition_engine.py), and a
+    confirmed match must not reload the whole CIQUAL matrix. The
+    ingredient validators take the later of the two.
+
+Bulk `query(...).delete()` bypasses the hook — those call sites use
+`touch_recipes` / `touch_ingredient_db` explicitly.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import Session
+
+from backend.db.models import IngredientAlias, IngredientDatabase, Ingredient, Instruction, Recipe
+
+
+def touch_recipes(db: Session, recipe_ids: Iterable[UUID]) -> None:
+    ids = {i for i in recipe_ids if i is not None}
+    if ids:
+        db.execute(
+            update(Recipe)
+            .where(Recipe.recipe_id.in_(ids))
+            .values(updated_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+
+
+def touch_ingredient_db(db: Session, ingredient_db_ids: Iterable[UUID]) -> None:
+    ids = {i for i in ingredient_db_ids if i is not None}
+    if ids:
+        db.execute(
+            update(IngredientDatabase)
+            .where(IngredientDatabase.id.in_(ids))
+            # Explicit updated_at: keeps its onupdate from firing.
+            .values(
+                aliases_updated_at=datetime.now(timezone.utc),
+                updated_at=IngredientDatabase.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+
+def _parents(session: Session, obj, fk: str, rel: str, pk: str) -> set:
+    if obj in session.dirty and not session.is_modified(obj):
+        return set()
+    parent = getattr(obj, rel)
+    ids = {getattr(obj, fk) or (getattr(parent, pk) if parent is not None else None)}
+    # Moved to another parent: the old one changed too.
+    ids.update(inspect(obj).attrs[fk].history.deleted or ())
+    return ids
+
+
+@event.listens_for(Session, "before_flush")
+def _touch_on_flush(session: Session, _flush_context, _instances) -> None:
+    recipe_ids: set = set()
+    db_ids: set = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, (Ingredient, Instruction)):
+            recipe_ids |= _parents(session, obj, "recipe_id", "recipe", "recipe_id")
+        elif isinstance(obj, IngredientAlias):
+            db_ids |= _parents(session, obj, "ingredient_db_id", "ingredient_db", "id")
+    touch_recipes(session, recipe_ids)
+    touch_ingredient_db(session, db_ids)
@@ -0,0 +1,63 @@
+"""
+Weekly nutrition: per-day totals and the untracked list.
+
+`week_nutrition` is what the dashboard and the chat tool serve. It sums the
+pre-aggregated `daily_nutrition` rows (services/daily_nutrition.py) and
+lists the untracked lines recorded on the slots' recipe rollups, so every
+reader goes through the same maintained aggregates.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from sqlalchemy.orm import Session
+
+from backend.db.models import MealPlanSlot, Recipe
+from backend.services.daily_nutrition import get_days
+from backend.services.recipe_nutrition import get_rollups
+
+
+@dataclass
+class WeekNutrition:
+    """`days[d][key]` is the total of `key` over day d's slots (keys nobody
+    reported are absent); `untracked` carries slot_date, recipe_name,
+    ingredient_name and reason."""
+    days: dict[date, dict[str, float]] = field(default_factory=dict)
+    untracked: list[dict] = field(default_factory=list)
+
+    @property
+    def week(self) -> dict[str, float]:
+        out: dict[str, float] = defaultdict(float)
+        for totals in self.days.values():
+            for key, v in totals.items():
+                out[key] += v
+        return dict(out)
+
+
+def week_nutrition(db: Session, monday: date) -> WeekNutrition:
+    """The week from the rollups. Read-only: days or rollups never built
+    are computed for this call and not stored."""
+    sunday = monday + timedelta(days=6)
+    rows = get_days(db, monday, sunday, persist=False)
+    out = WeekNutrition(days={d: dict(r.totals) for d, r in rows.items() if r.totals})
+
+    slots = (
+        db.query(MealPlanSlot.slot_date, MealPlanSlot.recipe_id, Recipe.name)
+        .join(Recipe, Recipe.recipe_id == MealPlanSlot.recipe_id)
+        .filter(MealPlanSlot.slot_date >= monday, MealPlanSlot.slot_date <= sunday)
+        .order_by(MealPlanSlot.slot_date, MealPlanSlot.position)
+        .all()
+    )
+    rollups = get_rollups(db, {s.recipe_id for s in slots}, persist=False)
+    for d, recipe_id, recipe_name in slots:
+        rollup = rollups.get(recipe_id)
+        for u in (rollup.untracked if rollup is not None else ()):
+            out.untracked.append({
+                "slot_date": d,
+                "recipe_name": recipe_name,
+                "ingredient_name": u["ingredient_name"],
+                "reason": u["reason"],
+            })
+    return out
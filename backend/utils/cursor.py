@@ -0,0 +1,80 @@
+"""
+Opaque keyset-pagination cursors.
+
+A cursor is the last row's sort key, JSON-dumped and base64url-encoded.
+The next page is `WHERE (sort key) < / > (cursor)` in index order, so
+page 50 costs what page 1 does, where `OFFSET` scans and discards every
+row before it:
+
+    after = decode(cursor, (flag, timestamp, uuid)) if cursor else None
+    rows = ...  # WHERE (is_favorite, created_at, recipe_id) < after, LIMIT limit + 1
+    page, cursor = next_cursor(rows, limit, lambda r: [r.is_favorite, r.created_at, r.recipe_id])
+
+Clients must treat the string as opaque; a malformed one is a 400.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Callable, Optional, Sequence
+from uuid import UUID
+
+import orjson
+from fastapi import HTTPException
+
+
+def encode(values: list) -> str:
+    """Sort-key values (UUIDs / datetimes allowed) → opaque cursor."""
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode().rstrip("=")
+
+
+# Slot parsers for `decode`: each checks the JSON type it was encoded as
+# (a forged cursor must not coerce into a different position) and raises
+# ValueError otherwise.
+
+def flag(v) -> bool:
+    if not isinstance(v, bool):
+        raise ValueError(v)
+    return v
+
+
+def number(v) -> float:
+    if isinstance(v, bool) or not isinstance(v, (int, float)):
+        raise ValueError(v)
+    return float(v)
+
+
+def text(v) -> str:
+    if not isinstance(v, str):
+        raise ValueError(v)
+    return v
+
+
+def timestamp(v) -> datetime:
+    return datetime.fromisoformat(text(v))
+
+
+def uuid(v) -> UUID:
+    return UUID(text(v))
+
+
+def decode(cursor: str, parsers: Sequence[Callable]) -> list:
+    """Cursor → its sort-key values, each run through the matching parser
+    above (JSON gives UUIDs and datetimes back as strings)."""
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError(cursor)
+        return [parse(v) for parse, v in zip(parsers, values)]
+    except (binascii.Error, AttributeError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def next_cursor(rows: list, limit: int, key) -> tuple[list, Optional[str]]:
+    """Split a `limit + 1` fetch into the page and the cursor for the next
+    one (None on the last page)."""
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode(key(page[-1]))
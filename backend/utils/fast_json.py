@@ -0,0 +1,34 @@
+"""
+orjson-backed responses for the bulk endpoints.
+
+The default path for a `response_model` endpoint validates the returned
+ORM graph into Pydantic models (`from_attributes`, per nested object)
+before dumping it. For `GET /api/recipes` — up to 100 recipes with their
+ingredients and instructions — that validation dominates the request. The
+bulk handlers instead select plain column rows, assemble dicts in the
+response's shape and hand them to `json_response`, which dumps them with
+orjson (UUIDs and datetimes natively, same ISO format as Pydantic).
+
+The `response_model` stays on the route for the OpenAPI schema;
+`tests/test_fast_json.py` checks the two paths produce the same JSON.
+`scripts/bench_serialization.py` compares them.
+"""
+from __future__ import annotations
+
+import orjson
+from fastapi import Response
+
+
+def dumps(obj) -> bytes:
+    return orjson.dumps(obj)
+
+
+def json_response(content, response: Response | None = None, status_code: int = 200) -> Response:
+    """`content` (a dict/list, or bytes already dumped) as a JSON Response,
+    carrying over headers set on the handler's injected `response` (ETag,
+    Last-Modified…) — FastAPI only merges those into responses it builds."""
+    headers = None
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    body = content if isinstance(content, bytes) else dumps(content)
+    return Response(body, status_code=status_code, headers=headers, media_type="application/json")
@@ -0,0 +1,33 @@
+"""
+Lazy access to the Gemini SDK.
+
+`google.genai` is the heaviest import in the backend (~0.4s, most of it
+`google.genai.types`), and every cold start of the single Vercel function
+would pay for it even when serving `/api/shopping-list`. So nothing imports
+it at module level: call sites go through `client()` / `types()`, which
+import on first use (later calls hit `sys.modules`).
+
+`tests/test_import_time.py` fails if `import backend.main` pulls it in again.
+"""
+from __future__ import annotations
+
+import os
+
+from fastapi import HTTPException
+
+
+def client():
+    """`genai.Client` for GEMINI_API_KEY; 500 if the key isn't set."""
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise HTTPException(status_code=500, detail="GEMINI_API_KEY is not set")
+    from google import genai
+
+    return genai.Client(api_key=api_key)
+
+
+def types():
+    """The `google.genai.types` module."""
+    from google.genai import types as genai_types
+
+    return genai_types
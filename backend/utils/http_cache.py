@@ -0,0 +1,79 @@
+"""
+Conditional GET: ETag / Last-Modified validators and 304 responses.
+
+Handlers compute a cheap validator first — usually one `count(*),
+max(updated_at)` query over what the response would contain (see
+`services/touch.py` for how `updated_at` covers child rows) — and only
+load + serialize the full payload when the client's copy is stale:
+
+    tag = etag("recipe", recipe_id, latest)
+    if (hit := not_modified(request, response, tag, latest)) is not None:
+        return hit
+
+Collections (lists, the week, the shopping list) pass the ETag alone: a
+delete shrinks the set without moving its max(updated_at), so a
+Last-Modified date would answer `If-Modified-Since` with a stale 304. The
+count in their ETag catches it.
+
+Static payloads (reference data) use a content hash instead.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+# Bump when a response shape changes, so clients holding the old shape
+# miss instead of revalidating it.
+ETAG_VERSION = 1
+
+
+def etag(*parts) -> str:
+    """Strong ETag over `parts` (anything JSON-serializable via str())."""
+    raw = json.dumps([ETAG_VERSION, *parts], default=str, sort_keys=True)
+    return '"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+
+
+def http_date(dt: datetime) -> str:
+    if dt.tzinfo is None:  # our DateTime columns hold naive UTC
+        dt = dt.replace(tzinfo=timezone.utc)
+    return format_datetime(dt.astimezone(timezone.utc), usegmt=True)
+
+
+def not_modified(
+    request: Request,
+    response: Response,
+    tag: str,
+    last_modified: Optional[datetime] = None,
+) -> Optional[Response]:
+    """Put the validators on `response` and return a bare 304 when the
+    request's `If-None-Match` (or, without it, `If-Modified-Since`) says the
+    client's copy is current; None means: build the full response. Pass
+    `last_modified` for single rows only; without it `If-Modified-Since` is
+    ignored."""
+    headers = {"ETag": tag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return Response(status_code=304, headers=headers) if tag in tags or "*" in tags else None
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return None
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        lm = last_modified if last_modified.tzinfo else last_modified.replace(tzinfo=timezone.utc)
+        if lm.replace(microsecond=0) <= since:  # HTTP dates have 1s resolution
+            return Response(status_code=304, headers=headers)
+    return None
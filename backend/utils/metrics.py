@@ -0,0 +1,256 @@
+"""
+In-process metrics in the Prometheus text format, served at `/metrics`.
+
+Hand-rolled rather than pulling in prometheus_client: we need a couple of
+histograms and counters, and the exposition format is a few lines of text.
+Everything here is per process — on Vercel each function instance reports
+its own numbers, the scraper sums them.
+
+  - http_request_duration_seconds{method,route}  histogram; `route` is the
+    route template ("/api/recipes/{recipe_id}"), never the raw path, so
+    the label set stays bounded. Fed by `PerfMiddleware`.
+  - gemini_request_duration_seconds{site}        histogram per call site
+    (chat, categorize, match, llm-fill, llm-density), plus
+    gemini_requests_total{site,outcome}          outcome = ok | error | rate_limited.
+    Fed by `perf.llm_timer` / `perf.timed_stream`.
+  - db_pool_*                                    from `session.pool_status()`.
+  - cache_hits_total / cache_misses_total / cache_hit_ratio{cache}
+    for the functools caches listed in `CACHES` and the fingerprinted
+    snapshots (NutritionEngine, pantry index), which also report
+    cache_reloads_total{cache}: loads caused by a changed fingerprint.
+    Fed by `count_snapshot`.
+"""
+from __future__ import annotations
+
+import importlib
+import threading
+from typing import Iterable, Optional
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LLM_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+
+# In-process caches exposed as hit/miss counters: name → "module:function"
+# of an `lru_cache`-wrapped function. Resolved lazily at scrape time.
+CACHES: dict[str, str] = {
+    "parse_unit": "backend.utils.units:parse_unit",
+    "rdi_payload": "backend.services.reference:_rdi_payload",
+    "seasonality_payload": "backend.services.reference:_seasonality_payload",
+}
+
+
+# Fingerprinted snapshot caches: name → [hits, misses, reloads]. A miss is
+# any load, a reload a miss that replaced an older snapshot.
+_snapshot_lock = threading.Lock()
+_snapshots: dict[str, list[int]] = {}
+
+
+def count_snapshot(cache: str, outcome: str) -> None:
+    """outcome: 'hit' (fingerprint unchanged), 'miss' (first load) or
+    'reload' (fingerprint changed)."""
+    with _snapshot_lock:
+        s = _snapshots.setdefault(cache, [0, 0, 0])
+        if outcome == "hit":
+            s[0] += 1
+        else:
+            s[1] += 1
+            s[2] += outcome == "reload"
+
+
+def snapshot_stats(cache: str) -> tuple[int, int, int]:
+    """(hits, misses, reloads) of a snapshot cache."""
+    with _snapshot_lock:
+        return tuple(_snapshots.get(cache, (0, 0, 0)))
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values."""
+
+    def __init__(self, name: str, help_: str, labels: tuple[str, ...], buckets: Iterable[float]):
+        self.name = name
+        self.help = help_
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series: dict[tuple, list] = {}  # labels → [bucket counts..., sum, count]
+
+    def observe(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            s = self._series.setdefault(label_values, [0] * len(self.buckets) + [0.0, 0])
+            for i, le in enumerate(self.buckets):
+                if value <= le:
+                    s[i] += 1
+            s[-2] += value
+            s[-1] += 1
+
+    def render(self) -> list[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {k: list(v) for k, v in self._series.items()}
+        for label_values, s in sorted(series.items()):
+            base = _labels(self.labels, label_values)
+            for le, n in zip(self.buckets, s):  # s holds cumulative counts
+                out.append(f"{self.name}_bucket{_labels(self.labels, label_values, le=_num(le))} {n}")
+            out.append(f'{self.name}_bucket{_labels(self.labels, label_values, le="+Inf")} {s[-1]}')
+            out.append(f"{self.name}_sum{base} {_num(s[-2])}")
+            out.append(f"{self.name}_count{base} {s[-1]}")
+        return out
+
+
+class Counter:
+    def __init__(self, name: str, help_: str, labels: tuple[str, ...]):
+        self.name = name
+        self.help = help_
+        self.labels = labels
+        self._lock = threading.Lock()
+        self._series: dict[tuple, float] = {}
+
+    def inc(self, *label_values: str, by: float = 1) -> None:
+        with self._lock:
+            self._series[label_values] = self._series.get(label_values, 0) + by
+
+    def value(self, *label_values: str) -> float:
+        with self._lock:
+            return self._series.get(label_values, 0)
+
+    def render(self) -> list[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            series = dict(self._series)
+        for label_values, v in sorted(series.items()):
+            out.append(f"{self.name}{_labels(self.labels, label_values)} {_num(v)}")
+        return out
+
+
+http_latency = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template.",
+    ("method", "route"),
+    HTTP_BUCKETS,
+)
+gemini_latency = Histogram(
+    "gemini_request_duration_seconds",
+    "Gemini call latency by call site (streams: time waiting on chunks).",
+    ("site",),
+    LLM_BUCKETS,
+)
+gemini_requests = Counter(
+    "gemini_requests_total",
+    "Gemini calls by call site and outcome (ok, error, rate_limited).",
+    ("site", "outcome"),
+)
+
+
+def observe_request(method: str, route: str, seconds: float) -> None:
+    http_latency.observe(seconds, method, route)
+
+
+def observe_llm(site: str, seconds: float, error: Optional[BaseException] = None) -> None:
+    gemini_latency.observe(seconds, site)
+    gemini_requests.inc(site, llm_outcome(error))
+
+
+def llm_outcome(error: Optional[BaseException]) -> str:
+    if error is None:
+        return "ok"
+    # google.genai.errors.APIError carries the HTTP status as `.code`.
+    if getattr(error, "code", None) == 429 or "RESOURCE_EXHAUSTED" in str(error):
+        return "rate_limited"
+    return "error"
+
+
+def route_label(scope) -> str:
+    """Route template of a matched request; unmatched paths share one label."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+# ---- Exposition ----
+
+def render() -> str:
+    lines: list[str] = []
+    lines += http_latency.render()
+    lines += gemini_latency.render()
+    lines += gemini_requests.render()
+    lines += _pool_lines()
+    lines += _cache_lines()
+    return "\n".join(lines) + "\n"
+
+
+def _pool_lines() -> list[str]:
+    from backend.db.session import pool_status
+
+    status = pool_status()
+    gauges = {
+        "db_pool_size": "Configured pool size.",
+        "db_pool_checked_in": "Idle connections in the pool.",
+        "db_pool_in_use": "Connections currently checked out.",
+        "db_pool_overflow": "Connections open beyond pool_size.",
+    }
+    out: list[str] = []
+    engines = [("sync", status)] + ([("async", status["async"])] if "async" in status else [])
+    for name, help_ in gauges.items():
+        key = name.removeprefix("db_pool_")
+        rows = [(engine, st[key]) for engine, st in engines if key in st]
+        if not rows:
+            continue  # NullPool: nothing pooled to report
+        out += [f"# HELP {name} {help_}", f"# TYPE {name} gauge"]
+        out += [f'{name}{{engine="{engine}"}} {v}' for engine, v in rows]
+    counters = {
+        "db_pool_checkouts_total": ("checkouts", "Connection checkouts."),
+        "db_pool_overflow_checkouts_total": ("overflow_checkouts", "Checkouts served beyond pool_size."),
+        "db_pool_timeouts_total": ("timeouts", "Checkouts that timed out waiting for a connection."),
+    }
+    for name, (key, help_) in counters.items():
+        out += [f"# HELP {name} {help_}", f"# TYPE {name} counter", f"{name} {status[key]}"]
+    out += [
+        "# HELP db_pool_wait_seconds_total Time spent waiting for connections.",
+        "# TYPE db_pool_wait_seconds_total counter",
+        f"db_pool_wait_seconds_total {_num(status['wait_ms_total'] / 1000)}",
+        "# HELP db_pool_wait_seconds Checkout wait over the recent window.",
+        "# TYPE db_pool_wait_seconds gauge",
+        f'db_pool_wait_seconds{{quantile="0.5"}} {_num(status["wait_ms_p50"] / 1000)}',
+        f'db_pool_wait_seconds{{quantile="0.95"}} {_num(status["wait_ms_p95"] / 1000)}',
+    ]
+    return out
+
+
+def _cache_lines() -> list[str]:
+    infos: dict[str, tuple[int, int]] = {}
+    for name, target in CACHES.items():
+        module, _, attr = target.partition(":")
+        info = getattr(importlib.import_module(module), attr).cache_info()
+        infos[name] = (info.hits, info.misses)
+    with _snapshot_lock:
+        snapshots = {n: tuple(s) for n, s in _snapshots.items()}
+    infos.update({n: (s[0], s[1]) for n, s in snapshots.items()})
+    out = [
+        "# HELP cache_hits_total In-process cache hits.",
+        "# TYPE cache_hits_total counter",
+    ]
+    out += [f'cache_hits_total{{cache="{n}"}} {h}' for n, (h, _) in infos.items()]
+    out += ["# HELP cache_misses_total In-process cache misses.", "# TYPE cache_misses_total counter"]
+    out += [f'cache_misses_total{{cache="{n}"}} {m}' for n, (_, m) in infos.items()]
+    out += ["# HELP cache_hit_ratio Hits / lookups since start.", "# TYPE cache_hit_ratio gauge"]
+    for n, (h, m) in infos.items():
+        out.append(f'cache_hit_ratio{{cache="{n}"}} {_num(h / (h + m) if h + m else 0.0)}')
+    out += [
+        "# HELP cache_reloads_total Snapshot reloads after a fingerprint change.",
+        "# TYPE cache_reloads_total counter",
+    ]
+    out += [f'cache_reloads_total{{cache="{n}"}} {s[2]}' for n, s in snapshots.items()]
+    return out
+
+
+def _labels(names: tuple[str, ...], values: tuple, **extra: str) -> str:
+    pairs = list(zip(names, values)) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs) + "}"
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _num(v: float) -> str:
+    return repr(float(v))
@@ -5,20 +5,17 @@ Resolution path: each `Ingredient` carries an `ingredient_db_id` FK set by
 the match flow. NULL FK → silently untracked.
 
 Quantity → grams in two layers:
-  1. Spoon/cup table: cuillère à soupe / cuillère à café / verre / tasse / pincée.
-     These are conventional volumes (or, for pincée, mass).
-  2. Per-ingredient density (g/ml) for any ml/cl/l, after spoon conversion.
+  1. Unit grammar (`backend/utils/units.py`): any spelling of a mass, volume
+     or pack unit → canonical unit with its conventional factor (spoons,
+     verre, tasse are volumes; pincée is a mass).
+  2. Per-ingredient density (g/ml) for any volume.
 """
 from __future__ import annotations
 
 import math
-import re
-import unicodedata
-from typing import Dict, List, Optional
+from typing import Optional
 
-from sqlalchemy.orm import Session
-
-from backend.db.models import Ingredient, IngredientDatabase
+from backend.utils.units import unit_def
 
 # CIQUAL column names AFTER load-time normalization (newlines → spaces).
 NUTRITION_KEYS = {
@@ -67,102 +64,37 @@ def safe_float(value) -> Optional[float]:
         return None
 
 
-def _strip_accents(s: str) -> str:
-    return "".join(
-        c for c in unicodedata.normalize("NFKD", s) if not unicodedata.combining(c)
-    )
-
-
-def _normalize_unit(unit: str) -> str:
-    """Lowercase + strip accents + collapse whitespace + strip dots."""
-    if not unit:
-        return ""
-    n = _strip_accents(unit).lower()
-    n = re.sub(r"[.\s]+", " ", n).strip()
-    return n
-
-
-# Conventional cooking volumes / masses, keyed by normalized unit.
-# Values: ("ml", float)  → ml; ("g", float) → grams (skips density step).
-_SPOON_TABLE: dict[str, tuple[str, float]] = {
-    "cuillere a soupe": ("ml", 15.0),
-    "cuilleres a soupe": ("ml", 15.0),
-    "cas": ("ml", 15.0),
-    "c a s": ("ml", 15.0),
-    "c s": ("ml", 15.0),
-    "cuillere a cafe": ("ml", 5.0),
-    "cuilleres a cafe": ("ml", 5.0),
-    "cac": ("ml", 5.0),
-    "c a c": ("ml", 5.0),
-    "c c": ("ml", 5.0),
-    "verre": ("ml", 200.0),
-    "verres": ("ml", 200.0),
-    "tasse": ("ml", 240.0),
-    "tasses": ("ml", 240.0),
-    "pincee": ("g", 0.5),
-    "pincees": ("g", 0.5),
-}
-
-
 def convert_to_grams(
     quantity: float, unit: str, density_g_per_ml: Optional[float] = None
 ) -> Optional[float]:
     """quantity × unit → grams. Returns None when conversion is impossible."""
     if quantity is None:
         return None
-    n = _normalize_unit(unit)
-
-    # Direct mass.
-    if n in ("g", ""):
-        return float(quantity) if n == "g" else None
-    if n == "kg":
-        return float(quantity) * 1000
-    if n == "mg":
-        return float(quantity) / 1000
-
-    # Direct volume.
-    ml: Optional[float] = None
-    if n == "ml":
-        ml = float(quantity)
-    elif n == "cl":
-        ml = float(quantity) * 10
-    elif n == "l":
-        ml = float(quantity) * 1000
-    elif n in _SPOON_TABLE:
-        kind, factor = _SPOON_TABLE[n]
-        if kind == "g":
-            return float(quantity) * factor
-        ml = float(quantity) * factor
-
-    if ml is None:
+    d = unit_def(unit)
+    if d is None or d.kind == "count":
         return None
+    if d.kind == "mass":
+        return float(quantity) * d.factor
     if density_g_per_ml is None:
         return None
-    return ml * float(density_g_per_ml)
+    return float(quantity) * d.factor * float(density_g_per_ml)
 
 
-def _per_100g(row: IngredientDatabase, key: str) -> Optional[float]:
-    if not row.nutrition_data:
-        return None
-    return safe_float(row.nutrition_data.get(key))
+def untracked_reason(unit: str) -> str:
+    """Why `convert_to_grams` gave up: a known volume lacks a density,
+    anything else is a unit we can't weigh."""
+    d = unit_def(unit)
+    return "missing_density" if d is not None and d.kind == "volume" else "unknown_unit"
 
 
-def compute_recipe_nutrition(
-    ingredients: List[Ingredient], db: Session
-) -> Dict[str, float]:
-    totals = {k: 0.0 for k in NUTRITION_KEYS}
-    for ing in ingredients:
-        if ing.ingredient_db_id is None:
-            continue
-        row = db.get(IngredientDatabase, ing.ingredient_db_id)
-        if row is None:
-            continue
-        grams = convert_to_grams(ing.quantity, ing.unit, row.density_g_per_ml)
-        if grams is None:
-            continue
-        for nutrient, key in NUTRITION_KEYS.items():
-            per100 = _per_100g(row, key)
-            if per100 is not None:
-                totals[nutrient] += per100 * grams / 100
+def resolve_grams(
+    quantity: Optional[float], unit: str, density_g_per_ml: Optional[float] = None
+) -> tuple[Optional[float], str]:
+    """(grams, status) persisted on `Ingredient.quantity_g` / `gram_status`.
 
-    return {k: round(v, 1) for k, v in totals.items()}
+    status is 'ok', 'missing_density' or 'unknown_unit'; grams is None
+    unless status is 'ok'. A missing quantity counts as 0."""
+    grams = convert_to_grams(quantity or 0, unit or "", density_g_per_ml)
+    if grams is None:
+        return None, untracked_reason(unit)
+    return grams, "ok"
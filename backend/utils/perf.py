@@ -0,0 +1,279 @@
+"""
+Per-request performance instrumentation.
+
+For every HTTP request `PerfMiddleware` opens a `RequestStats` (held in a
+contextvar, so sync handlers in the threadpool, streamed bodies and async
+DB calls all add to the same one) and fills it from:
+
+  - SQL: `before/after_cursor_execute` on every Engine (sync and async)
+    → statement count, DB time and the statements themselves.
+  - Gemini: call sites wrap the client call in `llm_timer()` (or the
+    streamed chunks in `timed_stream()`).
+  - Serialization: `TimedRoute` marks when the endpoint returned; the gap
+    until the route produced its Response is response-model validation +
+    JSON encoding.
+
+The totals go out as a `Server-Timing` header and one structured log line
+(logger "backend.perf"); latencies also feed `backend.utils.metrics`. Requests slower than SLOW_REQUEST_MS (default 500)
+also log their SQL, grouped by statement with repeat counts — an N+1 shows
+up as one statement repeated N times.
+
+Streamed responses (chat) send their headers before the body runs, so their
+header only covers what happened up to the first byte; the log line covers
+the whole stream.
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from backend.utils import metrics
+
+logger = logging.getLogger("backend.perf")
+
+MAX_STATEMENTS = 500  # per request, for the slow-request log
+
+
+def slow_request_ms() -> float:
+    return float(os.getenv("SLOW_REQUEST_MS", "500"))
+
+
+@dataclass
+class RequestStats:
+    started: float = field(default_factory=time.perf_counter)
+    sql_count: int = 0
+    sql_s: float = 0.0
+    llm_calls: int = 0
+    llm_s: float = 0.0
+    serialize_s: float = 0.0
+    endpoint_done: Optional[float] = None
+    statements: list[tuple[str, float]] = field(default_factory=list)
+
+    def elapsed_s(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        ms = lambda s: f"{s * 1000:.1f}"  # noqa: E731
+        return ", ".join([
+            f'db;dur={ms(self.sql_s)};desc="{self.sql_count} queries"',
+            f'llm;dur={ms(self.llm_s)};desc="{self.llm_calls} calls"',
+            f"ser;dur={ms(self.serialize_s)}",
+            f"total;dur={ms(self.elapsed_s())}",
+        ])
+
+    def summary(self) -> dict:
+        return {
+            "total_ms": round(self.elapsed_s() * 1000, 1),
+            "db_ms": round(self.sql_s * 1000, 1),
+            "db_count": self.sql_count,
+            "llm_ms": round(self.llm_s * 1000, 1),
+            "llm_calls": self.llm_calls,
+            "serialize_ms": round(self.serialize_s * 1000, 1),
+        }
+
+    def top_statements(self, n: int = 10) -> list[dict]:
+        grouped: dict[str, list[float]] = {}
+        for sql, s in self.statements:
+            grouped.setdefault(sql, []).append(s)
+        ranked = sorted(grouped.items(), key=lambda kv: sum(kv[1]), reverse=True)
+        return [
+            {"sql": sql, "count": len(ts), "total_ms": round(sum(ts) * 1000, 1)}
+            for sql, ts in ranked[:n]
+        ]
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+# ---- SQL ----
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_execute(conn, _cursor, _statement, _parameters, _context, _executemany):
+    conn.info.setdefault("perf_t0", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_execute(conn, _cursor, statement, _parameters, _context, _executemany):
+    t0 = conn.info["perf_t0"].pop()
+    stats = _current.get()
+    if stats is None:
+        return
+    dt = time.perf_counter() - t0
+    stats.sql_count += 1
+    stats.sql_s += dt
+    if len(stats.statements) < MAX_STATEMENTS:
+        stats.statements.append((" ".join(statement.split())[:500], dt))
+
+
+# ---- Gemini ----
+
+@contextmanager
+def llm_timer(site: str) -> Iterator[None]:
+    """Time one Gemini call into the current request's stats and the
+    per-site metrics (`site`: chat, categorize, match, llm-fill, …)."""
+    t0 = time.perf_counter()
+    error: Optional[BaseException] = None
+    try:
+        yield
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        dt = time.perf_counter() - t0
+        metrics.observe_llm(site, dt, error)
+        stats = _current.get()
+        if stats is not None:
+            stats.llm_calls += 1
+            stats.llm_s += dt
+
+
+def timed_stream(chunks: Iterable, site: str) -> Iterator:
+    """Yield from a streamed Gemini response, timing the waits for each chunk
+    (time spent by our own code between chunks — tool calls — is not LLM)."""
+    stats = _current.get()
+    it = iter(chunks)
+    if stats is not None:
+        stats.llm_calls += 1
+    waited = 0.0
+    error: Optional[BaseException] = None
+    try:
+        while True:
+            t0 = time.perf_counter()
+            try:
+                chunk = next(it)
+            except StopIteration:
+                return
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                dt = time.perf_counter() - t0
+                waited += dt
+                if stats is not None:
+                    stats.llm_s += dt
+            yield chunk
+    finally:
+        metrics.observe_llm(site, waited, error)
+
+
+# ---- Serialization ----
+
+class TimedRoute(APIRoute):
+    """APIRoute marking when the endpoint returned, so the time until the
+    Response exists (validation + encoding) counts as serialization."""
+
+    def get_route_handler(self):
+        call = self.dependant.call
+        if call is not None and not getattr(call, "_perf_wrapped", False):
+            self.dependant.call = _mark_endpoint_done(call)
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            response = await handler(request)
+            stats = _current.get()
+            if stats is not None and stats.endpoint_done is not None:
+                stats.serialize_s += time.perf_counter() - stats.endpoint_done
+                stats.endpoint_done = None
+            return response
+
+        return timed_handler
+
+
+def _mark_endpoint_done(call):
+    # Swapped in after the dependant was analyzed: FastAPI already read the
+    # original's signature, this only runs it.
+    if _is_async(call):
+        @functools.wraps(call)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                _endpoint_done()
+    else:
+        @functools.wraps(call)
+        def wrapper(*args, **kwargs):
+            try:
+                return call(*args, **kwargs)
+            finally:
+                _endpoint_done()
+    wrapper._perf_wrapped = True
+    return wrapper
+
+
+def _is_async(call) -> bool:
+    return inspect.iscoroutinefunction(call) or inspect.iscoroutinefunction(
+        getattr(call, "__call__", None)
+    )
+
+
+def _endpoint_done() -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.endpoint_done = time.perf_counter()
+
+
+# ---- Middleware ----
+
+class PerfMiddleware:
+    """Pure ASGI middleware: adds `Server-Timing` to every HTTP response and
+    logs one line per request (plus its SQL when slow)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status = 500
+
+        async def send_timed(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            _current.reset(token)
+            metrics.observe_request(scope["method"], metrics.route_label(scope), stats.elapsed_s())
+            _log(scope, status, stats)
+
+
+def _log(scope, status: int, stats: RequestStats) -> None:
+    line = {
+        "event": "request",
+        "method": scope.get("method"),
+        "path": scope.get("path"),
+        "status": status,
+        **stats.summary(),
+    }
+    slow = line["total_ms"] >= slow_request_ms()
+    if slow:
+        line["slow"] = True
+        line["sql"] = stats.top_statements()
+        logger.warning(json.dumps(line, ensure_ascii=False))
+    else:
+        logger.info(json.dumps(line, ensure_ascii=False))
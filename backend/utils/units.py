@@ -0,0 +1,136 @@
+"""
+French cooking-unit grammar.
+
+`parse_unit` turns any raw unit spelling found in recipes ("Cuillères à
+soupe", "c. à s.", "cs", "cl.", "kg.", "sachets", …) into one canonical
+token from `UNITS`, or None when the string is not a unit we know.
+
+The raw string is normalized (accents stripped, lowercased, dots and
+apostrophes dropped, whitespace collapsed) and matched against a single
+compiled alternation of per-unit patterns. Results are memoized per raw
+string: recipe units repeat heavily, so after warm-up every lookup is a dict
+hit. Nutrition (`convert_to_grams`) and the shopping list share this parser.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class UnitDef:
+    kind: str  # 'mass' | 'volume' | 'count'
+    factor: float  # grams per unit (mass), ml per unit (volume), 1 for count
+    label: str  # display form, singular
+    plural: str  # display form when quantity > 1
+
+
+def _u(kind: str, factor: float, label: str, plural: Optional[str] = None) -> UnitDef:
+    return UnitDef(kind, factor, label, plural or label)
+
+
+# Canonical token → definition. Spoon / glass / cup volumes and the pinch
+# mass are the usual French kitchen conventions.
+UNITS: dict[str, UnitDef] = {
+    "g": _u("mass", 1.0, "g"),
+    "kg": _u("mass", 1000.0, "kg"),
+    "mg": _u("mass", 0.001, "mg"),
+    "pincee": _u("mass", 0.5, "pincée", "pincées"),
+    "ml": _u("volume", 1.0, "ml"),
+    "cl": _u("volume", 10.0, "cl"),
+    "dl": _u("volume", 100.0, "dl"),
+    "l": _u("volume", 1000.0, "L"),
+    "cas": _u("volume", 15.0, "c. à s."),
+    "cad": _u("volume", 10.0, "c. à d."),
+    "cac": _u("volume", 5.0, "c. à c."),
+    "verre": _u("volume", 200.0, "verre", "verres"),
+    "tasse": _u("volume", 240.0, "tasse", "tasses"),
+    "piece": _u("count", 1.0, "pièce", "pièces"),
+    "sachet": _u("count", 1.0, "sachet", "sachets"),
+    "paquet": _u("count", 1.0, "paquet", "paquets"),
+    "boite": _u("count", 1.0, "boîte", "boîtes"),
+    "pot": _u("count", 1.0, "pot", "pots"),
+    "bouteille": _u("count", 1.0, "bouteille", "bouteilles"),
+    "brique": _u("count", 1.0, "brique", "briques"),
+    "barquette": _u("count", 1.0, "barquette", "barquettes"),
+    "botte": _u("count", 1.0, "botte", "bottes"),
+    "tranche": _u("count", 1.0, "tranche", "tranches"),
+    "gousse": _u("count", 1.0, "gousse", "gousses"),
+    "feuille": _u("count", 1.0, "feuille", "feuilles"),
+    "brin": _u("count", 1.0, "brin", "brins"),
+    "poignee": _u("count", 1.0, "poignée", "poignées"),
+}
+
+# "cuillère", "cuillérée", "cuil", "c" — optionally followed by "à"/"de".
+_SPOON = r"c(?:uil(?:l?eree?)?s?)? ?(?:(?:a|de) ?)?"
+
+# Canonical token → pattern over the normalized string (full match).
+_GRAMMAR: dict[str, str] = {
+    "g": r"g|gr|grs|grammes?",
+    "kg": r"kg|kgs|kilos?|kilogrammes?",
+    "mg": r"mg|milligrammes?",
+    "pincee": r"pincees?|pinc",
+    "ml": r"ml|millilitres?",
+    "cl": r"cl|centilitres?",
+    "dl": r"dl|decilitres?",
+    "l": r"l|lt|litres?",
+    "cas": _SPOON + r"s(?:oupe)?s?",
+    "cad": _SPOON + r"d(?:essert)?s?",
+    "cac": _SPOON + r"c(?:afe)?s?",
+    "verre": r"verres?",
+    "tasse": r"tasses?",
+    "piece": r"p|pc|pcs|pces?|pieces?|unites?|u",
+    "sachet": r"sachets?",
+    "paquet": r"paquets?|pqt",
+    "boite": r"boites?|bte|conserves?",
+    "pot": r"pots?",
+    "bouteille": r"bouteilles?|btle",
+    "brique": r"briques?",
+    "barquette": r"barquettes?",
+    "botte": r"bottes?",
+    "tranche": r"tranches?",
+    "gousse": r"gousses?",
+    "feuille": r"feuilles?",
+    "brin": r"brins?",
+    "poignee": r"poignees?",
+}
+
+_PARSER = re.compile("|".join(f"(?P<{tok}>{pat})" for tok, pat in _GRAMMAR.items()))
+
+
+def _strip_accents(s: str) -> str:
+    return "".join(
+        c for c in unicodedata.normalize("NFKD", s) if not unicodedata.combining(c)
+    )
+
+
+def normalize_unit(unit: str) -> str:
+    """Lowercase + strip accents + drop dots/apostrophes + collapse whitespace."""
+    if not unit:
+        return ""
+    n = _strip_accents(unit).lower()
+    return re.sub(r"[.'’\s]+", " ", n).strip()
+
+
+@lru_cache(maxsize=4096)
+def parse_unit(unit: str) -> Optional[str]:
+    """Raw unit string → canonical token in `UNITS`, or None if unknown."""
+    m = _PARSER.fullmatch(normalize_unit(unit or ""))
+    return m.lastgroup if m else None
+
+
+def unit_def(unit: str) -> Optional[UnitDef]:
+    token = parse_unit(unit or "")
+    return UNITS[token] if token else None
+
+
+def unit_label(unit: str, quantity: float = 1.0) -> str:
+    """Display form of a raw unit ("Cuillères à soupe" → "c. à s."); unknown
+    units are returned stripped, as typed."""
+    d = unit_def(unit)
+    if d is None:
+        return (unit or "").strip()
+    return d.plural if quantity > 1 else d.label
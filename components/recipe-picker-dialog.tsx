@@ -10,7 +10,7 @@ import {
 } from "@/components/ui/dialog";
 import { Input } from "@/components/ui/input";
 import * as api from "@/lib/api";
-import type { Recipe } from "@/lib/types";
+import type { RecipeSummary } from "@/lib/types";
 
 export function RecipePickerDialog({
   open,
@@ -20,11 +20,11 @@ export function RecipePickerDialog({
 }: {
   open: boolean;
   onOpenChange: (v: boolean) => void;
-  onPick: (recipe: Recipe) => void;
+  onPick: (recipe: RecipeSummary) => void;
   title?: string;
 }) {
   const [query, setQuery] = useState("");
-  const [results, setResults] = useState<Recipe[]>([]);
+  const [results, setResults] = useState<RecipeSummary[]>([]);
   const [loading, setLoading] = useState(false);
 
   useEffect(() => {
@@ -37,7 +37,7 @@ export function RecipePickerDialog({
     setLoading(true);
     const t = setTimeout(async () => {
       try {
-        const res = await api.listRecipes({ search: query || undefined, limit: 30 });
+        const res = await api.listRecipeSummaries({ search: query || undefined, limit: 30 });
         if (!cancelled) setResults(res.recipes);
       } finally {
         if (!cancelled) setLoading(false);
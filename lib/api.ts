@@ -9,10 +9,14 @@ import type {
   Recipe,
   RecipeCreate,
   RecipeListResponse,
+  RecipeSummaryListResponse,
+  RangeNutrition,
   RecipeNutrition,
   RecipeUpdate,
   ShoppingItem,
   ShoppingListResponse,
+  PantryResponse,
+  TagCount,
   WeeklyNutrition,
 } from "./types";
 
@@ -36,15 +40,20 @@ export interface RecipeFilters {
   cuisine?: string;
   ingredient?: string;
   tag?: string;
+  tags?: string[]; // exact tags, sent as repeated ?tags=
+  tag_mode?: "any" | "all";
   skip?: number;
   limit?: number;
+  cursor?: string;
+  with_total?: boolean;
 }
 
 function qs(params: Record<string, unknown> | object): string {
   const sp = new URLSearchParams();
   for (const [k, v] of Object.entries(params)) {
     if (v === undefined || v === null || v === "") continue;
-    sp.append(k, String(v));
+    if (Array.isArray(v)) v.forEach((x) => sp.append(k, String(x)));
+    else sp.append(k, String(v));
   }
   const s = sp.toString();
   return s ? `?${s}` : "";
@@ -54,6 +63,18 @@ function qs(params: Record<string, unknown> | object): string {
 export const listRecipes = (filters: RecipeFilters = {}) =>
   http<RecipeListResponse>(`/recipes${qs(filters)}`);
 
+export const listRecipeSummaries = (filters: RecipeFilters = {}) =>
+  http<RecipeSummaryListResponse>(`/recipes${qs({ ...filters, fields: "summary" })}`);
+
+export const listRecipeTags = () => http<TagCount[]>(`/recipes/tags`);
+
+export const cookFromPantry = (params: {
+  ingredients?: string[];
+  ingredient_db_ids?: string[];
+  limit?: number;
+  min_coverage?: number;
+}) => http<PantryResponse>(`/recipes/pantry${qs(params)}`);
+
 export const getRecipe = (id: string) => http<Recipe>(`/recipes/${id}`);
 
 export const createRecipe = (data: RecipeCreate) =>
@@ -179,6 +200,8 @@ export interface IngredientFilters {
   source?: "ciqual" | "user" | "llm";
   skip?: number;
   limit?: number;
+  cursor?: string;
+  with_total?: boolean;
 }
 
 export const listIngredients = (filters: IngredientFilters = {}) =>
@@ -233,13 +256,17 @@ export const reorderMeals = (
 export const generateMealPlan = (
   weekStart: string,
   mealsPerDay = 3,
-  overwrite = false
+  overwrite = false,
+  mode: "optimize" | "random" = "optimize",
+  sex: "male" | "female" = "male"
 ) =>
   http<MealPlanWeek>(
     `/meal-plan/generate${qs({
       week_start: weekStart,
       meals_per_day: mealsPerDay,
       overwrite,
+      mode,
+      sex,
     })}`,
     { method: "POST" }
   );
@@ -247,6 +274,9 @@ export const generateMealPlan = (
 export const getWeeklyNutrition = (weekStart: string) =>
   http<WeeklyNutrition>(`/meal-plan/nutrition${qs({ week_start: weekStart })}`);
 
+export const getRangeNutrition = (from: string, to: string, sex: "male" | "female" = "male") =>
+  http<RangeNutrition>(`/meal-plan/nutrition/range${qs({ from, to, sex })}`);
+
 // ---- Reference (ANSES + Interfel) ----
 import type { InSeasonResponse, RdiReference, SeasonalityReference } from "./types";
 
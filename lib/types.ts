@@ -32,9 +32,41 @@ export interface Recipe {
   instructions: Instruction[];
 }
 
+export interface PantryMatch {
+  recipe_id: string;
+  name: string;
+  is_favorite: boolean;
+  coverage: number; // 0..1
+  matched: number;
+  total: number;
+  missing: string[];
+}
+
+export interface PantryResponse {
+  results: PantryMatch[];
+  unresolved: string[]; // entries that matched no ingredient
+}
+
+export interface TagCount {
+  tag: string;
+  count: number;
+}
+
 export interface RecipeListResponse {
   recipes: Recipe[];
-  total: number;
+  total: number | null; // null with with_total=false (default on cursor pages)
+  next_cursor: string | null; // pass back as `cursor`; null on the last page
+}
+
+// `fields=summary` list item: fetch the detail for ingredients / steps.
+export type RecipeSummary = Omit<Recipe, "ingredients" | "instructions"> & {
+  ingredient_count: number;
+};
+
+export interface RecipeSummaryListResponse {
+  recipes: RecipeSummary[];
+  total: number | null;
+  next_cursor: string | null;
 }
 
 export interface RecipeCreate {
@@ -122,7 +154,8 @@ export interface IngredientDetail extends IngredientRow {
 
 export interface IngredientListResponse {
   items: IngredientRow[];
-  total: number;
+  total: number | null; // null with with_total=false (default on cursor pages)
+  next_cursor: string | null; // pass back as `cursor`; null on the last page
 }
 
 export interface MatchCandidate {
@@ -156,6 +189,7 @@ export interface NutritionMacros {
 export interface RecipeNutrition extends NutritionMacros {
   servings: number;
   per_serving: NutritionMacros;
+  untracked_count: number;
 }
 
 export interface ChatMessage {
@@ -203,6 +237,21 @@ export interface WeeklyNutrition {
   untracked: UntrackedItem[];
 }
 
+export interface RangeNutritionDay {
+  date: string;
+  totals: Record<string, number>;
+  untracked_count: number;
+}
+
+export interface RangeNutrition {
+  start: string;
+  end: string;
+  days: RangeNutritionDay[];
+  period: Record<string, number>;
+  rdi: Record<string, number>; // daily targets
+  period_rdi: Record<string, number>; // daily targets × number of days
+}
+
 // ---- Reference (ANSES + Interfel) ----
 
 export type Sex = "male" | "female";
@@ -21,6 +21,7 @@ from sqlalchemy.orm import sessionmaker  # noqa: E402
 from backend.db.models import Ingredient, ShoppingList  # noqa: E402
 from backend.db.session import get_engine  # noqa: E402
 from backend.services import ingredient_match as im  # noqa: E402
+import backend.services.recipe_nutrition  # noqa: E402,F401  (rollup invalidation hook)
 
 SessionLocal = sessionmaker(bind=get_engine(), autocommit=False, autoflush=False)
 
@@ -0,0 +1,372 @@
+"""
+Nutrition benchmark suite on synthetic, production-scale data.
+
+Seeds the database at DATABASE_URL (meant to be a local Postgres) with:
+  - a CIQUAL-shaped `ingredient_database` (3,000 rows × 84 keys; raw cells
+    mix "12,3", "traces", "< 0,5", "-" and NULL like the real table),
+  - thousands of recipes linked to it with mixed units / densities,
+  - a year of `meal_plan_slots` (3 meals a day) in BENCH_YEAR, far enough
+    ahead not to collide with a real plan.
+
+Seeded rows are tagged (names start with "BENCH ") and committed once;
+re-runs reuse them (`--reseed` rebuilds, `--drop` removes them). Each
+measured path then runs inside one outer transaction that is rolled back
+at the end, so cold/warm cache manipulation never persists.
+
+Per path it reports latency percentiles (p50 / p95 / p99 / max), SQL
+statements per call, and allocations per call (tracemalloc peak and net,
+from one extra traced call so tracing does not skew the timings).
+
+Usage:
+  DATABASE_URL=postgresql://localhost/foodbench python scripts/bench_nutrition.py
+  ... [--recipes 3000] [--iterations 30] [--only weekly,range] [--json out.json]
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import random  # noqa: E402
+import statistics  # noqa: E402
+import time  # noqa: E402
+import tracemalloc  # noqa: E402
+from dataclasses import asdict, dataclass  # noqa: E402
+from datetime import date, timedelta  # noqa: E402
+from typing import Callable, Optional  # noqa: E402
+from urllib.parse import urlparse  # noqa: E402
+
+from sqlalchemy import delete, event, func, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from backend.api.meal_plan import get_range_nutrition, get_weekly_nutrition  # noqa: E402
+from backend.api.recipes import get_recipe_nutrition  # noqa: E402
+from backend.db.models import (  # noqa: E402
+    DailyNutrition,
+    Ingredient,
+    IngredientDatabase,
+    MealPlanSlot,
+    Recipe,
+    RecipeNutrition,
+)
+from backend.db.session import get_engine  # noqa: E402
+from backend.services import daily_nutrition, nutrients  # noqa: E402,F401  (flush hooks)
+from backend.services.recipe_nutrition import get_rollups  # noqa: E402
+from backend.services.reference import rdi_for  # noqa: E402
+from backend.utils.nutrition import NUTRITION_KEYS, convert_to_grams, safe_float  # noqa: E402
+
+PREFIX = "BENCH "
+BENCH_YEAR = 2100
+N_KEYS = 84
+
+UNITS = [
+    "g", "g", "g", "kg", "ml", "cl", "L", "c. à s.", "cuillère à café",
+    "pièce", "pièces", "gousses", "pincée", "verre", "sachet", "",
+]
+
+
+# ---- Synthetic data ----
+
+def _ciqual_keys() -> list[str]:
+    """Real CIQUAL column names first (promoted + ANSES targets), padded
+    with synthetic ones to N_KEYS."""
+    keys = list(dict.fromkeys([*NUTRITION_KEYS.values(), *rdi_for("male")]))
+    i = 0
+    while len(keys) < N_KEYS:
+        i += 1
+        keys.append(f"Nutriment synthétique {i:02d} (mg 100 g)")
+    return keys[:N_KEYS]
+
+
+def _ciqual_cell(rng: random.Random):
+    """One raw cell, in the proportions seen in the CIQUAL export."""
+    p = rng.random()
+    if p < 0.60:
+        return f"{rng.uniform(0, 500):.2f}".replace(".", ",")
+    if p < 0.70:
+        return round(rng.uniform(0, 500), 2)
+    if p < 0.78:
+        return "traces"
+    if p < 0.85:
+        return f"< {rng.choice(['0,1', '0,5', '1'])}"
+    if p < 0.92:
+        return "-"
+    return None
+
+
+def seed(
+    db: Session, n_foods: int, n_recipes: int, rng: random.Random, batch: int = 500
+) -> None:
+    keys = _ciqual_keys()
+    food_ids = []
+    for start in range(0, n_foods, batch):
+        rows = [
+            IngredientDatabase(
+                alim_nom_fr=f"{PREFIX}aliment {i:05d}",
+                nutrition_data={k: _ciqual_cell(rng) for k in keys},
+                density_g_per_ml=rng.choice([None, 0.9, 1.0, 1.03, 0.6]),
+                source="ciqual",
+            )
+            for i in range(start, min(start + batch, n_foods))
+        ]
+        db.add_all(rows)
+        db.flush()  # typed ingredient_nutrients copy written by the flush hook
+        food_ids += [r.id for r in rows]
+        db.commit()
+        print(f"  ingredient_database {len(food_ids)}/{n_foods}", end="\r")
+    print()
+
+    recipe_ids = []
+    for start in range(0, n_recipes, batch):
+        recipes = [
+            Recipe(name=f"{PREFIX}recette {i:05d}", servings=rng.randint(1, 6))
+            for i in range(start, min(start + batch, n_recipes))
+        ]
+        db.add_all(recipes)
+        db.flush()
+        for r in recipes:
+            for j in range(rng.randint(4, 14)):
+                db.add(Ingredient(
+                    recipe_id=r.recipe_id,
+                    name=f"ingrédient {j}",
+                    quantity=round(rng.uniform(0.5, 400), 1),
+                    unit=rng.choice(UNITS),
+                    ingredient_db_id=rng.choice(food_ids) if rng.random() < 0.85 else None,
+                ))
+        db.commit()
+        recipe_ids += [r.recipe_id for r in recipes]
+        print(f"  recipes {len(recipe_ids)}/{n_recipes}", end="\r")
+    print()
+
+    day = date(BENCH_YEAR, 1, 1)
+    while day.year == BENCH_YEAR:
+        for pos in range(3):
+            db.add(MealPlanSlot(
+                slot_date=day, position=pos,
+                recipe_id=rng.choice(recipe_ids), servings=rng.randint(1, 4),
+            ))
+        day += timedelta(days=1)
+    db.commit()
+    print(f"  meal_plan_slots {BENCH_YEAR}: {db.query(MealPlanSlot).filter(_in_year()).count()}")
+
+
+def _in_year():
+    return MealPlanSlot.slot_date.between(date(BENCH_YEAR, 1, 1), date(BENCH_YEAR, 12, 31))
+
+
+def drop(db: Session) -> None:
+    db.query(MealPlanSlot).filter(_in_year()).delete(synchronize_session=False)
+    db.query(Recipe).filter(Recipe.name.startswith(PREFIX)).delete(synchronize_session=False)
+    db.query(IngredientDatabase).filter(
+        IngredientDatabase.alim_nom_fr.startswith(PREFIX)
+    ).delete(synchronize_session=False)
+    db.execute(delete(DailyNutrition).where(
+        DailyNutrition.day.between(date(BENCH_YEAR, 1, 1), date(BENCH_YEAR, 12, 31))
+    ))
+    db.commit()
+
+
+def seeded(db: Session) -> bool:
+    return db.query(
+        select(Recipe.recipe_id).where(Recipe.name.startswith(PREFIX)).exists()
+    ).scalar()
+
+
+# ---- Measurement ----
+
+@dataclass
+class Result:
+    name: str
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    queries: float  # SQL statements per call
+    alloc_peak_kib: float
+    alloc_net_kib: float
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *_args) -> None:
+        self.count += 1
+
+
+def measure(
+    name: str,
+    fn: Callable[[], object],
+    iterations: int,
+    counter: QueryCounter,
+    setup: Optional[Callable[[], object]] = None,
+) -> Result:
+    """Time `fn` `iterations` times; `setup` runs untimed before each call."""
+    timings, queries = [], 0
+    for _ in range(iterations):
+        if setup:
+            setup()
+        before = counter.count
+        t0 = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+        queries += counter.count - before
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    q = statistics.quantiles(timings, n=100, method="inclusive") if len(timings) > 1 else timings * 99
+    return Result(
+        name=name,
+        iterations=iterations,
+        p50_ms=round(statistics.median(timings), 3),
+        p95_ms=round(q[94], 3),
+        p99_ms=round(q[98], 3),
+        max_ms=round(max(timings), 3),
+        queries=round(queries / iterations, 1),
+        alloc_peak_kib=round((peak - base) / 1024, 1),
+        alloc_net_kib=round((current - base) / 1024, 1),
+    )
+
+
+def benchmarks(db: Session, rng: random.Random):
+    """(name, fn, setup) per measured path."""
+    raw_cells = [
+        v for (nd,) in db.query(IngredientDatabase.nutrition_data)
+        .filter(IngredientDatabase.alim_nom_fr.startswith(PREFIX)).limit(200)
+        for v in nd.values()
+    ]
+    quantities = [(rng.uniform(0.5, 400), rng.choice(UNITS), rng.choice([None, 1.0])) for _ in range(10_000)]
+    recipe_ids = list(db.scalars(
+        select(Recipe.recipe_id).where(Recipe.name.startswith(PREFIX))
+    ))
+    mondays = [
+        d for d in (date(BENCH_YEAR, 1, 1) + timedelta(days=i) for i in range(358))
+        if d.weekday() == 0
+    ]
+    start, end = date(BENCH_YEAR, 1, 1), date(BENCH_YEAR, 12, 31)
+
+    def drop_rollups(ids=None):
+        stmt = delete(RecipeNutrition)
+        if ids is not None:
+            stmt = stmt.where(RecipeNutrition.recipe_id.in_(ids))
+        db.execute(stmt)
+
+    def drop_days():
+        db.execute(delete(DailyNutrition).where(DailyNutrition.day.between(start, end)))
+
+    batch: list = []
+
+    def pick_batch(n):
+        def _setup():
+            batch[:] = rng.sample(recipe_ids, n)
+            drop_rollups(batch)
+        return _setup
+
+    one: list = []
+
+    def pick_one():
+        one[:] = [rng.choice(recipe_ids)]
+
+    return [
+        ("safe_float ×{} cells".format(len(raw_cells)),
+         lambda: [safe_float(v) for v in raw_cells], None),
+        ("convert_to_grams ×10k",
+         lambda: [convert_to_grams(q, u, d) for q, u, d in quantities], None),
+        ("recipe nutrition, cold ×1",
+         lambda: get_rollups(db, batch), pick_batch(1)),
+        ("recipe nutrition, cold ×100",
+         lambda: get_rollups(db, batch), pick_batch(100)),
+        ("GET /recipes/{id}/nutrition, warm",
+         lambda: get_recipe_nutrition(one[0], db=db), pick_one),
+        ("GET /meal-plan/nutrition (week)",
+         lambda: get_weekly_nutrition(rng.choice(mondays).isoformat(), sex="male", db=db), None),
+        ("GET /meal-plan/nutrition/range (year), cold",
+         lambda: get_range_nutrition(start.isoformat(), end.isoformat(), sex="male", db=db),
+         drop_days),
+        ("GET /meal-plan/nutrition/range (year), warm",
+         lambda: get_range_nutrition(start.isoformat(), end.isoformat(), sex="male", db=db),
+         None),
+    ]
+
+
+def report(results: list[Result]) -> None:
+    cols = ["p50_ms", "p95_ms", "p99_ms", "max_ms", "queries", "alloc_peak_kib", "alloc_net_kib"]
+    width = max(len(r.name) for r in results) + 2
+    print("path".ljust(width) + "".join(c.rjust(15) for c in cols))
+    for r in results:
+        print(r.name.ljust(width) + "".join(str(getattr(r, c)).rjust(15) for c in cols))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--foods", type=int, default=3000)
+    ap.add_argument("--recipes", type=int, default=3000)
+    ap.add_argument("--iterations", type=int, default=30)
+    ap.add_argument("--only", help="comma-separated substrings of path names to run")
+    ap.add_argument("--json", type=Path, help="also write results to this file")
+    ap.add_argument("--seed", type=int, default=42, help="random seed")
+    ap.add_argument("--reseed", action="store_true", help="drop and rebuild bench data")
+    ap.add_argument("--drop", action="store_true", help="drop bench data and exit")
+    ap.add_argument("--allow-remote", action="store_true",
+                    help="run against a non-local DATABASE_URL")
+    args = ap.parse_args()
+
+    engine = get_engine()
+    host = urlparse(engine.url.render_as_string(hide_password=True)).hostname
+    if host not in (None, "", "localhost", "127.0.0.1", "::1") and not args.allow_remote:
+        print(f"❌ DATABASE_URL points at {host}; pass --allow-remote to bench it anyway",
+              file=sys.stderr)
+        sys.exit(1)
+
+    rng = random.Random(args.seed)
+    with Session(engine, autoflush=False) as db:
+        if args.drop or args.reseed:
+            drop(db)
+            print("dropped bench data")
+            if args.drop:
+                return
+        if not seeded(db):
+            print(f"seeding {args.foods} foods × {N_KEYS} keys, {args.recipes} recipes, "
+                  f"{BENCH_YEAR} meal plan ...")
+            seed(db, args.foods, args.recipes, rng)
+        n_slots = db.scalar(select(func.count()).select_from(MealPlanSlot).where(_in_year()))
+        print(f"bench data: {n_slots} slots in {BENCH_YEAR}")
+
+    counter = QueryCounter(engine)
+    results: list[Result] = []
+    with engine.connect() as conn:
+        outer = conn.begin()
+        db = Session(bind=conn, autoflush=False, join_transaction_mode="create_savepoint")
+        try:
+            for name, fn, setup in benchmarks(db, rng):
+                if args.only and not any(s in name for s in args.only.split(",")):
+                    continue
+                if setup:  # warm-up: imports, nutrition engine matrix
+                    setup()
+                fn()
+                results.append(measure(name, fn, args.iterations, counter, setup))
+                print(f"  ✓ {name}")
+        finally:
+            db.close()
+            outer.rollback()
+
+    print()
+    report(results)
+    if args.json:
+        args.json.write_text(json.dumps([asdict(r) for r in results], indent=2))
+        print(f"\nwrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
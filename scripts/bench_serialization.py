@@ -0,0 +1,188 @@
+"""
+Serialization benchmark: the default FastAPI path vs `utils/fast_json.py`.
+
+No database needed — recipes are built in memory with the shape of a
+real page (N recipes × ~10 ingredients × ~6 steps), and the reference
+tables are the shipped JSON files. Paths compared:
+
+  - recipe list, pydantic: ORM objects → `RecipeListResponse`
+    (`from_attributes`, per nested object) → `model_dump(mode="json")`
+    → json.dumps, as a `response_model` endpoint does;
+  - recipe list, orjson: the same data as plain dicts (what the
+    projected Core rows give `_recipe_dicts`) → orjson;
+  - seasonality / rdi, default: `jsonable_encoder` + json.dumps on every
+    request, vs the cached bytes of `seasonality_json()` / `rdi_json()`.
+
+For each it reports latency percentiles and the body size, raw and
+gzipped (what GZipMiddleware sends to browsers).
+
+Usage:
+  python scripts/bench_serialization.py [--recipes 100] [--iterations 200] [--json out.json]
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import argparse  # noqa: E402
+import gzip  # noqa: E402
+import json  # noqa: E402
+import random  # noqa: E402
+import statistics  # noqa: E402
+import time  # noqa: E402
+import uuid  # noqa: E402
+from dataclasses import asdict, dataclass  # noqa: E402
+from datetime import datetime, timedelta  # noqa: E402
+from typing import Callable  # noqa: E402
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from backend.db.models import Ingredient, Instruction, Recipe  # noqa: E402
+from backend.schemas import RecipeListResponse  # noqa: E402
+from backend.services import reference  # noqa: E402
+from backend.utils.fast_json import dumps  # noqa: E402
+
+UNITS = ["g", "kg", "ml", "cl", "l", "c. à soupe", "c. à café", "pièce", ""]
+
+
+def build_recipes(n: int, rng: random.Random) -> list[Recipe]:
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    recipes = []
+    for i in range(n):
+        r = Recipe(
+            recipe_id=uuid.uuid4(),
+            name=f"Recette {i}",
+            description="Une recette de test, assez longue pour ressembler aux vraies. " * 2,
+            prep_time=rng.randint(5, 60),
+            cook_time=rng.randint(0, 120),
+            servings=rng.randint(1, 8),
+            cuisine_type=rng.choice(["française", "italienne", None]),
+            tags=rng.sample(["rapide", "végé", "été", "hiver", "dessert", "plat"], 3),
+            image_url=None,
+            is_favorite=rng.random() < 0.1,
+            created_at=now - timedelta(days=i),
+            updated_at=now - timedelta(days=i, hours=-1),
+        )
+        r.ingredients = [
+            Ingredient(
+                ingredient_id=uuid.uuid4(),
+                name=f"ingrédient {j}",
+                quantity=round(rng.uniform(1, 500), 1),
+                unit=rng.choice(UNITS),
+                notes="",
+                ingredient_db_id=uuid.uuid4() if rng.random() < 0.8 else None,
+            )
+            for j in range(rng.randint(5, 15))
+        ]
+        r.instructions = [
+            Instruction(instruction_id=uuid.uuid4(), step_number=k + 1,
+                        instruction_text=f"Étape {k + 1} : mélanger, puis cuire doucement.")
+            for k in range(rng.randint(3, 9))
+        ]
+        recipes.append(r)
+    return recipes
+
+
+def as_dicts(recipes: list[Recipe]) -> list[dict]:
+    """What `_recipe_dicts` assembles from projected rows."""
+    return [
+        {
+            "name": r.name, "description": r.description, "prep_time": r.prep_time,
+            "cook_time": r.cook_time, "servings": r.servings, "cuisine_type": r.cuisine_type,
+            "tags": r.tags or [], "image_url": r.image_url, "is_favorite": r.is_favorite,
+            "recipe_id": r.recipe_id, "created_at": r.created_at, "updated_at": r.updated_at,
+            "ingredients": [
+                {"name": i.name, "quantity": i.quantity, "unit": i.unit, "notes": i.notes,
+                 "ingredient_db_id": i.ingredient_db_id, "ingredient_id": i.ingredient_id}
+                for i in r.ingredients
+            ],
+            "instructions": [
+                {"step_number": s.step_number, "instruction_text": s.instruction_text,
+                 "instruction_id": s.instruction_id}
+                for s in r.instructions
+            ],
+        }
+        for r in recipes
+    ]
+
+
+@dataclass
+class Result:
+    name: str
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    body_kib: float
+    gzip_kib: float
+
+
+def measure(name: str, fn: Callable[[], bytes], iterations: int) -> Result:
+    timings = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        body = fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+    q = statistics.quantiles(timings, n=100, method="inclusive") if len(timings) > 1 else timings * 99
+    return Result(
+        name=name,
+        iterations=iterations,
+        p50_ms=round(statistics.median(timings), 3),
+        p95_ms=round(q[94], 3),
+        max_ms=round(max(timings), 3),
+        body_kib=round(len(body) / 1024, 1),
+        gzip_kib=round(len(gzip.compress(body, compresslevel=9)) / 1024, 1),
+    )
+
+
+def benchmarks(n: int, rng: random.Random):
+    orm = build_recipes(n, rng)
+    rows = as_dicts(orm)
+    seasonality, rdi = reference.seasonality_payload(), reference.rdi_payload()
+    reference.seasonality_json(), reference.rdi_json()  # cache fill, untimed
+
+    def pydantic_path() -> bytes:
+        model = RecipeListResponse.model_validate({"recipes": orm, "total": n})
+        return json.dumps(model.model_dump(mode="json")).encode()
+
+    return [
+        (f"GET /api/recipes ({n}), pydantic", pydantic_path),
+        (f"GET /api/recipes ({n}), orjson rows", lambda: dumps({"recipes": rows, "total": n})),
+        ("GET /api/reference/seasonality, default",
+         lambda: json.dumps(jsonable_encoder(seasonality)).encode()),
+        ("GET /api/reference/seasonality, cached bytes", reference.seasonality_json),
+        ("GET /api/reference/rdi, default", lambda: json.dumps(jsonable_encoder(rdi)).encode()),
+        ("GET /api/reference/rdi, cached bytes", reference.rdi_json),
+    ]
+
+
+def report(results: list[Result]) -> None:
+    cols = ["p50_ms", "p95_ms", "max_ms", "body_kib", "gzip_kib"]
+    width = max(len(r.name) for r in results) + 2
+    print("path".ljust(width) + "".join(c.rjust(12) for c in cols))
+    for r in results:
+        print(r.name.ljust(width) + "".join(str(getattr(r, c)).rjust(12) for c in cols))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--recipes", type=int, default=100, help="page size (the endpoint caps at 100)")
+    ap.add_argument("--iterations", type=int, default=200)
+    ap.add_argument("--json", type=Path, help="also write results to this file")
+    ap.add_argument("--seed", type=int, default=42, help="random seed")
+    args = ap.parse_args()
+
+    results = [
+        measure(name, fn, args.iterations)
+        for name, fn in benchmarks(args.recipes, random.Random(args.seed))
+    ]
+    report(results)
+    if args.json:
+        args.json.write_text(json.dumps([asdict(r) for r in results], indent=2))
+        print(f"\nwrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ Load CIQUAL 2025 (Table Ciqual 2025_FR_2025_11_03.xls) into ingredient_database.
 - Loads all 84 columns of the file into JSONB. Newlines in column headers
   are normalized to spaces and runs of whitespace collapsed.
 - Asserts the 6 promoted nutrients exist before writing anything.
+- The parsed float copy of every cell lands in ingredient_nutrients on
+  commit (flush hook in backend/services/nutrients.py).
 
 Usage:
   DATABASE_URL=postgresql://... python scripts/load_ciqual_2025.py [path/to/Table.xls]
@@ -26,6 +28,8 @@ from sqlalchemy.orm import sessionmaker  # noqa: E402
 
 from backend.db.models import IngredientDatabase  # noqa: E402
 from backend.db.session import get_engine  # noqa: E402
+from backend.services.recipe_nutrition import invalidate_all  # noqa: E402
+import backend.services.nutrients  # noqa: E402,F401  (typed nutrient sync hook)
 
 SessionLocal = sessionmaker(bind=get_engine(), autocommit=False, autoflush=False)
 
@@ -81,6 +85,9 @@ def main(xls_path: Path) -> None:
             .delete(synchronize_session=False)
         )
         print(f"  deleted {deleted} untouched ciqual rows")
+        # Bulk delete bypasses the ORM hooks; every recipe rollup and stored
+        # day total may be stale. They are rebuilt when this script commits.
+        invalidate_all(db)
 
         # Anything still in the table is preserved (user/llm-sourced or modified).
         # Skip CIQUAL rows whose name collides with one of those.
@@ -6,6 +6,7 @@ Each test wraps its work in a transaction that is rolled back on teardown,
 so the schema persists between runs but no row state leaks.
 """
 import os
+from contextlib import nullcontext
 from pathlib import Path
 import pytest
 from dotenv import load_dotenv
@@ -24,8 +25,17 @@ if not os.getenv("TEST_DATABASE_URL"):
 
 # Point the app's DATABASE_URL at the test DB before app modules import it.
 os.environ["DATABASE_URL"] = os.environ["TEST_DATABASE_URL"]
+os.environ.setdefault("DB_POOL_PROFILE", "test")
 
-from backend.db.session import get_db  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from backend.db.session import (  # noqa: E402
+    get_async_db,
+    get_async_read_db,
+    get_db,
+    get_read_db,
+    get_session_factory,
+)
 from backend.main import app  # noqa: E402
 
 
@@ -64,7 +74,18 @@ def client(db_session):
         finally:
             pass
 
+    async def _override_get_async_db():
+        # Async handlers see the same rolled-back transaction: the
+        # AsyncSession drives the test's sync session directly.
+        yield AsyncSession(sync_session_class=lambda **_: db_session)
+
     app.dependency_overrides[get_db] = _override_get_db
+    # Short-lived sessions (chat tools) reuse the test session, unclosed.
+    app.dependency_overrides[get_session_factory] = lambda: (lambda: nullcontext(db_session))
+    app.dependency_overrides[get_async_db] = _override_get_async_db
+    # No replica in tests: reads share the primary's test session.
+    app.dependency_overrides[get_read_db] = _override_get_db
+    app.dependency_overrides[get_async_read_db] = _override_get_async_db
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
@@ -33,7 +33,7 @@ def test_chat_streams_chunks(client, monkeypatch):
         def __init__(self, **kwargs):
             self.models = FakeModels()
 
-    with patch("backend.api.chat.genai.Client", FakeClient):
+    with patch("google.genai.Client", FakeClient):
         res = client.post(
             "/api/chat",
             json={"messages": [{"role": "user", "text": "hi"}]},
@@ -47,6 +47,57 @@ def test_chat_streams_chunks(client, monkeypatch):
         assert "[DONE]" in body
 
 
+def test_chat_tools_run_in_short_lived_sessions(client, db_session, monkeypatch):
+    """No session is held across the stream: each tool call the model makes
+    opens (and closes) its own session from the factory."""
+    import inspect
+    from contextlib import contextmanager
+
+    from backend.api.chat import _build_meal_plan_tools
+    from backend.db.session import get_session_factory
+    from backend.main import app
+
+    monkeypatch.setenv("GEMINI_API_KEY", "fake")
+    opened = []
+
+    @contextmanager
+    def _factory():
+        opened.append(True)
+        yield db_session
+
+    app.dependency_overrides[get_session_factory] = lambda: _factory
+
+    class FakeChunk:
+        def __init__(self, text):
+            self.text = text
+
+    class FakeModels:
+        def generate_content_stream(self, **kwargs):
+            tools = {t.__name__: t for t in kwargs["config"].tools}
+            assert opened == []  # nothing opened before the model asks
+            monday = "2030-01-07"
+            yield FakeChunk(str(len(tools["get_meal_plan"](monday)["slots"])))
+            tools["get_meal_plan"](monday)
+            yield FakeChunk(f" {len(opened)}")
+
+    class FakeClient:
+        def __init__(self, **kwargs):
+            self.models = FakeModels()
+
+    with patch("google.genai.Client", FakeClient):
+        res = client.post("/api/chat", json={"messages": [{"role": "user", "text": "hi"}]})
+    assert '"0"' in res.text and '" 2"' in res.text
+
+    # The SDK introspects the wrapped tools: signatures and docs are kept.
+    from backend.api.chat import _scoped_tools
+    scoped = _scoped_tools(_build_meal_plan_tools, _factory)
+    original = _build_meal_plan_tools(db_session)
+    for w, o in zip(scoped, original):
+        assert w.__name__ == o.__name__
+        assert w.__doc__ == o.__doc__
+        assert inspect.signature(w) == inspect.signature(o)
+
+
 def test_meal_plan_tools(client, db_session):
     """Exercise the 4 meal-plan tools (stack model)."""
     from datetime import date, timedelta
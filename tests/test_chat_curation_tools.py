@@ -156,6 +156,30 @@ def test_fill_nutrition_dry_run_then_apply(ref_tools, db_session, fresh, monkeyp
     assert row.nutrition_data["c"] == 3.7
 
 
+def test_fill_nutrition_keeps_edits_made_during_llm_call(ref_tools, db_session, fresh, monkeypatch):
+    fill = _by_name(ref_tools, "fill_ingredient_nutrition")
+    row = _make_canon(db_session, fresh, nutrition_data={"a": 1.0, "b": None, "c": None})
+    from backend.api import ingredients as ing_mod
+
+    class _Resp:
+        proposal = {"b": 2.5, "c": 3.7}
+
+    def _fake(ingredient_id, db):  # a curator fills "b" while the LLM answers
+        db.execute(
+            IngredientDatabase.__table__.update()
+            .where(IngredientDatabase.id == row.id)
+            .values(nutrition_data={"a": 1.0, "b": 9.0, "c": None})
+        )
+        return _Resp()
+
+    monkeypatch.setattr(ing_mod, "llm_fill_proposal", _fake)
+
+    applied = fill(ingredient_db_id=str(row.id), dry_run=False)
+    assert applied["filled"] == ["c"]
+    db_session.refresh(row)
+    assert row.nutrition_data == {"a": 1.0, "b": 9.0, "c": 3.7}
+
+
 def test_fill_nutrition_invalid_id(ref_tools):
     fill = _by_name(ref_tools, "fill_ingredient_nutrition")
     assert "error" in fill(ingredient_db_id="not-a-uuid")
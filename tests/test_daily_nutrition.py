@@ -0,0 +1,127 @@
+"""Tests for the daily_nutrition rollup maintained on meal-plan writes."""
+import uuid
+from datetime import date, timedelta
+
+import pytest
+
+from backend.api.chat import _build_meal_plan_tools
+from backend.db.models import DailyNutrition, Ingredient, IngredientDatabase, Recipe
+from backend.services.recipe_nutrition import invalidate_all
+
+CAL_KEY = "Energie, Règlement UE N° 1169 2011 (kcal 100 g)"
+
+
+def _next_monday() -> date:
+    today = date.today()
+    return today + timedelta(days=(0 - today.weekday()) % 7 or 7)
+
+
+@pytest.fixture
+def bowl(db_session):
+    """100 kcal per serving, 1 serving."""
+    rice = IngredientDatabase(
+        alim_nom_fr=f"TEST_{uuid.uuid4().hex[:8]}_RIZ", nutrition_data={CAL_KEY: 100}
+    )
+    db_session.add(rice); db_session.flush()
+    r = Recipe(name="Bowl", servings=1)
+    db_session.add(r); db_session.flush()
+    db_session.add(Ingredient(
+        recipe_id=r.recipe_id, name="riz", quantity=100, unit="g", ingredient_db_id=rice.id,
+    ))
+    db_session.flush()
+    return r
+
+
+def _kcal(db_session, d):
+    row = db_session.get(DailyNutrition, d, populate_existing=True)
+    return None if row is None else row.totals.get(CAL_KEY)
+
+
+def _add(client, bowl, d, servings=1):
+    return client.post("/api/meal-plan", json={
+        "slot_date": d.isoformat(), "recipe_id": str(bowl.recipe_id), "servings": servings,
+    }).json()
+
+
+def test_add_update_delete_keep_row_current(client, db_session, bowl):
+    monday = _next_monday()
+    slot = _add(client, bowl, monday)
+    assert _kcal(db_session, monday) == pytest.approx(100.0)
+
+    client.patch(f"/api/meal-plan/{slot['slot_id']}", json={"servings": 3})
+    assert _kcal(db_session, monday) == pytest.approx(300.0)
+
+    client.delete(f"/api/meal-plan/{slot['slot_id']}")
+    assert _kcal(db_session, monday) is None
+
+
+def test_reorder_across_days_moves_totals(client, db_session, bowl):
+    monday = _next_monday()
+    tuesday = monday + timedelta(days=1)
+    a = _add(client, bowl, monday)
+    _add(client, bowl, monday, servings=2)
+    client.put("/api/meal-plan/reorder", json={"items": [
+        {"slot_id": a["slot_id"], "slot_date": tuesday.isoformat(), "position": 0},
+    ]})
+    assert _kcal(db_session, monday) == pytest.approx(200.0)
+    assert _kcal(db_session, tuesday) == pytest.approx(100.0)
+
+
+def test_generate_overwrite_rebuilds_week(client, db_session, bowl):
+    bowl.is_favorite = True
+    db_session.flush()
+    monday = _next_monday()
+    _add(client, bowl, monday, servings=5)
+    client.post(
+        f"/api/meal-plan/generate?week_start={monday.isoformat()}&meals_per_day=1&overwrite=true"
+        "&mode=random"
+    )
+    for i in range(7):
+        assert _kcal(db_session, monday + timedelta(days=i)) is not None
+    assert _kcal(db_session, monday) == pytest.approx(100.0)
+
+
+def test_recipe_edit_drops_planned_days(client, db_session, bowl):
+    monday = _next_monday()
+    _add(client, bowl, monday)
+    ing = db_session.query(Ingredient).filter(Ingredient.recipe_id == bowl.recipe_id).one()
+    ing.quantity = 250
+    db_session.flush()
+    assert _kcal(db_session, monday) is None
+
+    body = client.get("/api/meal-plan/nutrition/range", params={
+        "from": monday.isoformat(), "to": monday.isoformat(),
+    }).json()
+    assert body["days"][0]["totals"][CAL_KEY] == pytest.approx(250.0)
+    assert _kcal(db_session, monday) is None  # reads never write
+
+    db_session.commit()  # the edit's commit rebuilds the rollup, then the day
+    assert _kcal(db_session, monday) == pytest.approx(250.0)
+
+
+def test_ciqual_reload_drops_stored_days(client, db_session, bowl):
+    monday = _next_monday()
+    _add(client, bowl, monday)
+    assert _kcal(db_session, monday) == pytest.approx(100.0)
+
+    # What scripts/load_ciqual_2025.py does before re-inserting the table.
+    db_session.query(IngredientDatabase).filter(
+        IngredientDatabase.source == "ciqual", IngredientDatabase.modified.is_(False)
+    ).delete(synchronize_session=False)
+    invalidate_all(db_session)
+    db_session.flush()
+
+    body = client.get("/api/meal-plan/nutrition/range", params={
+        "from": monday.isoformat(), "to": monday.isoformat(),
+    }).json()
+    assert CAL_KEY not in body["days"][0]["totals"]
+
+
+def test_chat_tools_keep_row_current(db_session, bowl):
+    tools = {t.__name__: t for t in _build_meal_plan_tools(db_session)}
+    monday = _next_monday()
+    slot = tools["add_meal_to_day"](monday.isoformat(), str(bowl.recipe_id), servings=2)
+    assert _kcal(db_session, monday) == pytest.approx(200.0)
+
+    tools["remove_meal"](slot["slot_id"])
+    assert _kcal(db_session, monday) is None
@@ -0,0 +1,127 @@
+"""Tests for the connection pool profiles and pool metrics."""
+import asyncio
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy import exc as sa_exc
+
+from backend.db import session as db_session_mod
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.db.session import (
+    TimedAsyncQueuePool,
+    TimedNullPool,
+    async_database_url,
+    TimedQueuePool,
+    pool_metrics,
+    pool_profile_name,
+    pool_settings,
+)
+
+
+def test_profile_defaults_by_environment(monkeypatch):
+    monkeypatch.delenv("DB_POOL_PROFILE", raising=False)
+    monkeypatch.delenv("VERCEL", raising=False)
+    assert pool_profile_name() == "selfhosted"
+    monkeypatch.setenv("VERCEL", "1")
+    assert pool_profile_name() == "serverless"
+    monkeypatch.setenv("DB_POOL_PROFILE", "test")
+    assert pool_profile_name() == "test"
+
+
+def test_unknown_profile_rejected(monkeypatch):
+    monkeypatch.setenv("DB_POOL_PROFILE", "huge")
+    with pytest.raises(RuntimeError, match="DB_POOL_PROFILE"):
+        pool_profile_name()
+
+
+def test_env_overrides_profile_numbers(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "7")
+    monkeypatch.setenv("DB_POOL_WARM", "3")
+    settings = pool_settings("selfhosted")
+    assert settings["pool_size"] == 7
+    assert settings["warm"] == 3
+    assert settings["max_overflow"] == 10
+    # NullPool takes no sizing arguments.
+    assert pool_settings("serverless") == {"poolclass": "null", "warm": 3}
+
+
+def test_timed_queue_pool_counts_checkouts_and_overflow():
+    engine = create_engine(
+        os.environ["TEST_DATABASE_URL"], poolclass=TimedQueuePool,
+        pool_size=1, max_overflow=1, pool_timeout=0.2,
+    )
+    before = pool_metrics.snapshot()
+    try:
+        a = engine.connect()
+        b = engine.connect()  # beyond pool_size → overflow
+        assert engine.pool.checkedout() == 2
+        with pytest.raises(sa_exc.TimeoutError):
+            engine.connect()
+        a.execute(text("SELECT 1"))
+        a.close()
+        b.close()
+    finally:
+        engine.dispose()
+    after = pool_metrics.snapshot()
+    assert after["checkouts"] - before["checkouts"] == 2
+    assert after["overflow_checkouts"] - before["overflow_checkouts"] == 1
+    assert after["timeouts"] - before["timeouts"] == 1
+
+
+def test_timed_null_pool_records_each_connect():
+    engine = create_engine(os.environ["TEST_DATABASE_URL"], poolclass=TimedNullPool)
+    before = pool_metrics.snapshot()["checkouts"]
+    with engine.connect() as c:
+        c.execute(text("SELECT 1"))
+    engine.dispose()
+    assert pool_metrics.snapshot()["checkouts"] == before + 1
+
+
+def test_warm_pool_opens_connections(monkeypatch):
+    engine = create_engine(
+        os.environ["TEST_DATABASE_URL"], poolclass=TimedQueuePool, pool_size=2, max_overflow=0,
+    )
+    monkeypatch.setattr(db_session_mod, "_engine", engine)
+    try:
+        assert db_session_mod.warm_pool(5) == 2  # capped at pool_size
+        assert engine.pool.checkedin() == 2
+    finally:
+        engine.dispose()
+
+
+def test_health_reports_pool(client):
+    body = client.get("/health").json()
+    assert body["status"] == "ok"
+    pool = body["pool"]
+    assert pool["profile"] == "test"
+    assert pool["class"] == "TimedQueuePool"
+    for key in ("size", "in_use", "overflow", "checkouts", "timeouts", "wait_ms_p95"):
+        assert key in pool
+
+
+def test_async_database_url_uses_psycopg_async():
+    assert async_database_url("postgresql://u:p@h/db?sslmode=require") == (
+        "postgresql+psycopg://u:p@h/db?sslmode=require"
+    )
+    assert async_database_url("postgresql+psycopg://u@h/db").startswith("postgresql+psycopg://")
+
+
+def test_async_engine_round_trip():
+    async def run():
+        engine = create_async_engine(
+            async_database_url(os.environ["TEST_DATABASE_URL"]),
+            poolclass=TimedAsyncQueuePool, pool_size=2, max_overflow=0,
+        )
+        try:
+            async def one(n):
+                async with engine.connect() as c:
+                    return (await c.execute(text("SELECT :n"), {"n": n})).scalar()
+            return await asyncio.gather(*(one(n) for n in range(4)))
+        finally:
+            await engine.dispose()
+
+    before = pool_metrics.snapshot()["checkouts"]
+    assert asyncio.run(run()) == [0, 1, 2, 3]
+    assert pool_metrics.snapshot()["checkouts"] == before + 4
@@ -0,0 +1,136 @@
+"""Tests for conditional GET (ETag / Last-Modified → 304)."""
+import uuid
+from datetime import date, timedelta
+
+from backend.db.models import IngredientAlias, IngredientDatabase, Recipe
+
+
+def _revalidate(client, url, res):
+    return client.get(url, headers={"If-None-Match": res.headers["etag"]})
+
+
+def _recipe(client, **overrides):
+    payload = {
+        "name": f"TEST_{uuid.uuid4().hex[:6]}",
+        "servings": 2,
+        "ingredients": [{"name": "riz", "quantity": 100, "unit": "g"}],
+        "instructions": [{"instruction_text": "Cuire."}],
+        **overrides,
+    }
+    res = client.post("/api/recipes", json=payload)
+    assert res.status_code == 201
+    return res.json()
+
+
+def test_recipe_list_304_until_changed(client):
+    recipe = _recipe(client)
+    first = client.get("/api/recipes")
+    assert first.headers["etag"].startswith('"')
+    assert "last-modified" not in first.headers
+
+    again = _revalidate(client, "/api/recipes", first)
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == first.headers["etag"]
+
+    client.patch(f"/api/recipes/{recipe['recipe_id']}/favorite?is_favorite=true")
+    assert _revalidate(client, "/api/recipes", first).status_code == 200
+
+
+def test_recipe_detail_changes_with_ingredients_only(client):
+    recipe = _recipe(client)
+    url = f"/api/recipes/{recipe['recipe_id']}"
+    first = client.get(url)
+    assert _revalidate(client, url, first).status_code == 304
+
+    # Only the child rows change: the recipe's updated_at must still move.
+    res = client.put(url, json={"ingredients": [{"name": "riz", "quantity": 250, "unit": "g"}]})
+    assert res.status_code == 200
+    second = _revalidate(client, url, first)
+    assert second.status_code == 200
+    assert second.json()["ingredients"][0]["quantity"] == 250
+
+    client.put(url, json={"instructions": []})
+    assert _revalidate(client, url, second).status_code == 200
+
+
+def test_recipe_detail_404_unaffected(client):
+    res = client.get(f"/api/recipes/{uuid.uuid4()}", headers={"If-None-Match": "*"})
+    assert res.status_code == 404
+
+
+def test_if_modified_since(client):
+    recipe = _recipe(client)
+    url = f"/api/recipes/{recipe['recipe_id']}"
+    first = client.get(url)
+    res = client.get(url, headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert res.status_code == 304
+    res = client.get(url, headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+    assert res.status_code == 200
+
+
+def test_collection_ignores_if_modified_since_after_delete(client):
+    keep, gone = _recipe(client), _recipe(client)
+    first = client.get(f"/api/recipes/{keep['recipe_id']}")
+    client.delete(f"/api/recipes/{gone['recipe_id']}")
+    # The delete leaves max(updated_at) where it was; only the ETag moves.
+    res = client.get("/api/recipes", headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert res.status_code == 200
+    assert gone["recipe_id"] not in {r["recipe_id"] for r in res.json()["recipes"]}
+
+
+def test_ingredient_detail_changes_with_aliases(client, db_session):
+    row = IngredientDatabase(alim_nom_fr=f"TEST_{uuid.uuid4().hex[:8]}_POIS", nutrition_data={})
+    db_session.add(row)
+    db_session.flush()
+    url = f"/api/ingredients/{row.id}"
+    first = client.get(url)
+    assert _revalidate(client, url, first).status_code == 304
+
+    row.aliases.append(IngredientAlias(alias_text="petits pois", created_by="user"))
+    db_session.flush()
+    second = _revalidate(client, url, first)
+    assert second.status_code == 200
+    alias_id = second.json()["aliases"][0]["alias_id"]
+
+    assert client.delete(f"{url}/aliases/{alias_id}").status_code == 204
+    assert _revalidate(client, url, second).status_code == 200
+
+
+def test_reference_content_hash(client):
+    for url in ("/api/reference/rdi", "/api/reference/seasonality",
+                "/api/reference/seasonality/in-season?month=6"):
+        first = client.get(url)
+        assert _revalidate(client, url, first).status_code == 304
+    june = client.get("/api/reference/seasonality/in-season?month=6").headers["etag"]
+    july = client.get("/api/reference/seasonality/in-season?month=7").headers["etag"]
+    assert june != july
+
+
+def test_shopping_list_changes_with_contributions(client):
+    client.post("/api/shopping-list", json={"name": "Tomates", "quantity_text": "2"})
+    first = client.get("/api/shopping-list")
+    assert _revalidate(client, "/api/shopping-list", first).status_code == 304
+    # Merges into the existing item: only a contribution is added.
+    client.post("/api/shopping-list", json={"name": "Tomates", "quantity_text": "3"})
+    assert _revalidate(client, "/api/shopping-list", first).status_code == 200
+
+
+def test_meal_plan_week_changes_with_recipe_name(client, db_session):
+    recipe = _recipe(client)
+    monday = date(2099, 1, 5)
+    assert monday.weekday() == 0
+    client.post("/api/meal-plan", json={
+        "slot_date": (monday + timedelta(days=1)).isoformat(),
+        "recipe_id": recipe["recipe_id"],
+        "servings": 1,
+    })
+    url = f"/api/meal-plan?week_start={monday.isoformat()}"
+    first = client.get(url)
+    assert _revalidate(client, url, first).status_code == 304
+
+    client.put(f"/api/recipes/{recipe['recipe_id']}", json={"name": "Renamed"})
+    second = _revalidate(client, url, first)
+    assert second.status_code == 200
+    assert second.json()["slots"][0]["recipe_name"] == "Renamed"
+    assert db_session.get(Recipe, uuid.UUID(recipe["recipe_id"])).name == "Renamed"
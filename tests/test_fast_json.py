@@ -0,0 +1,74 @@
+"""Tests for the orjson list path (`utils/fast_json.py`) and gzip."""
+import gzip
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from backend.schemas import RecipeResponse
+from backend.db.models import Recipe
+from backend.services import reference
+
+
+def _recipe(client, **overrides):
+    payload = {
+        "name": f"TEST_{uuid.uuid4().hex[:6]}",
+        "servings": 2,
+        "tags": ["rapide"],
+        "ingredients": [
+            {"name": "riz", "quantity": 100, "unit": "g", "notes": "basmati"},
+            {"name": "sel", "quantity": 1, "unit": "pincée"},
+        ],
+        "instructions": [
+            {"instruction_text": "Rincer.", "step_number": 1},
+            {"instruction_text": "Cuire.", "step_number": 2},
+        ],
+        **overrides,
+    }
+    res = client.post("/api/recipes", json=payload)
+    assert res.status_code == 201
+    return res.json()
+
+
+def test_recipe_list_matches_pydantic_path(client, db_session):
+    _recipe(client)
+    _recipe(client, tags=[], description="Sans étapes", instructions=[])
+    body = client.get("/api/recipes?limit=100").json()
+
+    orm = db_session.scalars(
+        select(Recipe)
+        .where(Recipe.recipe_id.in_([uuid.UUID(r["recipe_id"]) for r in body["recipes"]]))
+        .options(selectinload(Recipe.ingredients), selectinload(Recipe.instructions))
+    ).all()
+    expected = {
+        str(r.recipe_id): RecipeResponse.model_validate(r).model_dump(mode="json") for r in orm
+    }
+    assert len(body["recipes"]) == len(expected) == body["total"]
+    for got in body["recipes"]:
+        want = expected[got["recipe_id"]]
+        key = lambda i: i["ingredient_id"]  # noqa: E731 — no ORM order_by on ingredients
+        assert sorted(got.pop("ingredients"), key=key) == sorted(want.pop("ingredients"), key=key)
+        assert got == want
+
+
+def test_recipe_list_keeps_validators(client):
+    _recipe(client)
+    res = client.get("/api/recipes")
+    assert res.headers["content-type"] == "application/json"
+    assert res.headers["etag"].startswith('"')
+    assert "last-modified" not in res.headers  # collections: ETag only
+
+
+def test_reference_serves_cached_bytes(client):
+    res = client.get("/api/reference/seasonality")
+    assert res.json() == reference.seasonality_payload()
+    assert res.headers["etag"] == reference.seasonality_etag()
+    assert client.get("/api/reference/rdi").json() == reference.rdi_payload()
+
+
+def test_large_bodies_are_gzipped(client):
+    res = client.get("/api/reference/seasonality", headers={"Accept-Encoding": "gzip"})
+    assert res.headers["content-encoding"] == "gzip"
+    raw = client.get("/api/reference/seasonality", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in raw.headers
+    assert len(gzip.compress(raw.content)) < len(raw.content)
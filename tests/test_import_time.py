@@ -0,0 +1,51 @@
+"""Cold-start budget: `import backend.main` in a fresh interpreter.
+
+The budget (seconds) defaults to IMPORT_BUDGET_S below and can be raised on
+slow CI machines via the IMPORT_TIME_BUDGET_S env var.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+IMPORT_BUDGET_S = 2.0
+ROOT = Path(__file__).resolve().parent.parent
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import backend.main
+print(json.dumps({
+    "seconds": time.perf_counter() - t0,
+    "genai": "google.genai" in sys.modules,
+}))
+"""
+
+
+def _import_main() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=ROOT,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_gemini_sdk_not_imported_at_startup():
+    assert _import_main()["genai"] is False
+
+
+def test_import_within_budget():
+    budget = float(os.getenv("IMPORT_TIME_BUDGET_S", IMPORT_BUDGET_S))
+    # Best of three: the first run also pays for cold .pyc / disk caches.
+    best = min(_import_main()["seconds"] for _ in range(3))
+    assert best <= budget, f"import backend.main took {best:.2f}s (budget {budget}s)"
+
+
+def test_warmup_endpoint(client):
+    body = client.get("/warmup").json()
+    assert set(body) == {"reference_ms", "db_ms"}
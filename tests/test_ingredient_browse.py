@@ -1,9 +1,15 @@
 """Tests for /api/ingredients browse + curation endpoints."""
+import uuid
 from datetime import datetime, timezone
 
 import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
 
-from backend.db.models import IngredientAlias, IngredientDatabase
+from backend.db import session as db_session_mod
+from backend.main import app
+
+from backend.db.models import IngredientAlias, IngredientDatabase, IngredientNutrient
 
 
 @pytest.fixture
@@ -30,6 +36,34 @@ def test_search_matches_alias(client, db_session, make_ingredient):
     assert "Tomate, crue" in names
 
 
+def test_search_through_the_real_async_engine(engine, monkeypatch):
+    """No dependency overrides: the request goes through `get_async_read_db`
+    and psycopg's async driver, so the rows have to be committed."""
+    tag = uuid.uuid4().hex[:8]
+    with Session(engine) as db:
+        row = IngredientDatabase(alim_nom_fr=f"TEST_{tag} Tomate, crue", nutrition_data={})
+        row.aliases = [IngredientAlias(alias_text=f"cerises {tag}", created_by="user")]
+        db.add(row)
+        db.commit()
+        row_id = row.id
+    # A fresh engine, bound to this client's event loop and disposed there.
+    monkeypatch.setattr(db_session_mod, "_async_engine", None)
+    monkeypatch.setattr(db_session_mod, "_AsyncSessionLocal", None)
+    try:
+        with TestClient(app) as c:
+            try:
+                res = c.get("/api/ingredients/search", params={"q": f"cerises {tag}"})
+            finally:
+                if db_session_mod._async_engine is not None:
+                    c.portal.call(db_session_mod._async_engine.dispose)
+        assert res.status_code == 200
+        assert [it["id"] for it in res.json()] == [str(row_id)]
+    finally:
+        with Session(engine) as db:
+            db.delete(db.get(IngredientDatabase, row_id))
+            db.commit()
+
+
 def test_list_filters_modified(client, db_session, make_ingredient):
     make_ingredient("Touched", modified=True, modified_by="user", modified_at=datetime.now(timezone.utc))
     make_ingredient("Pristine")
@@ -61,6 +95,21 @@ def test_patch_updates_and_marks_modified(client, db_session, make_ingredient):
     assert body["modified_by"] == "user"
 
 
+def test_patch_rewrites_typed_nutrients(client, db_session, make_ingredient):
+    r = make_ingredient("Foo", nutrition_data={"a": "1,5", "b": "-"})
+    res = client.patch(
+        f"/api/ingredients/{r.id}",
+        json={"nutrition_data": {"a": "traces", "c": "<0,1"}},
+    )
+    assert res.status_code == 200
+    typed = dict(
+        db_session.query(IngredientNutrient.nutrient_key, IngredientNutrient.value)
+        .filter(IngredientNutrient.ingredient_db_id == r.id)
+        .all()
+    )
+    assert typed == {"a": 0.0, "c": 0.0}
+
+
 def test_patch_rejects_unknown_category(client, db_session, make_ingredient):
     r = make_ingredient("Foo")
     res = client.patch(f"/api/ingredients/{r.id}", json={"category": "Bogus"})
@@ -112,3 +161,42 @@ def test_get_detail_404(client):
     import uuid
     res = client.get(f"/api/ingredients/{uuid.uuid4()}")
     assert res.status_code == 404
+
+
+class _FakeGemini:
+    """generate_content records whether the test session still held its
+    transaction (i.e. a pool connection) while 'waiting' on the LLM."""
+
+    def __init__(self, db_session, text):
+        self.models = self
+        self.db_session = db_session
+        self.text = text
+        self.held_connection = None
+
+    def generate_content(self, **_kw):
+        self.held_connection = self.db_session.in_transaction()
+        return type("R", (), {"text": self.text})()
+
+
+def test_llm_density_releases_connection_before_llm(client, db_session, make_ingredient, monkeypatch):
+    from backend.api import ingredients as ing_mod
+
+    r = make_ingredient("Miel")
+    fake = _FakeGemini(db_session, '{"value": 1.42, "reason": "miel"}')
+    monkeypatch.setattr(ing_mod, "_gemini_client", lambda: fake)
+    res = client.post(f"/api/ingredients/{r.id}/llm-density")
+    assert res.status_code == 200
+    assert res.json()["value"] == 1.42
+    assert fake.held_connection is False
+
+
+def test_llm_fill_proposal_releases_connection_before_llm(client, db_session, make_ingredient, monkeypatch):
+    from backend.api import ingredients as ing_mod
+
+    r = make_ingredient("Y", nutrition_data={"k1": None, "k2": 1.0})
+    fake = _FakeGemini(db_session, '{"k1": 3.0, "k2": 9.0}')
+    monkeypatch.setattr(ing_mod, "_gemini_client", lambda: fake)
+    res = client.post(f"/api/ingredients/{r.id}/llm-fill")
+    assert res.status_code == 200
+    assert res.json()["proposal"] == {"k1": 3.0}
+    assert fake.held_connection is False
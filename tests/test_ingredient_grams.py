@@ -0,0 +1,66 @@
+"""Tests for the persisted Ingredient.quantity_g / gram_status."""
+import uuid
+
+import pytest
+
+from backend.db.models import Ingredient, IngredientDatabase, Recipe
+
+
+@pytest.fixture
+def oil(db_session):
+    row = IngredientDatabase(alim_nom_fr=f"TEST_{uuid.uuid4().hex[:8]}_HUILE")
+    db_session.add(row); db_session.flush()
+    return row
+
+
+def _ingredients(db_session, recipe_id):
+    return {
+        i.name: i
+        for i in db_session.query(Ingredient).filter(Ingredient.recipe_id == recipe_id)
+    }
+
+
+def test_recipe_create_resolves_grams(client, db_session, oil):
+    res = client.post("/api/recipes", json={
+        "name": "Vinaigrette",
+        "ingredients": [
+            {"name": "huile", "quantity": 3, "unit": "cuillère à soupe", "ingredient_db_id": str(oil.id)},
+            {"name": "sel", "quantity": 1, "unit": "pincée"},
+            {"name": "citron", "quantity": 1, "unit": "pcs"},
+        ],
+    })
+    assert res.status_code == 201
+    ings = _ingredients(db_session, res.json()["recipe_id"])
+    assert (ings["huile"].quantity_g, ings["huile"].gram_status) == (None, "missing_density")
+    assert (ings["sel"].quantity_g, ings["sel"].gram_status) == (0.5, "ok")
+    assert ings["citron"].gram_status == "unknown_unit"
+
+
+def test_density_edit_reresolves_linked_ingredients(client, db_session, oil):
+    res = client.post("/api/recipes", json={
+        "name": "Vinaigrette",
+        "ingredients": [
+            {"name": "huile", "quantity": 3, "unit": "cas", "ingredient_db_id": str(oil.id)},
+        ],
+    })
+    recipe_id = res.json()["recipe_id"]
+
+    res = client.patch(f"/api/ingredients/{oil.id}", json={"density_g_per_ml": 0.92})
+    assert res.status_code == 200
+    ing = _ingredients(db_session, recipe_id)["huile"]
+    db_session.refresh(ing)
+    assert ing.gram_status == "ok"
+    assert ing.quantity_g == pytest.approx(45 * 0.92)
+
+
+def test_quantity_edit_reresolves(db_session, oil):
+    oil.density_g_per_ml = 1.0
+    # Linked through the relationship only: the FK is not set until flush.
+    ing = Ingredient(name="huile", quantity=10, unit="ml", ingredient_db=oil)
+    db_session.add(Recipe(name="R", servings=1, ingredients=[ing]))
+    db_session.flush()
+    assert ing.quantity_g == pytest.approx(10.0)
+
+    ing.unit = "cl"
+    db_session.flush()
+    assert ing.quantity_g == pytest.approx(100.0)
@@ -103,6 +103,36 @@ def test_candidates_endpoint_returns_exact(client, db_session, make_ingredient):
     assert body["llm_candidates"] == []
 
 
+def test_candidates_endpoint_releases_connection_before_llm(client, db_session, monkeypatch):
+    pool = [{"id": str(UUID(int=i)), "name": f"Pomme {i}"} for i in range(1, 6)]
+    held = []
+
+    class _FakeClient:
+        models = None
+
+        def generate_content(self, **_kw):
+            held.append(db_session.in_transaction())
+            return type("R", (), {"text": f'{{"candidates": [{{"id": "{pool[1]["id"]}"}}]}}'})()
+
+    fake = _FakeClient()
+    fake.models = fake
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    monkeypatch.setattr(im, "candidate_pool", lambda db, name: pool)
+    monkeypatch.setattr(im.gemini, "client", lambda: fake)
+    res = client.get("/api/match/candidates", params={"name": "pomme xyz"})
+    assert res.status_code == 200
+    assert [c["name"] for c in res.json()["llm_candidates"]] == ["Pomme 2"]
+    assert held == [False]
+
+
+def test_release_connection_refuses_pending_changes(db_session):
+    from backend.db.session import release_connection
+
+    db_session.add(IngredientDatabase(alim_nom_fr="Pending", nutrition_data={}))
+    with pytest.raises(RuntimeError):
+        release_connection(db_session)
+
+
 def test_confirm_endpoint_writes_alias(client, db_session, make_ingredient):
     r = make_ingredient("Tomate, crue")
     res = client.post(
@@ -177,3 +177,81 @@ def test_rdi_changes_with_sex(client):
     female = client.get("/api/meal-plan/nutrition", params={"week_start": monday, "sex": "female"}).json()
     diffs = [k for k in male["rdi"] if male["rdi"][k] != female["rdi"].get(k)]
     assert len(diffs) >= 5
+
+
+# ---- Range endpoint ----
+
+def _range(client, first, last, **params):
+    return client.get("/api/meal-plan/nutrition/range", params={
+        "from": first.isoformat(), "to": last.isoformat(), **params,
+    })
+
+
+def test_range_days_and_period(client, db_session, make_canonical, make_recipe_with_ing):
+    rice = make_canonical("RizR", nutrition_data={CAL_KEY: 100, PROT_KEY: 2})
+    r = make_recipe_with_ing(name="B", servings=1, ings=[("riz", 100, "g", rice.id)])
+    start = _next_monday() + timedelta(days=30)
+    _add_slot(db_session, r, start, servings=1)
+    _add_slot(db_session, r, start + timedelta(days=9), servings=3)
+
+    res = _range(client, start, start + timedelta(days=13))
+    assert res.status_code == 200
+    body = res.json()
+    assert len(body["days"]) == 14
+    assert body["days"][0]["totals"][CAL_KEY] == pytest.approx(100.0)
+    assert body["days"][1]["totals"] == {}
+    assert body["days"][9]["totals"][CAL_KEY] == pytest.approx(300.0)
+    assert body["period"][CAL_KEY] == pytest.approx(400.0)
+    assert body["period"][PROT_KEY] == pytest.approx(8.0)
+    assert body["period_rdi"][PROT_KEY] == pytest.approx(body["rdi"][PROT_KEY] * 14)
+
+
+def test_commits_rebuild_only_changed_days(
+    client, db_session, make_canonical, make_recipe_with_ing, monkeypatch,
+):
+    from backend.services import daily_nutrition
+
+    rice = make_canonical("RizC", nutrition_data={CAL_KEY: 100})
+    a = make_recipe_with_ing(name="A", servings=1, ings=[("riz", 100, "g", rice.id)])
+    b = make_recipe_with_ing(name="B", servings=1, ings=[("riz", 50, "g", rice.id)])
+    start = _next_monday() + timedelta(days=60)
+    _add_slot(db_session, a, start, servings=1)
+    _add_slot(db_session, b, start + timedelta(days=1), servings=1)
+
+    computed: list[set] = []
+    real = daily_nutrition.refresh_days
+
+    def spy(db, days):
+        computed.append(set(days))
+        return real(db, days)
+
+    monkeypatch.setattr(daily_nutrition, "refresh_days", spy)
+    last = start + timedelta(days=6)
+    # Reads compute what was never built but write nothing.
+    assert _range(client, start, last).json()["days"][1]["totals"][CAL_KEY] == pytest.approx(50.0)
+    assert computed == []
+    db_session.commit()
+    assert computed == [{start, start + timedelta(days=1)}]
+    _range(client, start, last)
+    assert len(computed) == 1
+
+    # Editing recipe B only rebuilds the day it is planned on.
+    ing = db_session.query(Ingredient).filter(Ingredient.recipe_id == b.recipe_id).one()
+    ing.quantity = 200
+    db_session.commit()
+    assert computed[-1] == {start + timedelta(days=1)}
+    body = _range(client, start, last).json()
+    assert body["days"][1]["totals"][CAL_KEY] == pytest.approx(200.0)
+
+    # A new slot rebuilds its own day.
+    _add_slot(db_session, a, start, servings=1, position=1)
+    db_session.commit()
+    assert computed[-1] == {start}
+    body = _range(client, start, last).json()
+    assert body["days"][0]["totals"][CAL_KEY] == pytest.approx(200.0)
+
+
+@pytest.mark.parametrize("offset_to,status", [(-1, 400), (366, 400), (365, 200)])
+def test_range_bounds(client, offset_to, status):
+    start = _next_monday()
+    assert _range(client, start, start + timedelta(days=offset_to)).status_code == status
@@ -0,0 +1,135 @@
+"""Tests for the nutrition-target meal plan optimizer."""
+import time
+import uuid
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from backend.db.models import IngredientDatabase, Ingredient, MealPlanSlot, Recipe
+from backend.services.meal_plan_optimizer import greedy_fill
+
+CAL_KEY = "Energie, Règlement UE N° 1169 2011 (kcal 100 g)"
+
+
+def _loss(totals, targets, lower):
+    over = totals / targets - 1.0
+    return float((np.where(lower, np.maximum(over, 0.0), over) ** 2).sum())
+
+
+def _pool(n_recipes=1000, n_keys=30, seed=0):
+    rng = np.random.default_rng(seed)
+    targets = rng.uniform(10, 1000, n_keys)
+    # One serving covers ~0–60% of a day's target per nutrient.
+    vectors = rng.uniform(0, 0.6, (n_recipes, n_keys)) * targets
+    lower = np.zeros(n_keys, dtype=bool)
+    lower[:3] = True
+    return vectors, targets, lower
+
+
+def test_greedy_fill_beats_random_and_is_fast():
+    vectors, targets, lower = _pool()
+    t0 = time.perf_counter()
+    plan = greedy_fill(vectors, targets, lower, needs=[3] * 7, meals_per_day=3)
+    elapsed = time.perf_counter() - t0
+    assert elapsed < 1.0
+
+    assert [len(day) for day in plan] == [3] * 7
+    picked = [r for day in plan for r, _ in day]
+    assert len(set(picked)) == len(picked)  # no repeats
+
+    rng = np.random.default_rng(1)
+    opt = sum(_loss(sum(vectors[r] * s for r, s in day), targets, lower) for day in plan)
+    rand = sum(
+        _loss(vectors[rng.choice(len(vectors), 3)].sum(axis=0), targets, lower)
+        for _ in range(7)
+    )
+    assert opt < rand / 2
+
+
+def test_greedy_fill_only_penalizes_lower_is_better_when_over():
+    targets = np.array([100.0, 100.0])
+    lower = np.array([False, True])
+    vectors = np.array([
+        [100.0, 0.0],  # on target, none of the lower-is-better nutrient
+        [100.0, 100.0],  # on target for both
+        [50.0, 0.0],
+    ])
+    plan = greedy_fill(vectors, targets, lower, needs=[1], meals_per_day=1, choices=(1,))
+    assert plan[0][0][0] in (0, 1)
+
+    vectors[1, 1] = 200.0  # now over on the lower-is-better one
+    plan = greedy_fill(vectors, targets, lower, needs=[1], meals_per_day=1, choices=(1,))
+    assert plan == [[(0, 1)]]
+
+
+def test_greedy_fill_counts_existing_meals():
+    targets = np.array([300.0])
+    lower = np.array([False])
+    vectors = np.array([[100.0]])
+    # Day already holds 200 of 300 over 2 meals: one portion closes the gap.
+    plan = greedy_fill(
+        vectors, targets, lower, needs=[1], meals_per_day=3,
+        base=np.array([[200.0]]), base_meals=[2],
+    )
+    assert plan == [[(0, 1)]]
+
+
+def test_greedy_fill_repeats_once_pool_is_exhausted():
+    vectors, targets, lower = _pool(n_recipes=2, n_keys=4)
+    plan = greedy_fill(vectors, targets, lower, needs=[3], meals_per_day=3)
+    assert len(plan[0]) == 3
+
+
+def _next_monday() -> date:
+    today = date.today()
+    return today + timedelta(days=(0 - today.weekday()) % 7 or 7)
+
+
+def _recipe(db_session, name, kcal):
+    food = IngredientDatabase(
+        alim_nom_fr=f"TEST_{uuid.uuid4().hex[:8]}_{name}", nutrition_data={CAL_KEY: kcal}
+    )
+    db_session.add(food); db_session.flush()
+    r = Recipe(name=name, servings=1, is_favorite=True)
+    db_session.add(r); db_session.flush()
+    db_session.add(Ingredient(
+        recipe_id=r.recipe_id, name=name, quantity=100, unit="g", ingredient_db_id=food.id,
+    ))
+    db_session.flush()
+    return r
+
+
+def test_generate_optimize_mode_targets_energy(client, db_session):
+    _recipe(db_session, "Light", 100)
+    _recipe(db_session, "Hearty", 800)
+    monday = _next_monday()
+
+    res = client.post("/api/meal-plan/generate", params={
+        "week_start": monday.isoformat(), "meals_per_day": 3, "avoid_repeats": "false",
+    })
+    assert res.status_code == 200
+    slots = res.json()["slots"]
+    assert len(slots) == 21
+    # ~2,500 kcal/day over 3 meals: the 800-kcal recipe, one portion each.
+    assert {s["recipe_name"] for s in slots} == {"Hearty"}
+    assert {s["servings"] for s in slots} == {1}
+
+    assert db_session.query(MealPlanSlot).filter(MealPlanSlot.slot_date == monday).count() == 3
+
+
+def test_generate_rejects_unknown_mode(client, db_session):
+    res = client.post("/api/meal-plan/generate", params={
+        "week_start": _next_monday().isoformat(), "mode": "best",
+    })
+    assert res.status_code == 422
+
+
+@pytest.mark.parametrize("mode", ["optimize", "random"])
+def test_chat_generate_modes(db_session, mode):
+    from backend.api.chat import _build_meal_plan_tools
+
+    _recipe(db_session, "Bowl", 500)
+    generate = _build_meal_plan_tools(db_session)[3]
+    out = generate(_next_monday().isoformat(), meals_per_day=2, mode=mode)
+    assert len(out["slots"]) == 14
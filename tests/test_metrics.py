@@ -0,0 +1,126 @@
+"""Tests for the /metrics endpoint and the metrics it aggregates."""
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from backend.utils import metrics
+from backend.utils.perf import llm_timer
+
+
+def _value(body: str, series: str) -> float:
+    for line in body.splitlines():
+        if line.startswith(series + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{series} not in /metrics")
+
+
+def test_request_latency_labelled_by_route_template(client):
+    client.get(f"/api/recipes/{uuid.uuid4()}")
+    client.get(f"/api/recipes/{uuid.uuid4()}")
+    body = client.get("/metrics").text
+    series = 'http_request_duration_seconds_count{method="GET",route="/api/recipes/{recipe_id}"}'
+    assert _value(body, series) >= 2
+    assert "# TYPE http_request_duration_seconds histogram" in body
+
+
+def test_unmatched_paths_share_a_label(client):
+    client.get("/nope/" + uuid.uuid4().hex)
+    body = client.get("/metrics").text
+    assert 'route="unmatched"' in body
+    assert "/nope/" not in body
+
+
+def test_pool_and_cache_sections(client):
+    body = client.get("/metrics").text
+    assert "db_pool_checkouts_total" in body
+    assert 'db_pool_size{engine="sync"}' in body
+    assert 'cache_hit_ratio{cache="parse_unit"}' in body
+
+
+def test_snapshot_caches_count_hits_and_reloads(client, db_session):
+    from backend.db.models import IngredientDatabase
+    from backend.services.nutrition_engine import nutrition_engine
+
+    nutrition_engine(db_session)
+    hits, misses, reloads = metrics.snapshot_stats("nutrition_engine")
+    nutrition_engine(db_session)
+    assert metrics.snapshot_stats("nutrition_engine") == (hits + 1, misses, reloads)
+
+    db_session.add(IngredientDatabase(alim_nom_fr=f"TEST_{uuid.uuid4().hex[:8]}", nutrition_data={}))
+    db_session.flush()
+    nutrition_engine(db_session)
+    assert metrics.snapshot_stats("nutrition_engine") == (hits + 1, misses + 1, reloads + 1)
+
+    body = client.get("/metrics").text
+    assert _value(body, 'cache_reloads_total{cache="nutrition_engine"}') == reloads + 1
+    assert 'cache_hit_ratio{cache="nutrition_engine"}' in body
+
+
+def test_alias_write_keeps_the_engine_snapshot(client, db_session):
+    from backend.db.models import IngredientDatabase
+    from backend.services.nutrition_engine import nutrition_engine
+
+    row = IngredientDatabase(alim_nom_fr=f"TEST_{uuid.uuid4().hex[:8]}", nutrition_data={})
+    db_session.add(row)
+    db_session.flush()
+    nutrition_engine(db_session)
+    first = client.get(f"/api/ingredients/{row.id}")
+    hits, misses, reloads = metrics.snapshot_stats("nutrition_engine")
+
+    res = client.post("/api/match/confirm", json={"name": "pois frais", "ingredient_db_id": str(row.id)})
+    assert res.status_code == 200
+    nutrition_engine(db_session)
+    assert metrics.snapshot_stats("nutrition_engine") == (hits + 1, misses, reloads)
+    # The ingredient's own validator still moves.
+    again = client.get(f"/api/ingredients/{row.id}", headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 200
+
+
+def test_ops_endpoints_need_the_token(client, monkeypatch):
+    monkeypatch.setenv("OPS_TOKEN", "s3cret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/warmup", headers={"Authorization": "Bearer nope"}).status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer s3cret"}).status_code == 200
+
+    monkeypatch.delenv("OPS_TOKEN")
+    monkeypatch.setenv("VERCEL", "1")
+    assert client.get("/metrics").status_code == 404
+
+
+class _RateLimited(Exception):
+    code = 429
+
+
+def test_llm_outcomes_counted_per_site():
+    before = {o: metrics.gemini_requests.value("match", o) for o in ("ok", "error", "rate_limited")}
+    with llm_timer("match"):
+        pass
+    with pytest.raises(_RateLimited), llm_timer("match"):
+        raise _RateLimited()
+    with pytest.raises(ValueError), llm_timer("match"):
+        raise ValueError("bad")
+    for outcome in ("ok", "error", "rate_limited"):
+        assert metrics.gemini_requests.value("match", outcome) == before[outcome] + 1
+
+
+def test_chat_stream_counted(client, monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "fake")
+
+    class FakeChunk:
+        text = "ok"
+
+    class FakeModels:
+        def generate_content_stream(self, **kwargs):
+            yield FakeChunk()
+
+    class FakeClient:
+        def __init__(self, **kwargs):
+            self.models = FakeModels()
+
+    before = metrics.gemini_requests.value("chat", "ok")
+    with patch("google.genai.Client", FakeClient):
+        client.post("/api/chat", json={"messages": [{"role": "user", "text": "hi"}]})
+    assert metrics.gemini_requests.value("chat", "ok") == before + 1
+    body = client.get("/metrics").text
+    assert 'gemini_request_duration_seconds_count{site="chat"}' in body
@@ -0,0 +1,104 @@
+"""Tests for the vectorized NutritionEngine."""
+import uuid
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from backend.db.models import Ingredient, IngredientDatabase, MealPlanSlot, Recipe
+from backend.services.nutrition_engine import NutritionEngine, nutrition_engine
+from backend.utils.nutrition import resolve_grams
+
+CAL_KEY = "Energie, Règlement UE N° 1169 2011 (kcal 100 g)"
+PROT_KEY = "Protéines, N x facteur de Jones (g 100 g)"
+
+
+def _engine(rows):
+    """rows: [(uuid, {key: value})] → in-memory engine, no DB."""
+    keys = []
+    for _, nd in rows:
+        for k in nd:
+            if k not in keys:
+                keys.append(k)
+    matrix = np.full((len(rows), len(keys)), np.nan)
+    for i, (_, nd) in enumerate(rows):
+        for k, v in nd.items():
+            if v is not None:
+                matrix[i, keys.index(k)] = v
+    has_data = np.array([bool(nd) for _, nd in rows])
+    return NutritionEngine([r[0] for r in rows], keys, matrix, has_data)
+
+
+def _ing(fk, qty, unit, density=None, name="x"):
+    """Transient ingredient with grams resolved as the flush hook would."""
+    grams, status = resolve_grams(qty, unit, density)
+    return Ingredient(
+        name=name, quantity=qty, unit=unit, ingredient_db_id=fk,
+        quantity_g=grams, gram_status=status,
+    )
+
+
+def test_aggregate_groups_and_presence():
+    rice, oil = uuid.uuid4(), uuid.uuid4()
+    eng = _engine([
+        (rice, {CAL_KEY: 130.0, PROT_KEY: 2.5}),
+        (oil, {CAL_KEY: 900.0, PROT_KEY: None}),
+    ])
+    plan = eng.plan([
+        (0, _ing(rice, 200, "g"), 1.0),
+        (1, _ing(oil, 100, "ml", density=0.92), 0.5),
+    ])
+    totals, present = eng.aggregate(plan, n_groups=2)
+    assert totals[0, eng.key_index[CAL_KEY]] == pytest.approx(260.0)
+    # 100 ml × 0.92 g/ml × 0.5 = 46 g → 414 kcal.
+    assert totals[1, eng.key_index[CAL_KEY]] == pytest.approx(414.0)
+    assert totals[1, eng.key_index[PROT_KEY]] == 0.0
+    assert present[0].all()
+    assert not present[1, eng.key_index[PROT_KEY]]
+
+
+def test_plan_records_untracked_reasons():
+    stub, oil = uuid.uuid4(), uuid.uuid4()
+    eng = _engine([(stub, {}), (oil, {CAL_KEY: 900.0})])
+    plan = eng.plan([
+        (0, _ing(None, 1, "g"), 1.0),
+        (0, _ing(stub, 10, "g"), 1.0),
+        (0, _ing(oil, 10, "ml"), 1.0),
+        (0, _ing(oil, 1, "barrel"), 1.0),
+    ])
+    assert [r for _, _, r in plan.untracked] == [
+        "missing_fk", "no_data", "missing_density", "unknown_unit",
+    ]
+    assert plan.rows == []
+
+
+def test_engine_reloads_after_curation(db_session):
+    row = IngredientDatabase(
+        alim_nom_fr=f"TEST_{uuid.uuid4().hex[:8]}", nutrition_data={CAL_KEY: 100}
+    )
+    db_session.add(row); db_session.flush()
+    eng = nutrition_engine(db_session)
+    assert eng.matrix[eng.row_index[row.id], eng.key_index[CAL_KEY]] == 100.0
+
+    row.nutrition_data = {CAL_KEY: "1,5"}
+    db_session.flush()
+    eng = nutrition_engine(db_session)
+    assert eng.matrix[eng.row_index[row.id], eng.key_index[CAL_KEY]] == 1.5
+
+
+def test_weekly_untracked_keeps_each_slot_date(client, db_session):
+    r = Recipe(name="Soupe", servings=1)
+    db_session.add(r); db_session.flush()
+    db_session.add(Ingredient(recipe_id=r.recipe_id, name="mystère", quantity=1, unit="g"))
+    today = date.today()
+    monday = today + timedelta(days=(0 - today.weekday()) % 7 or 7)
+    for offset in (0, 3):
+        db_session.add(MealPlanSlot(
+            slot_date=monday + timedelta(days=offset), position=0,
+            recipe_id=r.recipe_id, servings=1,
+        ))
+    db_session.flush()
+
+    res = client.get("/api/meal-plan/nutrition", params={"week_start": monday.isoformat()}).json()
+    dates = sorted(u["slot_date"] for u in res["untracked"])
+    assert dates == [monday.isoformat(), (monday + timedelta(days=3)).isoformat()]
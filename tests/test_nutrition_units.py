@@ -4,7 +4,7 @@ Covers the spoon table, density-based ml→g, and edge cases.
 """
 import pytest
 
-from backend.utils.nutrition import convert_to_grams
+from backend.utils.nutrition import convert_to_grams, resolve_grams
 
 
 def test_grams_pass_through():
@@ -59,9 +59,33 @@ def test_pincee_is_direct_mass_no_density_needed():
     assert convert_to_grams(2, "pincée") == pytest.approx(1.0)
 
 
+@pytest.mark.parametrize("unit", ["c. à d.", "cuillère à dessert"])
+def test_dessert_spoon_recognized(unit):
+    assert convert_to_grams(1, unit, density_g_per_ml=1.0) == pytest.approx(10.0)
+
+
+def test_pack_word_has_no_grams():
+    assert convert_to_grams(2, "sachets", density_g_per_ml=1.0) is None
+
+
 def test_verre():
     assert convert_to_grams(1, "verre", density_g_per_ml=1.03) == pytest.approx(206.0)
 
 
 def test_unknown_unit_returns_none():
     assert convert_to_grams(1, "barrel", density_g_per_ml=1.0) is None
+
+
+@pytest.mark.parametrize("qty,unit,density,expected", [
+    (200, "g", None, (200.0, "ok")),
+    (None, "g", None, (0.0, "ok")),
+    (2, "cas", 0.92, (pytest.approx(27.6), "ok")),
+    (2, "cas", None, (None, "missing_density")),
+    (2, "c. à s.", None, (None, "missing_density")),
+    (1, "sachet", None, (None, "unknown_unit")),
+    (10, "cl", None, (None, "missing_density")),
+    (1, "barrel", 1.0, (None, "unknown_unit")),
+    (1, "", None, (None, "unknown_unit")),
+])
+def test_resolve_grams(qty, unit, density, expected):
+    assert resolve_grams(qty, unit, density) == expected
@@ -0,0 +1,127 @@
+"""Tests for keyset (cursor) pagination on the recipe and ingredient lists."""
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import exc as sa_exc, text
+
+from backend.db.models import IngredientDatabase, Recipe
+from backend.utils import cursor as keyset
+
+
+def _walk(client, url, params, key):
+    """Follow `next_cursor` to the end; returns every item in page order."""
+    seen, cursor = [], None
+    while True:
+        res = client.get(url, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert res.status_code == 200
+        body = res.json()
+        seen += body[key]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return seen
+
+
+def test_recipe_cursor_walks_full_order(client, db_session):
+    cuisine = f"test-{uuid.uuid4().hex[:8]}"
+    same = datetime(2030, 1, 1, 12, 0)
+    for i, (fav, created) in enumerate([
+        (False, datetime(2030, 1, 2)),
+        (True, datetime(2029, 1, 1)),
+        (False, same),
+        (False, same),  # tie on created_at: recipe_id decides
+        (True, datetime(2030, 6, 1)),
+    ]):
+        db_session.add(Recipe(name=f"R{i}", cuisine_type=cuisine, is_favorite=fav, created_at=created))
+    db_session.flush()
+
+    params = {"cuisine": cuisine, "limit": 2}
+    by_offset = client.get("/api/recipes", params={"cuisine": cuisine}).json()["recipes"]
+    by_cursor = _walk(client, "/api/recipes", params, "recipes")
+    assert [r["recipe_id"] for r in by_cursor] == [r["recipe_id"] for r in by_offset]
+    assert [r["name"] for r in by_cursor][:2] == ["R4", "R1"]
+    assert len(by_cursor) == 5
+
+
+def test_recipe_cursor_reaches_undated_rows(client, db_session):
+    """Rows that predate `created_at` are backfilled to the epoch (see the
+    a2c7e5f9d314 migration): the cursor must still walk past them, and a
+    NULL — which would drop out of the row comparison — is refused."""
+    cuisine = f"test-{uuid.uuid4().hex[:8]}"
+    for i, created in enumerate([datetime(2030, 1, 2), datetime(1970, 1, 1), datetime(2029, 1, 1)]):
+        db_session.add(Recipe(name=f"R{i}", cuisine_type=cuisine, created_at=created))
+    db_session.flush()
+
+    for fields in ({}, {"fields": "summary"}):
+        walked = _walk(client, "/api/recipes", {"cuisine": cuisine, "limit": 1, **fields}, "recipes")
+        assert [r["name"] for r in walked] == ["R0", "R2", "R1"]
+
+    with pytest.raises(sa_exc.IntegrityError):
+        with db_session.begin_nested():
+            db_session.execute(text(
+                "INSERT INTO recipes (recipe_id, name, is_favorite) VALUES (gen_random_uuid(), 'x', false)"
+            ))
+
+
+def test_total_defaults_to_the_first_page_only(client, db_session):
+    cuisine = f"test-{uuid.uuid4().hex[:8]}"
+    db_session.add_all([Recipe(name=f"R{i}", cuisine_type=cuisine) for i in range(3)])
+    prefix = f"TEST_{uuid.uuid4().hex[:8]}"
+    db_session.add_all([IngredientDatabase(alim_nom_fr=f"{prefix} {i}", nutrition_data={}) for i in range(3)])
+    db_session.flush()
+
+    for url, params in (("/api/recipes", {"cuisine": cuisine}), ("/api/ingredients", {"search": prefix})):
+        first = client.get(url, params={**params, "limit": 2}).json()
+        assert first["total"] == 3
+        rest = client.get(url, params={**params, "limit": 2, "cursor": first["next_cursor"]}).json()
+        assert rest["total"] is None
+
+
+def test_recipe_list_without_total(client, db_session):
+    cuisine = f"test-{uuid.uuid4().hex[:8]}"
+    db_session.add_all([Recipe(name=f"R{i}", cuisine_type=cuisine) for i in range(3)])
+    db_session.flush()
+
+    res = client.get("/api/recipes", params={"cuisine": cuisine, "with_total": False})
+    body = res.json()
+    assert body["total"] is None and body["next_cursor"] is None
+    assert len(body["recipes"]) == 3
+    again = client.get(
+        "/api/recipes",
+        params={"cuisine": cuisine, "with_total": False},
+        headers={"If-None-Match": res.headers["etag"]},
+    )
+    assert again.status_code == 304
+
+
+def test_invalid_cursor_is_400(client):
+    for bad in ("not-a-cursor", keyset.encode([True]), keyset.encode([True, "x", "y"])):
+        assert client.get("/api/recipes", params={"cursor": bad}).status_code == 400
+    assert client.get("/api/ingredients", params={"cursor": "%%%"}).status_code == 400
+
+
+def test_forged_cursor_with_wrong_types_is_400(client):
+    when = "2020-01-01T00:00:00"
+    for forged in (
+        [True, when, 5],  # UUID from an int
+        [True, when, {}],
+        ["no", when, str(uuid.uuid4())],  # truthy string for the flag
+        [True, 1577836800, str(uuid.uuid4())],
+    ):
+        res = client.get("/api/recipes", params={"cursor": keyset.encode(forged)})
+        assert res.status_code == 400, forged
+    ranked = keyset.encode(["0.5", True, when, str(uuid.uuid4())])
+    assert client.get("/api/recipes", params={"search": "riz", "cursor": ranked}).status_code == 400
+    assert client.get("/api/ingredients", params={"cursor": keyset.encode([3])}).status_code == 400
+
+
+def test_ingredient_cursor_walks_by_name(client, db_session):
+    prefix = f"TEST_{uuid.uuid4().hex[:8]}"
+    names = [f"{prefix} {c}" for c in "ecadb"]
+    db_session.add_all([IngredientDatabase(alim_nom_fr=n, nutrition_data={}) for n in names])
+    db_session.flush()
+
+    items = _walk(
+        client, "/api/ingredients", {"search": prefix, "limit": 2, "with_total": False}, "items"
+    )
+    assert [it["name"] for it in items] == sorted(names)
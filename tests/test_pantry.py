@@ -0,0 +1,96 @@
+"""Tests for pantry-driven recipe ranking (`services/pantry.py`)."""
+import uuid
+
+import pytest
+
+from backend.db.models import Ingredient, IngredientAlias, IngredientDatabase, Recipe
+from backend.services.pantry import PantryIndex, name_tokens
+
+
+def test_name_tokens():
+    assert name_tokens("Pommes de terre") == ("pomme", "terre")
+    assert name_tokens("  Tomates SÉCHÉES ") == ("tomate", "sechee")
+    assert name_tokens("Œufs") == ("oeuf",)
+    assert name_tokens("riz") == ("riz",)
+
+
+def test_index_rank_orders_by_coverage():
+    a, b = uuid.uuid4(), uuid.uuid4()
+    index = PantryIndex(
+        [(uuid.uuid4(), "Full", False), (uuid.uuid4(), "Third", False),
+         (uuid.uuid4(), "Half", False), (uuid.uuid4(), "Half, favorite", True)],
+        [[(a, "riz"), (b, "lait")], [(b, "lait"), ("name:oeuf", "oeufs"), ("name:sel", "sel")],
+         [(a, "riz"), ("name:sucre", "sucre")], [(a, "riz"), ("name:sel", "sel")]],
+    )
+    ranked = index.rank({a, b})
+    assert [m.name for m in ranked] == ["Full", "Half, favorite", "Half", "Third"]
+    assert ranked[2].missing == ["sucre"] and ranked[2].coverage == 0.5
+    assert [m.name for m in index.rank({a}, min_coverage=0.6)] == []
+    assert index.rank({uuid.uuid4()}) == []
+
+
+@pytest.fixture
+def kitchen(db_session):
+    tag = uuid.uuid4().hex[:6]
+    rice = IngredientDatabase(alim_nom_fr=f"TEST_{tag} Riz blanc, cuit", nutrition_data={})
+    db_session.add(rice)
+    db_session.flush()
+    db_session.add(IngredientAlias(ingredient_db_id=rice.id, alias_text=f"riz{tag}", created_by="user"))
+
+    def recipe(name, *ings):
+        r = Recipe(name=f"{name} {tag}")
+        r.ingredients = [Ingredient(name=n, quantity=1, unit="g", ingredient_db_id=d) for n, d in ings]
+        db_session.add(r)
+        return r
+
+    recipe("Poulet riz", (f"poulet cru {tag}", None), ("riz basmati", rice.id))
+    recipe("Curry", (f"blanc de poulet {tag}", None), ("riz", rice.id), ("curry", None), ("lait de coco", None))
+    recipe("Salade", ("laitue", None))
+    db_session.flush()
+    return tag, rice
+
+
+def test_pantry_endpoint(client, kitchen):
+    tag, rice = kitchen
+    res = client.get("/api/recipes/pantry", params={
+        "ingredients": [f"poulets {tag}", "truffe blanche"],
+        "ingredient_db_ids": [str(rice.id)],
+    })
+    assert res.status_code == 200
+    body = res.json()
+    assert body["unresolved"] == ["truffe blanche"]
+    results = [r for r in body["results"] if r["name"].endswith(tag)]
+    assert [r["name"] for r in results] == [f"Poulet riz {tag}", f"Curry {tag}"]
+    assert results[0]["coverage"] == 1.0 and results[0]["missing"] == []
+    assert results[1]["coverage"] == 0.5
+    assert sorted(results[1]["missing"]) == ["curry", "lait de coco"]
+
+    res = client.get("/api/recipes/pantry", params={
+        "ingredients": [f"riz{tag}", f"poulet {tag}"], "min_coverage": 0.75,
+    })
+    names = [r["name"] for r in res.json()["results"] if r["name"].endswith(tag)]
+    assert names == [f"Poulet riz {tag}"]  # alias resolves to the CIQUAL row
+
+
+def test_pantry_index_follows_edits(client, kitchen):
+    tag, _ = kitchen
+    params = {"ingredients": ["laitue", "tomate"]}
+    first = [r["name"] for r in client.get("/api/recipes/pantry", params=params).json()["results"]]
+    assert f"Salade {tag}" in first
+    salade = next(r for r in client.get("/api/recipes", params={"search": f"Salade {tag}"}).json()["recipes"])
+    client.put(f"/api/recipes/{salade['recipe_id']}", json={
+        "ingredients": [{"name": "laitue"}, {"name": "tomates"}, {"name": "feta"}],
+    })
+    hit = next(r for r in client.get("/api/recipes/pantry", params=params).json()["results"]
+               if r["name"] == f"Salade {tag}")
+    assert hit["missing"] == ["feta"]
+
+
+def test_chat_pantry_tool(db_session, kitchen):
+    from backend.api.chat import _build_pantry_tools
+
+    tag, _ = kitchen
+    (recipes_from_pantry,) = _build_pantry_tools(db_session)
+    out = recipes_from_pantry([f"poulet {tag}", "riz"])
+    mine = [r for r in out["recipes"] if r["name"].endswith(tag)]
+    assert mine[0]["name"] == f"Poulet riz {tag}" and mine[0]["coverage"] == 1.0
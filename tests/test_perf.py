@@ -0,0 +1,75 @@
+"""Tests for the per-request Server-Timing header and perf log line."""
+import json
+import logging
+from unittest.mock import patch
+
+from backend.db.models import Recipe
+
+
+def _timing(res) -> dict[str, str]:
+    """{'db': 'dur=1.2;desc="3 queries"', ...} from the Server-Timing header."""
+    out = {}
+    for part in res.headers["server-timing"].split(","):
+        name, _, rest = part.strip().partition(";")
+        out[name] = rest
+    return out
+
+
+def _perf_lines(caplog) -> list[dict]:
+    return [json.loads(r.getMessage()) for r in caplog.records if r.name == "backend.perf"]
+
+
+def test_server_timing_counts_queries(client, db_session):
+    db_session.add(Recipe(name="Soupe", servings=2))
+    db_session.flush()
+    res = client.get("/api/recipes")
+    assert res.status_code == 200
+    timing = _timing(res)
+    assert set(timing) == {"db", "llm", "ser", "total"}
+    assert "0 queries" not in timing["db"]
+    assert timing["llm"].endswith('desc="0 calls"')
+
+
+def test_request_logged_without_sql_when_fast(client, monkeypatch, caplog):
+    monkeypatch.setenv("SLOW_REQUEST_MS", "100000")
+    with caplog.at_level(logging.INFO, logger="backend.perf"):
+        client.get("/api/recipes")
+    (line,) = _perf_lines(caplog)
+    assert line["path"] == "/api/recipes"
+    assert line["status"] == 200
+    assert line["db_count"] >= 1
+    assert "sql" not in line
+
+
+def test_slow_request_logs_grouped_sql(client, monkeypatch, caplog):
+    monkeypatch.setenv("SLOW_REQUEST_MS", "0")
+    with caplog.at_level(logging.INFO, logger="backend.perf"):
+        client.get("/api/recipes")
+    (line,) = _perf_lines(caplog)
+    assert line["slow"] is True
+    assert any("recipe" in s["sql"].lower() for s in line["sql"])
+    assert all(s["count"] >= 1 for s in line["sql"])
+
+
+def test_streamed_llm_time_is_logged(client, monkeypatch, caplog):
+    monkeypatch.setenv("GEMINI_API_KEY", "fake")
+
+    class FakeChunk:
+        def __init__(self, text):
+            self.text = text
+
+    class FakeModels:
+        def generate_content_stream(self, **kwargs):
+            yield FakeChunk("ok")
+
+    class FakeClient:
+        def __init__(self, **kwargs):
+            self.models = FakeModels()
+
+    with patch("google.genai.Client", FakeClient), caplog.at_level(
+        logging.INFO, logger="backend.perf"
+    ):
+        res = client.post("/api/chat", json={"messages": [{"role": "user", "text": "hi"}]})
+        assert res.status_code == 200
+    (line,) = _perf_lines(caplog)
+    assert line["llm_calls"] == 1
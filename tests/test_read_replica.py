@@ -0,0 +1,110 @@
+"""Tests for read-replica routing (`get_read_db`) and replica-safe rollups."""
+import os
+import time
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+
+from backend.db import session as session_mod
+from backend.db.models import (
+    DailyNutrition,
+    Ingredient,
+    IngredientDatabase,
+    MealPlanSlot,
+    Recipe,
+    RecipeNutrition,
+)
+from backend.services.daily_nutrition import get_days
+from backend.services.recipe_nutrition import get_rollups
+
+CAL_KEY = "Energie, Règlement UE N° 1169 2011 (kcal 100 g)"
+
+
+@pytest.fixture
+def bowl(db_session):
+    rice = IngredientDatabase(
+        alim_nom_fr=f"TEST_{uuid.uuid4().hex[:8]}_RIZ", nutrition_data={CAL_KEY: 130}
+    )
+    db_session.add(rice); db_session.flush()
+    r = Recipe(name="Bowl", servings=2)
+    db_session.add(r); db_session.flush()
+    db_session.add(Ingredient(
+        recipe_id=r.recipe_id, name="riz", quantity=200, unit="g", ingredient_db_id=rice.id,
+    ))
+    db_session.flush()
+    return r
+
+
+def _request(cookie: str = "") -> Request:
+    headers = [(b"cookie", cookie.encode())] if cookie else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_primary_without_replica(monkeypatch):
+    monkeypatch.setattr(session_mod, "READ_DATABASE_URL", None)
+    assert session_mod._use_replica(_request()) is False
+
+
+def test_recent_write_pins_reads_to_primary(monkeypatch):
+    monkeypatch.setattr(session_mod, "READ_DATABASE_URL", "postgresql+psycopg://replica/db")
+    assert session_mod._use_replica(_request()) is True
+    future = f"{session_mod.PRIMARY_COOKIE}={time.time() + 60}"
+    assert session_mod._use_replica(_request(future)) is False
+    past = f"{session_mod.PRIMARY_COOKIE}={time.time() - 1}"
+    assert session_mod._use_replica(_request(past)) is True
+    assert session_mod._use_replica(_request(f"{session_mod.PRIMARY_COOKIE}=junk")) is True
+
+
+def test_writes_set_primary_cookie(client, monkeypatch):
+    monkeypatch.setattr(session_mod, "READ_DATABASE_URL", "postgresql+psycopg://replica/db")
+    res = client.post("/api/shopping-list", json={"name": "Pommes", "quantity_text": "3"})
+    assert res.status_code == 201
+    assert session_mod.PRIMARY_COOKIE in res.headers.get("set-cookie", "")
+    res = client.get("/api/shopping-list")
+    assert "set-cookie" not in res.headers
+
+
+def test_no_cookie_without_replica(client, monkeypatch):
+    monkeypatch.setattr(session_mod, "READ_DATABASE_URL", None)
+    res = client.post("/api/shopping-list", json={"name": "Poires", "quantity_text": "2"})
+    assert "set-cookie" not in res.headers
+
+
+def test_replica_read_computes_without_persisting(client, db_session, bowl):
+    db_session.info["replica"] = True
+    body = client.get(f"/api/recipes/{bowl.recipe_id}/nutrition").json()
+    assert body["calories"] == pytest.approx(260.0)
+    assert db_session.get(RecipeNutrition, bowl.recipe_id) is None
+
+
+def test_get_days_without_persisting(db_session, bowl):
+    d = date(2099, 3, 2)
+    db_session.add(MealPlanSlot(slot_date=d, position=0, recipe_id=bowl.recipe_id, servings=1))
+    db_session.flush()
+    rows = get_days(db_session, d, d, persist=False)
+    assert rows[d].totals[CAL_KEY] == pytest.approx(130.0)
+    assert db_session.get(DailyNutrition, d) is None
+    assert db_session.get(RecipeNutrition, bowl.recipe_id) is None
+
+
+@pytest.mark.skipif(
+    not os.getenv("TEST_READ_DATABASE_URL"),
+    reason="TEST_READ_DATABASE_URL (a second Postgres, or a replica) not set",
+)
+def test_replica_engine_is_read_only():
+    engine = create_engine(os.environ["TEST_READ_DATABASE_URL"]).execution_options(
+        postgresql_readonly=True
+    )
+    try:
+        with Session(engine, info={"replica": True}) as db:
+            assert session_mod.is_replica(db)
+            assert get_rollups(db, [uuid.uuid4()], persist=False) == {}
+            with pytest.raises(sa_exc.DBAPIError, match="read-only"):
+                db.execute(text("CREATE TEMP TABLE replica_probe (x int)"))
+    finally:
+        engine.dispose()
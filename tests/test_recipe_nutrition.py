@@ -0,0 +1,96 @@
+"""Tests for the materialized recipe_nutrition rollup + its invalidation."""
+import uuid
+
+import pytest
+
+from backend.db.models import Ingredient, IngredientDatabase, Recipe, RecipeNutrition
+
+CAL_KEY = "Energie, Règlement UE N° 1169 2011 (kcal 100 g)"
+
+
+@pytest.fixture
+def rice(db_session):
+    row = IngredientDatabase(
+        alim_nom_fr=f"TEST_{uuid.uuid4().hex[:8]}_RIZ", nutrition_data={CAL_KEY: 130}
+    )
+    db_session.add(row); db_session.flush()
+    return row
+
+
+@pytest.fixture
+def bowl(db_session, rice):
+    r = Recipe(name="Bowl", servings=2)
+    db_session.add(r); db_session.flush()
+    db_session.add(Ingredient(
+        recipe_id=r.recipe_id, name="riz", quantity=200, unit="g", ingredient_db_id=rice.id,
+    ))
+    db_session.add(Ingredient(recipe_id=r.recipe_id, name="mystère", quantity=1, unit="g"))
+    db_session.flush()
+    return r
+
+
+def _rollup(db_session, recipe):
+    return db_session.get(RecipeNutrition, recipe.recipe_id)
+
+
+def test_rollup_built_by_the_writing_commit(client, db_session, bowl):
+    assert _rollup(db_session, bowl) is None
+    body = client.get(f"/api/recipes/{bowl.recipe_id}/nutrition").json()
+    assert body["calories"] == pytest.approx(260.0)
+    assert body["per_serving"]["calories"] == pytest.approx(130.0)
+    assert body["untracked_count"] == 1
+    # The GET computed it for the response only.
+    assert _rollup(db_session, bowl) is None
+
+    db_session.commit()  # the fixture's ingredient inserts
+    row = _rollup(db_session, bowl)
+    assert row is not None
+    assert row.totals[CAL_KEY] == pytest.approx(260.0)
+    assert row.untracked == [{"ingredient_name": "mystère", "reason": "missing_fk"}]
+
+
+def test_ingredient_edit_invalidates(client, db_session, bowl):
+    client.get(f"/api/recipes/{bowl.recipe_id}/nutrition")
+    ing = db_session.query(Ingredient).filter_by(recipe_id=bowl.recipe_id, name="riz").one()
+    ing.quantity = 100
+    db_session.flush()
+    assert _rollup(db_session, bowl) is None
+    body = client.get(f"/api/recipes/{bowl.recipe_id}/nutrition").json()
+    assert body["calories"] == pytest.approx(130.0)
+
+
+def test_servings_change_invalidates(client, db_session, bowl):
+    client.get(f"/api/recipes/{bowl.recipe_id}/nutrition")
+    bowl.servings = 4
+    db_session.flush()
+    body = client.get(f"/api/recipes/{bowl.recipe_id}/nutrition").json()
+    assert body["servings"] == 4
+    assert body["per_serving"]["calories"] == pytest.approx(65.0)
+
+
+def test_canonical_nutrition_edit_invalidates(client, db_session, bowl, rice):
+    client.get(f"/api/recipes/{bowl.recipe_id}/nutrition")
+    res = client.patch(f"/api/ingredients/{rice.id}", json={"nutrition_data": {CAL_KEY: 100}})
+    assert res.status_code == 200
+    body = client.get(f"/api/recipes/{bowl.recipe_id}/nutrition").json()
+    assert body["calories"] == pytest.approx(200.0)
+
+
+def test_unrelated_edit_keeps_rollup(client, db_session, bowl):
+    db_session.commit()
+    computed_at = _rollup(db_session, bowl).computed_at
+    bowl.is_favorite = True
+    db_session.flush()
+    assert _rollup(db_session, bowl).computed_at == computed_at
+
+
+def test_put_ingredients_invalidates(client, db_session, bowl, rice):
+    client.get(f"/api/recipes/{bowl.recipe_id}/nutrition")
+    res = client.put(f"/api/recipes/{bowl.recipe_id}", json={
+        "ingredients": [
+            {"name": "riz", "quantity": 50, "unit": "g", "ingredient_db_id": str(rice.id)},
+        ],
+    })
+    assert res.status_code == 200
+    # Dropped at flush, rebuilt by the PUT's own commit.
+    assert _rollup(db_session, bowl).totals[CAL_KEY] == pytest.approx(65.0)
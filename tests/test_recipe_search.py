@@ -0,0 +1,103 @@
+"""Tests for French full-text recipe search (`services/recipe_search.py`)."""
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from backend.db.models import SEARCH_CONFIG, Ingredient, Instruction, Recipe
+
+
+def _recipe(db, name, ingredients=(), steps=(), **kw):
+    r = Recipe(name=name, servings=2, **kw)
+    r.ingredients = [Ingredient(name=n, quantity=1, unit="g") for n in ingredients]
+    r.instructions = [
+        Instruction(step_number=i + 1, instruction_text=t) for i, t in enumerate(steps)
+    ]
+    db.add(r)
+    db.flush()
+    return r
+
+
+def _names(client, q, **params):
+    res = client.get("/api/recipes", params={"search": q, **params})
+    assert res.status_code == 200
+    return [r["name"] for r in res.json()["recipes"]]
+
+
+def test_search_covers_children_and_stems(client, db_session):
+    tag = uuid.uuid4().hex[:6]
+    _recipe(db_session, f"Gratin {tag}", ingredients=["courgettes", "gruyère"],
+            steps=["Enfourner à 180°C."])
+    _recipe(db_session, f"Tartes {tag}", description="Aux pommes du jardin")
+
+    assert _names(client, f"courgette {tag}") == [f"Gratin {tag}"]  # ingredient, stemmed
+    assert _names(client, f"enfourn {tag}") == [f"Gratin {tag}"]  # step text, prefix
+    assert _names(client, f"tarte pomme {tag}") == [f"Tartes {tag}"]  # every word must match
+    assert _names(client, f"courgette pomme {tag}") == []
+
+
+def test_search_ranks_name_over_description(client, db_session):
+    tag = uuid.uuid4().hex[:6]
+    _recipe(db_session, f"Soupe {tag}", description="Se marie bien avec du poireau",
+            is_favorite=True)
+    _recipe(db_session, f"Poireaux vinaigrette {tag}")
+    assert _names(client, f"poireau {tag}") == [f"Poireaux vinaigrette {tag}", f"Soupe {tag}"]
+
+
+def test_search_cursor_pages_in_rank_order(client, db_session):
+    tag = uuid.uuid4().hex[:6]
+    for i in range(3):
+        _recipe(db_session, f"Crumble {tag} {i}", description="crumble " * i)
+    first = client.get("/api/recipes", params={"search": f"crumble {tag}", "limit": 2}).json()
+    rest = client.get("/api/recipes", params={
+        "search": f"crumble {tag}", "limit": 2, "cursor": first["next_cursor"],
+    }).json()
+    everything = _names(client, f"crumble {tag}")
+    assert [r["name"] for r in first["recipes"] + rest["recipes"]] == everything
+    assert rest["next_cursor"] is None
+
+
+def test_update_refreshes_vector(client, db_session):
+    tag = uuid.uuid4().hex[:6]
+    r = _recipe(db_session, f"Risotto {tag}", ingredients=["champignons"], steps=["Nacrer le riz."])
+    url = f"/api/recipes/{r.recipe_id}"
+    client.put(url, json={"ingredients": [{"name": "asperges"}], "instructions": []})
+    assert _names(client, f"asperge {tag}") == [f"Risotto {tag}"]
+    assert _names(client, f"champignon {tag}") == []
+    assert _names(client, f"nacrer {tag}") == []
+
+    client.put(url, json={"name": f"Orzotto {tag}"})
+    assert _names(client, f"orzotto {tag}") == [f"Orzotto {tag}"]
+
+
+def test_accents_fold_when_unaccent_available(client, db_session):
+    folds = db_session.execute(text(
+        f"SELECT to_tsvector('{SEARCH_CONFIG}', 'pâtes') = to_tsvector('{SEARCH_CONFIG}', 'pates')"
+    )).scalar()
+    if not folds:
+        pytest.skip("unaccent extension not available on this server")
+    tag = uuid.uuid4().hex[:6]
+    _recipe(db_session, f"Pâtes fraîches {tag}")
+    assert _names(client, f"pates fraiches {tag}") == [f"Pâtes fraîches {tag}"]
+
+
+def test_chat_tool_uses_full_text(db_session):
+    from backend.api.chat import _build_list_recipes_tool
+
+    tag = uuid.uuid4().hex[:6]
+    _recipe(db_session, f"Blanquette {tag}", ingredients=["veau", "carottes"])
+    found = _build_list_recipes_tool(db_session)(search=f"carotte {tag}", ingredient="veau")
+    assert [r["name"] for r in found] == [f"Blanquette {tag}"]
+
+
+def test_stopwords_only_search_does_not_filter(client, db_session):
+    from backend.api.chat import _build_list_recipes_tool
+
+    cuisine = f"test-{uuid.uuid4().hex[:8]}"
+    _recipe(db_session, "Tarte aux pommes", cuisine_type=cuisine)
+    _recipe(db_session, "Soupe de légumes", cuisine_type=cuisine)
+
+    assert sorted(_names(client, "de la", cuisine=cuisine)) == ["Soupe de légumes", "Tarte aux pommes"]
+    assert _names(client, "de la tarte", cuisine=cuisine) == ["Tarte aux pommes"]
+    found = _build_list_recipes_tool(db_session)(search="de la", cuisine=cuisine)
+    assert len(found) == 2
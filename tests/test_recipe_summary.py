@@ -0,0 +1,90 @@
+"""Tests for the `fields=summary` projection of the recipe list."""
+import re
+import uuid
+
+from backend.db.models import Ingredient, Instruction, Recipe
+
+
+def _recipe(db, name, cuisine, ingredients=(), **kw):
+    r = Recipe(name=name, cuisine_type=cuisine, **kw)
+    r.ingredients = [Ingredient(name=n, quantity=1, unit="g") for n in ingredients]
+    r.instructions = [Instruction(step_number=1, instruction_text="Mélanger.")]
+    db.add(r)
+    return r
+
+
+def _summaries(client, **params):
+    res = client.get("/api/recipes", params={"fields": "summary", **params})
+    assert res.status_code == 200
+    return res
+
+
+def test_summary_shape_and_ingredient_count(client, db_session):
+    cuisine = f"test-{uuid.uuid4().hex[:8]}"
+    _recipe(db_session, "Ratatouille", cuisine, ["courgette", "aubergine", "tomate"], tags=["Été"])
+    _recipe(db_session, "Eau", cuisine)
+    db_session.flush()
+
+    body = _summaries(client, cuisine=cuisine).json()
+    assert body["total"] == 2
+    by_name = {r["name"]: r for r in body["recipes"]}
+    assert by_name["Ratatouille"]["ingredient_count"] == 3
+    assert by_name["Ratatouille"]["tags"] == ["été"]
+    assert by_name["Eau"]["ingredient_count"] == 0
+    assert "ingredients" not in by_name["Eau"] and "instructions" not in by_name["Eau"]
+
+    full = client.get("/api/recipes", params={"cuisine": cuisine}).json()
+    assert [r["recipe_id"] for r in full["recipes"]] == [r["recipe_id"] for r in body["recipes"]]
+
+
+def test_summary_is_a_single_query(client, db_session):
+    cuisine = f"test-{uuid.uuid4().hex[:8]}"
+    for i in range(3):
+        _recipe(db_session, f"R{i}", cuisine, ["sel", "poivre"])
+    db_session.flush()
+
+    timing = _summaries(client, cuisine=cuisine).headers["server-timing"]
+    assert re.search(r'db;[^,]*desc="1 quer', timing)
+
+
+def test_summary_total_with_filters_and_cursor(client, db_session):
+    cuisine = f"test-{uuid.uuid4().hex[:8]}"
+    # Two matching ingredients in one recipe must not count it twice.
+    _recipe(db_session, "Gratin", cuisine, ["pomme de terre", "pomme"])
+    _recipe(db_session, "Tarte", cuisine, ["pomme", "farine"])
+    _recipe(db_session, "Soupe", cuisine, ["poireau"])
+    db_session.flush()
+
+    body = _summaries(client, cuisine=cuisine, ingredient="pomme").json()
+    assert body["total"] == 2
+    assert {r["name"] for r in body["recipes"]} == {"Gratin", "Tarte"}
+
+    first = _summaries(client, cuisine=cuisine, limit=2).json()
+    assert first["total"] == 3 and first["next_cursor"]
+    rest = _summaries(client, cuisine=cuisine, limit=2, cursor=first["next_cursor"]).json()
+    # Cursor pages skip the count unless asked for it.
+    assert rest["total"] is None and rest["next_cursor"] is None
+    counted = _summaries(client, cuisine=cuisine, limit=2, cursor=first["next_cursor"], with_total=True)
+    assert counted.json()["total"] == 3
+    names = [r["name"] for r in first["recipes"] + rest["recipes"]]
+    assert sorted(names) == ["Gratin", "Soupe", "Tarte"]
+
+    past_end = _summaries(client, cuisine=cuisine, skip=10).json()
+    assert past_end == {"recipes": [], "total": 3, "next_cursor": None}
+
+
+def test_summary_search_and_revalidation(client, db_session):
+    cuisine = f"test-{uuid.uuid4().hex[:8]}"
+    _recipe(db_session, "Poulet rôti", cuisine, ["poulet"])
+    _recipe(db_session, "Salade", cuisine, ["laitue"])
+    db_session.flush()
+
+    res = _summaries(client, cuisine=cuisine, search="poulet")
+    assert [r["name"] for r in res.json()["recipes"]] == ["Poulet rôti"]
+
+    again = client.get(
+        "/api/recipes",
+        params={"fields": "summary", "cuisine": cuisine, "search": "poulet"},
+        headers={"If-None-Match": res.headers["etag"]},
+    )
+    assert again.status_code == 304
@@ -0,0 +1,68 @@
+"""Tests for case-folded recipe tags, exact tag filters and tag counts."""
+import uuid
+
+from backend.db.models import Recipe
+from backend.services.recipe_tags import normalize_tags
+
+
+def _names(client, **params):
+    res = client.get("/api/recipes", params=params)
+    assert res.status_code == 200
+    return {r["name"] for r in res.json()["recipes"]}
+
+
+def test_normalize_tags():
+    assert normalize_tags([" Végé", "végé", "Rapide   Midi", "", "ÉTÉ"]) == ["végé", "rapide midi", "été"]
+    assert normalize_tags(None) == []
+
+
+def test_tags_stored_case_folded(client, db_session):
+    r = client.post("/api/recipes", json={"name": "Taboulé", "tags": ["Été", " été ", "Rapide"]})
+    assert r.json()["tags"] == ["été", "rapide"]
+    row = Recipe(name="Direct", tags=["Hiver"])
+    assert row.tags == ["hiver"]
+    res = client.put(f"/api/recipes/{r.json()['recipe_id']}", json={"tags": ["FROID"]})
+    assert res.json()["tags"] == ["froid"]
+
+
+def test_exact_any_all_filters(client, db_session):
+    t = uuid.uuid4().hex[:6]
+    db_session.add_all([
+        Recipe(name="A", tags=[f"végé{t}", f"rapide{t}"]),
+        Recipe(name="B", tags=[f"végétarien{t}"]),
+        Recipe(name="C", tags=[f"rapide{t}"]),
+    ])
+    db_session.flush()
+
+    # Whole tags only: "végé" no longer hits "végétarien".
+    assert _names(client, tag=f"VÉGÉ{t}") == {"A"}
+    assert _names(client, tags=[f"végé{t}", f"rapide{t}"]) == {"A"}
+    assert _names(client, tags=[f"végé{t}", f"rapide{t}"], tag_mode="any") == {"A", "C"}
+    assert _names(client, tag=f"rapide{t}", tags=[f"végétarien{t}"], tag_mode="any") == {"A", "B", "C"}
+    assert client.get("/api/recipes", params={"tag_mode": "some"}).status_code == 422
+
+
+def test_tag_counts(client, db_session):
+    t = uuid.uuid4().hex[:6]
+    db_session.add_all([
+        Recipe(name="A", tags=[f"x{t}", f"y{t}"]),
+        Recipe(name="B", tags=[f"y{t}"]),
+    ])
+    db_session.flush()
+    res = client.get("/api/recipes/tags")
+    assert res.status_code == 200
+    counts = {c["tag"]: c["count"] for c in res.json()}
+    assert counts[f"y{t}"] == 2 and counts[f"x{t}"] == 1
+    assert client.get(
+        "/api/recipes/tags", headers={"If-None-Match": res.headers["etag"]}
+    ).status_code == 304
+
+
+def test_chat_tool_tag_is_exact(db_session):
+    from backend.api.chat import _build_list_recipes_tool
+
+    t = uuid.uuid4().hex[:6]
+    db_session.add_all([Recipe(name="A", tags=[f"été{t}"]), Recipe(name="B", tags=[f"étés{t}"])])
+    db_session.flush()
+    found = _build_list_recipes_tool(db_session)(tag=f"ÉTÉ{t}")
+    assert [r["name"] for r in found] == ["A"]
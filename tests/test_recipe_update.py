@@ -0,0 +1,122 @@
+"""Tests for the diffing PUT /api/recipes/{id}."""
+import uuid
+from datetime import date, timedelta
+
+from backend.db.models import (
+    Ingredient,
+    IngredientDatabase,
+    Instruction,
+    Recipe,
+    ShoppingListContribution,
+)
+
+
+def _recipe(db, servings=2):
+    row = IngredientDatabase(alim_nom_fr=f"TEST_{uuid.uuid4().hex[:8]}_RIZ")
+    r = Recipe(name="Risotto", servings=servings)
+    r.ingredients = [
+        Ingredient(name="Riz", quantity=200, unit="g", ingredient_db=row),
+        Ingredient(name="Bouillon", quantity=1, unit="l"),
+    ]
+    r.instructions = [
+        Instruction(step_number=1, instruction_text="Nacrer le riz."),
+        Instruction(step_number=2, instruction_text="Mouiller."),
+    ]
+    db.add(r); db.flush()
+    return r, row
+
+
+def _put(client, recipe, **data):
+    res = client.put(f"/api/recipes/{recipe.recipe_id}", json=data)
+    assert res.status_code == 200
+    return res.json()
+
+
+def _by_name(body) -> dict:
+    return {i["name"]: i for i in body["ingredients"]}
+
+
+def test_update_keeps_rows_and_links(client, db_session):
+    r, row = _recipe(db_session)
+    before = {i.name: i.ingredient_id for i in r.ingredients}
+
+    body = _put(client, r, ingredients=[
+        {"name": "riz ", "quantity": 250, "unit": "g"},  # same line, renamed case only
+        {"name": "Bouillon", "quantity": 1, "unit": "l"},
+        {"name": "Parmesan", "quantity": 50, "unit": "g"},
+    ])
+    got = _by_name(body)
+    assert got["riz "]["ingredient_id"] == str(before["Riz"])
+    assert got["riz "]["ingredient_db_id"] == str(row.id)
+    assert got["riz "]["quantity"] == 250
+    assert got["Bouillon"]["ingredient_id"] == str(before["Bouillon"])
+    assert set(got) == {"riz ", "Bouillon", "Parmesan"}
+
+    body = _put(client, r, ingredients=[
+        {"name": "Riz", "quantity": 250, "unit": "g", "ingredient_db_id": None},
+    ])
+    assert [(i["name"], i["ingredient_db_id"]) for i in body["ingredients"]] == [("Riz", None)]
+
+
+def test_update_instructions_by_position(client, db_session):
+    r, _ = _recipe(db_session)
+    first = min(r.instructions, key=lambda i: i.step_number).instruction_id
+
+    body = _put(client, r, instructions=[{"instruction_text": "Nacrer le riz 2 min."}])
+    assert [(i["step_number"], i["instruction_text"]) for i in body["instructions"]] == [
+        (1, "Nacrer le riz 2 min.")
+    ]
+    assert body["instructions"][0]["instruction_id"] == str(first)
+
+
+def _plan(client, recipe):
+    today = date.today()
+    monday = today + timedelta(days=(0 - today.weekday()) % 7 or 7)
+    client.post("/api/meal-plan", json={
+        "slot_date": monday.isoformat(), "recipe_id": str(recipe.recipe_id), "servings": 4,
+    })
+
+
+def _contributions(db, recipe) -> dict:
+    rows = db.query(ShoppingListContribution).filter_by(recipe_id=recipe.recipe_id).all()
+    return {c.item.name: (c.contribution_id, c.quantity_text) for c in rows}
+
+
+def test_quantity_change_resyncs_planned_slots(client, db_session):
+    r, _ = _recipe(db_session)
+    _plan(client, r)
+    assert _contributions(db_session, r)["Riz"][1] == "400 g"
+
+    _put(client, r, ingredients=[
+        {"name": "Riz", "quantity": 300, "unit": "g"},
+        {"name": "Bouillon", "quantity": 1, "unit": "l"},
+    ])
+    db_session.expire_all()
+    assert _contributions(db_session, r)["Riz"][1] == "600 g"
+
+    _put(client, r, servings=4)
+    db_session.expire_all()
+    assert _contributions(db_session, r)["Riz"][1] == "300 g"
+
+
+def test_note_only_edit_leaves_shopping_list_alone(client, db_session):
+    r, _ = _recipe(db_session)
+    _plan(client, r)
+    before = _contributions(db_session, r)
+
+    _put(client, r, name="Risotto crémeux", ingredients=[
+        {"name": "Riz", "quantity": 200, "unit": "g", "notes": "arborio"},
+        {"name": "Bouillon", "quantity": 1, "unit": "l"},
+    ])
+    db_session.expire_all()
+    assert _contributions(db_session, r) == before
+
+
+def test_cleared_list_stays_cleared(client, db_session):
+    r, _ = _recipe(db_session)
+    _plan(client, r)
+    client.delete("/api/shopping-list")
+
+    _put(client, r, ingredients=[{"name": "Riz", "quantity": 300, "unit": "g"}])
+    db_session.expire_all()
+    assert _contributions(db_session, r) == {}
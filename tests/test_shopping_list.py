@@ -137,6 +137,18 @@ def test_meal_slot_add_creates_contributions(client, db_session):
     assert by_name["lardons"]["contributions"][0]["source_label"].startswith("Pâtes carbonara · ")
 
 
+def test_meal_slot_contribution_uses_canonical_unit(client, db_session):
+    r = _make_recipe(db_session, name="Vinaigrette", servings=1)
+    _add_ingredient(db_session, r, "huile", 1, "Cuillères à soupe")
+    _add_ingredient(db_session, r, "ail", 1, "gousses")
+    client.post("/api/meal-plan", json={
+        "slot_date": _next_monday(), "recipe_id": str(r.recipe_id), "servings": 2,
+    })
+    by_name = {it["name"]: it for it in client.get("/api/shopping-list").json()["items"]}
+    assert by_name["huile"]["contributions"][0]["quantity_text"] == "2 c. à s."
+    assert by_name["ail"]["contributions"][0]["quantity_text"] == "2 gousses"
+
+
 def test_meal_slot_servings_change_refreshes_contributions(client, db_session):
     r = _make_recipe(db_session, name="Soupe", servings=2)
     _add_ingredient(db_session, r, "carotte", 100, "g")
@@ -268,3 +280,22 @@ def test_user_category_protected_from_llm_overwrite(db_session):
     # The LLM tries to claim the same name belongs in 'Autres'.
     learn_category(db_session, "saumon", "Autres", source="llm")
     assert lookup_known_category(db_session, "saumon") == "Viandes & Poissons"  # unchanged
+
+
+def test_categorize_with_ai_releases_connection_before_llm(client, db_session, monkeypatch):
+    from backend.api import shopping_list as sl_mod
+
+    item = client.post("/api/shopping-list", json={"name": "xyzzy", "quantity_text": "1"}).json()
+    assert item["category"] == "Autres"
+    held = []
+
+    def _fake(names):
+        held.append(db_session.in_transaction())
+        return {n: "Épicerie" for n in names}
+
+    monkeypatch.setattr(sl_mod, "_gemini_categorize", _fake)
+    res = client.post("/api/shopping-list/categorize-with-ai")
+    assert res.status_code == 200
+    assert held == [False]
+    by_name = {it["name"]: it["category"] for it in res.json()["items"]}
+    assert by_name["xyzzy"] == "Épicerie"
@@ -0,0 +1,44 @@
+"""Unit tests for the French unit grammar in backend.utils.units."""
+import pytest
+
+from backend.utils.units import parse_unit, unit_label
+
+
+@pytest.mark.parametrize("raw,token", [
+    ("g", "g"), ("gr", "g"), ("grammes", "g"), ("G", "g"),
+    ("kg.", "kg"), ("kilos", "kg"), ("mg", "mg"),
+    ("ml", "ml"), ("cl.", "cl"), ("dl", "dl"), ("L", "l"), ("litres", "l"),
+    ("cuillère à soupe", "cas"), ("Cuillères à soupe", "cas"), ("c. à s.", "cas"),
+    ("c.à.s", "cas"), ("càs", "cas"), ("cs", "cas"), ("CS", "cas"),
+    ("cuil. à soupe", "cas"), ("cuillerée à soupe", "cas"),
+    ("cuillère à café", "cac"), ("c. à c.", "cac"), ("cc", "cac"), ("càc", "cac"),
+    ("c. à d.", "cad"), ("cuillère à dessert", "cad"),
+    ("verres", "verre"), ("tasse", "tasse"), ("pincées", "pincee"),
+    ("pcs", "piece"), ("pièces", "piece"), ("sachets", "sachet"),
+    ("boîte", "boite"), ("gousses", "gousse"), ("bottes", "botte"),
+])
+def test_parse_unit(raw, token):
+    assert parse_unit(raw) == token
+
+
+@pytest.mark.parametrize("raw", ["", "barrel", "cup", "cuillère", "c"])
+def test_parse_unit_unknown(raw):
+    assert parse_unit(raw) is None
+
+
+def test_parse_unit_is_memoized():
+    parse_unit.cache_clear()
+    parse_unit("Cuillères à soupe")
+    parse_unit("Cuillères à soupe")
+    assert parse_unit.cache_info().hits == 1
+
+
+@pytest.mark.parametrize("raw,qty,label", [
+    ("Cuillères à soupe", 2, "c. à s."),
+    ("gousse", 3, "gousses"),
+    ("gousses", 1, "gousse"),
+    ("g", 400, "g"),
+    ("baguette", 1, "baguette"),
+])
+def test_unit_label(raw, qty, label):
+    assert unit_label(raw, qty) == label
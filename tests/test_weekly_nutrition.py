@@ -0,0 +1,90 @@
+"""Tests for the weekly nutrition served from the rollups."""
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from backend.db.models import Ingredient, IngredientDatabase, MealPlanSlot, Recipe
+from backend.services.weekly_nutrition import week_nutrition
+
+CAL_KEY = "Energie, Règlement UE N° 1169 2011 (kcal 100 g)"
+PROT_KEY = "Protéines, N x facteur de Jones (g 100 g)"
+
+
+def _next_monday() -> date:
+    today = date.today()
+    return today + timedelta(days=(0 - today.weekday()) % 7 or 7)
+
+
+@pytest.fixture
+def week(db_session):
+    """A week exercising every unit path and untracked reason."""
+    def canon(nd, density=None):
+        row = IngredientDatabase(
+            alim_nom_fr=f"TEST_{uuid.uuid4().hex[:8]}", nutrition_data=nd,
+            density_g_per_ml=density,
+        )
+        db_session.add(row)
+        return row
+
+    rice = canon({CAL_KEY: 130, PROT_KEY: "2,5"})
+    oil = canon({CAL_KEY: 900, PROT_KEY: "traces"}, density=0.92)
+    milk = canon({CAL_KEY: "46", PROT_KEY: "<0,5"})  # no density
+    salt = canon({CAL_KEY: "-"})
+    stub = canon({})
+    db_session.flush()
+
+    bowl = Recipe(name="Bowl", servings=2)
+    soup = Recipe(name="Soupe", servings=None)
+    db_session.add_all([bowl, soup]); db_session.flush()
+    for recipe, name, qty, unit, fk in [
+        (bowl, "riz", 0.2, "kg", rice.id),
+        (bowl, "huile", 2, "Cuillères à Soupe.", oil.id),
+        (bowl, "huile", 50, " ml ", oil.id),
+        (bowl, "sel", 1, "pincée", salt.id),
+        (bowl, "riz", None, "g", rice.id),
+        (soup, "lait", 25, "cl", milk.id),
+        (soup, "lait", 1, "verre", milk.id),
+        (soup, "riz", 3, "poignée", rice.id),
+        (soup, "mystère", 1, "g", None),
+        (soup, "vide", 10, "g", stub.id),
+        (soup, "riz", 500, "mg", rice.id),
+    ]:
+        db_session.add(Ingredient(
+            recipe_id=recipe.recipe_id, name=name, quantity=qty, unit=unit,
+            ingredient_db_id=fk,
+        ))
+    monday = _next_monday()
+    for offset, position, recipe, servings in [
+        (0, 0, bowl, 3), (0, 1, soup, 2), (2, 0, bowl, 1), (6, 0, soup, 0),
+    ]:
+        db_session.add(MealPlanSlot(
+            slot_date=monday + timedelta(days=offset), position=position,
+            recipe_id=recipe.recipe_id, servings=servings,
+        ))
+    db_session.flush()
+    return monday
+
+
+def test_day_totals(db_session, week):
+    served = week_nutrition(db_session, week)
+    assert set(served.days) == {week, week + timedelta(days=2), week + timedelta(days=6)}
+    # Bowl for 1 of its 2 servings: 200 g rice, 30 ml + 50 ml oil at 0.92 g/ml.
+    kcal = (200 * 1.3 + 80 * 0.92 * 9.0) / 2
+    assert served.days[week + timedelta(days=2)][CAL_KEY] == pytest.approx(kcal)
+    assert served.days[week + timedelta(days=2)][PROT_KEY] == pytest.approx(2.5)
+    # Bowl for 3 of 2 servings + Soupe (servings unset → 1) for 2: only its 500 mg of rice count.
+    assert served.days[week][CAL_KEY] == pytest.approx(kcal * 2 * 1.5 + 0.65 * 2)
+    # A slot with 0 servings counts as 1.
+    assert served.days[week + timedelta(days=6)][CAL_KEY] == pytest.approx(0.65)
+    assert served.week[CAL_KEY] == pytest.approx(sum(d[CAL_KEY] for d in served.days.values()))
+
+
+def test_untracked_lines(db_session, week):
+    served = week_nutrition(db_session, week)
+    soup = [
+        ("lait", "missing_density"), ("lait", "missing_density"), ("riz", "unknown_unit"),
+        ("mystère", "missing_fk"), ("vide", "no_data"),
+    ]
+    expected = [(d, "Soupe", *line) for d in (week, week + timedelta(days=6)) for line in soup]
+    got = [(u["slot_date"], u["recipe_name"], u["ingredient_name"], u["reason"]) for u in served.untracked]
+    assert sorted(got) == sorted(expected)